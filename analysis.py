@@ -1010,7 +1010,7 @@ def create_gtip_consistency_html(summary_data):
     
     return html
 
-def check_alici_satici_relationship(df, selected_companies=None, progress_callback=None):
+def check_alici_satici_relationship(df, selected_companies=None, progress_callback=None, preview_limit=50):
     """
     Alıcı-Satıcı ilişki kontrolü
     
@@ -1022,6 +1022,7 @@ def check_alici_satici_relationship(df, selected_companies=None, progress_callba
         df: Kontrol edilecek DataFrame
         selected_companies: Kullanıcının seçtiği firma listesi (opsiyonel)
         progress_callback: İlerleme bildirimi için callback fonksiyon
+        preview_limit: HTML raporda gösterilecek en fazla kayıt/beyanname sayısı
         
     Returns:
         dict: Kontrol sonuçları
@@ -1089,6 +1090,14 @@ def check_alici_satici_relationship(df, selected_companies=None, progress_callba
     if progress_callback:
         progress_callback(30, "Veri işleniyor...")
     
+    # Firma ve beyanname sütunlarını bir kez category tipine çevir; sonraki
+    # firma bazlı filtreler ve gruplamalar tamsayı kodlar üzerinde çalışır
+    categorical_columns = {col: 'category' for col in (sender_column, "Beyanname_no", "Alici_satici_iliskisi")
+                           if pd.api.types.is_object_dtype(df_sample[col])
+                           or pd.api.types.is_string_dtype(df_sample[col])}
+    if categorical_columns:
+        df_sample = df_sample[needed_columns].astype(categorical_columns)
+    
     # İşlem 1: Belirli gönderici firmaların ilişki durumu 6 olan beyannamelerini bul
     if selected_companies and len(selected_companies) > 0:
         if progress_callback:
@@ -1128,7 +1137,9 @@ def check_alici_satici_relationship(df, selected_companies=None, progress_callba
                 "status": "warning",
                 "message": f"{len(unique_error_relations)} adet ilişki durumu 6 olan beyanname bulundu.",
                 "type": "selected_companies",
-                "data": result_df
+                "data": result_df,
+                "preview": result_df.head(preview_limit),
+                "total_rows": len(result_df)
             }
     
     # İşlem 2: Aynı göndericide farklı ilişki durumları olan beyannameleri bul ve hangi kodun hatalı olduğunu belirle
@@ -1255,11 +1266,22 @@ def check_alici_satici_relationship(df, selected_companies=None, progress_callba
                 available_columns = [col for col in result_columns if col in result_df.columns]
                 result_df = result_df[available_columns].copy()
             
+            # Rapor için sadece ilk benzersiz beyannamelerin satırlarını ayır
+            if not result_df.empty:
+                unique_result_beyannames = result_df["Beyanname_no"].unique()
+                preview_df = result_df[result_df["Beyanname_no"].isin(unique_result_beyannames[:preview_limit])]
+                total_unique_beyannames = len(unique_result_beyannames)
+            else:
+                preview_df = result_df
+                total_unique_beyannames = 0
+            
             return {
                 "status": "warning",
                 "message": f"{len(inconsistent_with_6_0)} gönderici firmada toplam {total_beyanname_error_count} adet hatalı ilişki kodlu beyanname tespit edildi.",
                 "type": "all_senders_enhanced",
                 "data": result_df,
+                "preview": preview_df,
+                "total_unique_beyannames": total_unique_beyannames,
                 "stats": stats_df,
                 "total_error_count": total_error_count,
                 "total_beyanname_error_count": total_beyanname_error_count,
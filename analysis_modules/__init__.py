@@ -36,7 +36,7 @@ from .igv_analysis import check_igv_consistency
 from .tedarikci_beyan_kontrol import check_tedarikci_beyan_kontrol
 
 # Yeni oluşturulan modüller
-from .unit_price_analysis import check_unit_price_increase
+from .unit_price_analysis import check_unit_price_increase, warm_up_unit_price_kernels
 from .tax_analysis import check_kdv_consistency
 from .expense_analysis import check_domestic_expense_variation, check_foreign_expense_variation
 from .supalan_depolama_kontrol import check_supalan_depolama_kontrol
@@ -116,7 +116,7 @@ __all__ = [
     
     # Döviz ve değer analizleri
     'check_currency_values', 'check_rarely_used_currency',
-    'check_unit_price_increase', 'check_kdv_consistency',
+    'check_unit_price_increase', 'warm_up_unit_price_kernels', 'check_kdv_consistency',
     
     # Nadir kullanım analizleri
     'check_rarely_used_origin_country', 'check_rarely_used_payment_method',
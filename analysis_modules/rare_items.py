@@ -5,6 +5,65 @@ Firmaların alışılmışın dışında kullandıkları menşe ülke ve ödeme
 
 import pandas as pd
 
+def _collect_sample_rows(filtered_df, key_columns, samples, detail_columns):
+    """
+    Nadir kullanım örneklerine ait satırları tek bir birleştirme (merge) ile toplar
+    
+    Her örnek için filtered_df'i yeniden taramak yerine tüm örnek anahtarları bir
+    tabloya konur ve veriyle bir kez birleştirilir. Satırlar örnek sırasına, aynı
+    örnek içinde ise verideki sıraya göre döner.
+    
+    Args:
+        filtered_df (pandas.DataFrame): Filtrelenmiş beyanname verileri
+        key_columns (list): Örneği tanımlayan sütunlar (ör. firma ve menşe ülke)
+        samples (list): (anahtar değerleri, örnek beyanname listesi, sonuç alanları sözlüğü) üçlüleri;
+            beyanname listesi boşsa anahtara uyan tüm satırlar alınır
+        detail_columns (list): Veriden sonuca kopyalanacak sütunlar (olmayanlar atlanır)
+    
+    Returns:
+        pandas.DataFrame: Sonuç alanları ve detay sütunlarından oluşan tablo
+    """
+    use_beyanname = 'Beyanname_no' in filtered_df.columns
+    
+    key_rows = []
+    for sira, (key_values, beyannames, _) in enumerate(samples):
+        base = dict(zip(key_columns, key_values))
+        base['_sira'] = sira
+        if use_beyanname and beyannames:
+            for beyanname_no in beyannames:
+                key_rows.append({**base, 'Beyanname_no': beyanname_no, '_beyanname_filtresi': True})
+        else:
+            key_rows.append({**base, '_beyanname_filtresi': False})
+    
+    if not key_rows:
+        return pd.DataFrame()
+    keys_df = pd.DataFrame(key_rows)
+    
+    detail_columns = [col for col in detail_columns if col in filtered_df.columns]
+    source_columns = list(dict.fromkeys(key_columns + (['Beyanname_no'] if use_beyanname else []) + detail_columns))
+    source_df = filtered_df[source_columns]
+    
+    # Beyanname numarasıyla sınırlanan ve sınırlanmayan örnekleri ayrı birleştir
+    parts = []
+    filtered_keys = keys_df[keys_df['_beyanname_filtresi']]
+    if not filtered_keys.empty:
+        parts.append(source_df.merge(filtered_keys[key_columns + ['Beyanname_no', '_sira']],
+                                     on=key_columns + ['Beyanname_no'], how='inner'))
+    unfiltered_keys = keys_df[~keys_df['_beyanname_filtresi']]
+    if not unfiltered_keys.empty:
+        parts.append(source_df.merge(unfiltered_keys[key_columns + ['_sira']], on=key_columns, how='inner'))
+    
+    matched = pd.concat(parts) if len(parts) > 1 else parts[0]
+    matched = matched.sort_values('_sira', kind='stable')
+    
+    # Örnek alanlarını her satıra yay ve detay sütunlarını ekle
+    fields_df = pd.DataFrame([fields for _, _, fields in samples])
+    result_df = fields_df.iloc[matched['_sira'].to_numpy()].reset_index(drop=True)
+    for col in detail_columns:
+        result_df[col] = matched[col].to_numpy()
+    
+    return result_df
+
 def _create_rarely_used_html_report(result_data, item_type, firma_column):
     """
     Nadiren kullanılan öğelerin (döviz, menşe ülke, ödeme şekli) gelişmiş HTML raporunu oluşturur
@@ -518,43 +577,26 @@ def check_rarely_used_origin_country(df):
             "message": "Nadiren kullanılan menşe ülke tespit edilmedi"
         }
     
-    # Sonuç dataframe'i oluştur
-    result_rows = []
-    
+    # Sonuç dataframe'i oluştur: örnek beyannamelerin satırları tek birleştirme ile alınır
+    samples = []
     for item in result_data:
-        firma = item['firma']
-        
         for country_info in item['nadir_kullanilan_ulkeler']:
-            country = country_info['ulke']
-            count = country_info['sayi']
-            percentage = country_info['yuzde']
-            sample_beyannames = country_info['ornek_beyannameler']
-            
-            # Örnek beyannameleri ilgili veriyi al
-            sample_data = filtered_df[
-                (filtered_df[firma_column] == firma) & 
-                (filtered_df['Mensei_ulke'] == country) &
-                (filtered_df['Beyanname_no'].isin(sample_beyannames))
-            ]
-            
-            for _, row in sample_data.iterrows():
-                result_row = {
-                    'Firma': firma,
-                    'Nadiren_Kullanilan_Ulke': country,
-                    'Kullanim_Sayisi': count,
-                    'Kullanim_Yuzdesi': percentage,
+            samples.append((
+                (item['firma'], country_info['ulke']),
+                country_info['ornek_beyannameler'],
+                {
+                    'Firma': item['firma'],
+                    'Nadiren_Kullanilan_Ulke': country_info['ulke'],
+                    'Kullanim_Sayisi': country_info['sayi'],
+                    'Kullanim_Yuzdesi': country_info['yuzde'],
                     'En_Cok_Kullanilan_Ulke': item['en_cok_kullanilan_ulke'],
                 }
-                
-                # Beyannameye ilişkin detayları ekle
-                for col in ['Beyanname_no', 'Mensei_ulke', 'Fatura_miktari', 'Gtip', 'Rejim']:
-                    if col in row:
-                        result_row[col] = row[col]
-                
-                result_rows.append(result_row)
+            ))
     
     # Tüm sonuçları içeren DataFrame
-    result_df = pd.DataFrame(result_rows)
+    result_df = _collect_sample_rows(
+        filtered_df, [firma_column, 'Mensei_ulke'], samples,
+        ['Beyanname_no', 'Mensei_ulke', 'Fatura_miktari', 'Gtip', 'Rejim'])
     
     # Özet DataFrame'i
     summary_data = []
@@ -725,45 +767,27 @@ def check_rarely_used_payment_method(df):
             "message": "Nadiren kullanılan ödeme şekli tespit edilmedi"
         }
     
-    # Sonuç dataframe'i oluştur
-    result_rows = []
-    
+    # Sonuç dataframe'i oluştur: örnek beyannamelerin satırları tek birleştirme ile alınır
+    samples = []
     for item in result_data:
-        firma = item['firma']
-        
         for payment_info in item['nadir_kullanilan_odeme_sekilleri']:
-            payment = payment_info['odeme']
-            count = payment_info['sayi']
-            percentage = payment_info['yuzde']
-            sample_beyannames = payment_info['ornek_beyannameler']
-            is_special = payment_info.get('ozel', False)
-            
-            # Örnek beyannameleri ilgili veriyi al
-            sample_data = filtered_df[
-                (filtered_df[firma_column] == firma) & 
-                (filtered_df[payment_column] == payment) &
-                (filtered_df['Beyanname_no'].isin(sample_beyannames))
-            ]
-            
-            for _, row in sample_data.iterrows():
-                result_row = {
-                    'Firma': firma,
-                    'Nadiren_Kullanilan_Odeme': payment,
-                    'Kullanim_Sayisi': count,
-                    'Kullanim_Yuzdesi': percentage,
+            samples.append((
+                (item['firma'], payment_info['odeme']),
+                payment_info['ornek_beyannameler'],
+                {
+                    'Firma': item['firma'],
+                    'Nadiren_Kullanilan_Odeme': payment_info['odeme'],
+                    'Kullanim_Sayisi': payment_info['sayi'],
+                    'Kullanim_Yuzdesi': payment_info['yuzde'],
                     'En_Cok_Kullanilan_Odeme': item['en_cok_kullanilan_odeme'],
-                    'Ozel_Ilgi': is_special
+                    'Ozel_Ilgi': payment_info.get('ozel', False)
                 }
-                
-                # Beyannameye ilişkin detayları ekle
-                for col in ['Beyanname_no', payment_column, 'Fatura_miktari', 'GTİP', 'Rejim']:
-                    if col in row:
-                        result_row[col] = row[col]
-                
-                result_rows.append(result_row)
+            ))
     
     # Tüm sonuçları içeren DataFrame
-    result_df = pd.DataFrame(result_rows)
+    result_df = _collect_sample_rows(
+        filtered_df, [firma_column, payment_column], samples,
+        ['Beyanname_no', payment_column, 'Fatura_miktari', 'GTİP', 'Rejim'])
     
     # Özet DataFrame'i
     summary_data = []
@@ -893,53 +917,29 @@ def check_rarely_used_origin_country_by_sender_gtip(df):
             "message": "Aynı gönderici ve GTİP kodunda nadiren kullanılan menşe ülke tespit edilmedi"
         }
     
-    # Sonuç dataframe'i oluştur
-    result_rows = []
-    
+    # Sonuç dataframe'i oluştur: örnek beyannamelerin satırları tek birleştirme ile alınır
+    samples = []
     for item in result_data:
-        sender = item['gonderen']
-        gtip = item['gtip']
-        
         for country_info in item['nadir_kullanilan_ulkeler']:
-            country = country_info['ulke']
-            count = country_info['sayi']
-            percentage = country_info['yuzde']
-            sample_beyannames = country_info['ornek_beyannameler']
-            
-            # Örnek beyannameleri ilgili veriyi al
-            sample_data = filtered_df[
-                (filtered_df['Adi_unvani'] == sender) & 
-                (filtered_df['Gtip'] == gtip) &
-                (filtered_df['Mensei_ulke'] == country)
-            ]
-            
-            if 'Beyanname_no' in sample_data.columns and sample_beyannames:
-                sample_data = sample_data[sample_data['Beyanname_no'].isin(sample_beyannames)]
-            
-            for _, row in sample_data.iterrows():
-                result_row = {
-                    'Gonderen': sender,
-                    'Gtip': gtip,
-                    'Nadiren_Kullanilan_Ulke': country,
-                    'Kullanim_Sayisi': count,
-                    'Kullanim_Yuzdesi': round(percentage, 2),
+            samples.append((
+                (item['gonderen'], item['gtip'], country_info['ulke']),
+                country_info['ornek_beyannameler'],
+                {
+                    'Gonderen': item['gonderen'],
+                    'Gtip': item['gtip'],
+                    'Nadiren_Kullanilan_Ulke': country_info['ulke'],
+                    'Kullanim_Sayisi': country_info['sayi'],
+                    'Kullanim_Yuzdesi': round(country_info['yuzde'], 2),
                     'En_Cok_Kullanilan_Ulke': item['en_cok_kullanilan_ulke'],
                     'Toplam_Beyanname_Sayisi': item['toplam_beyanname'],
                     'Toplam_Mensei_Ulke_Sayisi': item['toplam_mensei_ulke_sayisi']
                 }
-                
-                # Temel sütunları ekle
-                result_row['Adi_unvani'] = row['Adi_unvani']
-                result_row['Mensei_ulke'] = row['Mensei_ulke']
-                
-                # Beyanname numarası varsa ekle
-                if 'Beyanname_no' in row:
-                    result_row['Beyanname_no'] = row['Beyanname_no']
-                
-                result_rows.append(result_row)
+            ))
     
     # Tüm sonuçları içeren DataFrame
-    result_df = pd.DataFrame(result_rows)
+    result_df = _collect_sample_rows(
+        filtered_df, ['Adi_unvani', 'Gtip', 'Mensei_ulke'], samples,
+        ['Adi_unvani', 'Mensei_ulke', 'Beyanname_no'])
     
     # Özet DataFrame'i
     summary_data = []
@@ -415,14 +415,17 @@ def _create_supalan_storage_html(problematic_records, summary_stats):
     
     # En fazla 25 sonucu göster
     for i, record in enumerate(sorted(problematic_records, key=lambda x: x['Depolama_Gideri'], reverse=True)[:25]):
+        # Metinler bir kez çevrilir; uzunluk kontrolü ve kısaltma aynı değeri kullanır
+        tanim = str(record['Ticari_Tanım'])
+        firma = str(record.get('Firma', 'N/A'))
         html += f"""
                         <tr>
                             <td><strong>{record['Beyanname_no']}</strong></td>
                             <td><span class="bs3-code">{record['BS3_Kodu']}</span></td>
                             <td><span class="storage-amount">{record['Depolama_Gideri']:,.2f}</span></td>
                             <td>{record['GTİP']}</td>
-                            <td>{record['Ticari_Tanım'][:50]}{'...' if len(str(record['Ticari_Tanım'])) > 50 else ''}</td>
-                            <td>{record.get('Firma', 'N/A')[:40]}{'...' if len(str(record.get('Firma', ''))) > 40 else ''}</td>
+                            <td>{tanim[:50]}{'...' if len(tanim) > 50 else ''}</td>
+                            <td>{firma[:40]}{'...' if len(firma) > 40 else ''}</td>
                             <td>{record['Beyanname_Tarihi']}</td>
                         </tr>
         """
@@ -4,9 +4,70 @@ Aynı gönderici, aynı GTIP ve aynı ticari tanıma sahip eşyaların birim fiy
 zaman içinde önemli oranda artıp artmadığını kontrol eder.
 """
 
+import functools
+
 import pandas as pd
 import numpy as np
 
+
+def _price_change_pct_numpy(group_ids, prices):
+    """
+    Grup ve tarihe göre sıralı kayıtlarda bir önceki kayda göre fiyat değişim yüzdesini hesaplar
+    
+    Önceki kayıt aynı grupta değilse ya da önceki fiyat sıfırsa değer NaN olur.
+    """
+    pct = np.full(len(prices), np.nan)
+    previous = prices[:-1]
+    valid = (group_ids[1:] == group_ids[:-1]) & (previous > 0)
+    pct[1:][valid] = (prices[1:][valid] - previous[valid]) / previous[valid] * 100
+    return pct
+
+
+@functools.lru_cache(maxsize=None)
+def _price_change_kernel():
+    """
+    Fiyat değişim çekirdeğini ilk kullanımda oluşturur
+    
+    numba'nın içe aktarılması uygulama açılışını yavaşlattığından modül yüklenirken
+    değil, ilk çağrıda (normalde açılıştaki arka plan ısınma thread'inde) yapılır.
+    numba kurulu değilse NumPy sürümü döner.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True, error_model='numpy')
+    def _price_change_pct(group_ids, prices):
+        """_price_change_pct_numpy ile aynı hesabı tek geçişte yapan derlenmiş döngü"""
+        pct = np.full(prices.size, np.nan)
+        for i in range(1, prices.size):
+            previous = prices[i - 1]
+            if group_ids[i] == group_ids[i - 1] and previous > 0:
+                pct[i] = (prices[i] - previous) / previous * 100
+        return pct
+    
+    return _price_change_pct
+
+
+def _price_change_pct(group_ids, prices):
+    """Derlenmiş çekirdek varsa onu, yoksa NumPy sürümünü çalıştırır"""
+    kernel = _price_change_kernel() or _price_change_pct_numpy
+    return kernel(group_ids, prices)
+
+
+def warm_up_unit_price_kernels():
+    """
+    Derlenmiş fiyat değişim çekirdeğini küçük dizilerle bir kez çalıştırır
+    
+    Uygulama açılırken arka planda çağrılır; böylece numba'nın içe aktarılması ve
+    derleme süresi ilk analizde beklenmez. numba yoksa bir şey yapmaz.
+    """
+    kernel = _price_change_kernel()
+    if kernel is None:
+        return
+    kernel(np.zeros(2, dtype=np.int64), np.ones(2, dtype=np.float64))
+
 def check_unit_price_increase(df):
     """
     Aynı gönderici, aynı GTIP kodu ve aynı ticari tanıma sahip eşyaların birim fiyatlarının
@@ -100,9 +161,6 @@ def check_unit_price_increase(df):
             currency_column = col
             break
     
-    # Sonuç verisini toplamak için liste
-    result_data = []
-    
     # Aynı gönderici, GTIP ve ticari tanıma göre grupla
     group_columns = ['Adi_unvani', 'Gtip', 'Ticari_tanimi']
     
@@ -110,68 +168,53 @@ def check_unit_price_increase(df):
     if currency_column:
         group_columns.append(currency_column)
     
-    # Her bir grup için hesaplama yap
-    for group_key, group_data in work_df.groupby(group_columns):
-        # En az 2 kayıt yoksa analiz yapılamaz
-        if len(group_data) < 2:
-            continue
-        
-        # Tarihe göre sırala
-        sorted_data = group_data.sort_values(by=date_column)
-        
-        # Her kayıt için karşılaştırma yap
-        for i in range(1, len(sorted_data)):
-            current_row = sorted_data.iloc[i]
-            previous_row = sorted_data.iloc[i-1]
-            
-            # Birim fiyatları al
-            current_price = current_row['Birim_Fiyat']
-            previous_price = previous_row['Birim_Fiyat']
-            
-            # Fiyat artış yüzdesi hesapla ve 2 ondalık basamağa yuvarla
-            if previous_price > 0:
-                price_increase_pct = ((current_price - previous_price) / previous_price) * 100
-                price_increase_pct = round(price_increase_pct, 2)
-                
-                # %10'dan fazla artış varsa sonuçlara ekle
-                if price_increase_pct > 10:
-                    # Grup verilerini ayır
-                    if currency_column:
-                        gonderici, gtip, ticari_tanim, doviz = group_key
-                    else:
-                        gonderici, gtip, ticari_tanim = group_key
-                        doviz = "Bilinmiyor"
-                    
-                    # Birim fiyatları 2 ondalık basamağa yuvarla
-                    result_row = {
-                        'Gonderici': gonderici,
-                        'Gtip': gtip,
-                        'Ticari_Tanim': ticari_tanim,
-                        'Doviz': doviz,
-                        'Onceki_Beyanname_No': previous_row['Beyanname_no'],
-                        'Yeni_Beyanname_No': current_row['Beyanname_no'],
-                        'Onceki_Tarih': previous_row[date_column],
-                        'Yeni_Tarih': current_row[date_column],
-                        'Gun_Farki': (current_row[date_column] - previous_row[date_column]).days,
-                        'Onceki_Toplam_Kiymet': round(previous_row['Istatistiki_kiymet'], 2),
-                        'Yeni_Toplam_Kiymet': round(current_row['Istatistiki_kiymet'], 2),
-                        'Onceki_Miktar': round(previous_row['Miktar'], 2),
-                        'Yeni_Miktar': round(current_row['Miktar'], 2),
-                        'Onceki_Birim_Fiyat': round(previous_price, 2),
-                        'Yeni_Birim_Fiyat': round(current_price, 2),
-                        'Artis_Yuzdesi': price_increase_pct
-                    }
-                    
-                    result_data.append(result_row)
-    
-    if not result_data:
+    # Grup anahtarı eksik kayıtlar gruplamaya girmez
+    work_df = work_df.dropna(subset=group_columns)
+    
+    # Kayıtları grup ve tarihe göre sırala; art arda gelen iki kayıt aynı gruptaysa karşılaştırılır
+    group_ids = work_df.groupby(group_columns, sort=True, observed=True).ngroup().to_numpy(dtype=np.int64)
+    dates = work_df[date_column].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    order = np.lexsort((dates, group_ids))
+    sorted_df = work_df.iloc[order]
+    group_ids = group_ids[order]
+    prices = sorted_df['Birim_Fiyat'].to_numpy(dtype=np.float64)
+    
+    # Fiyat artış yüzdesi hesapla ve 2 ondalık basamağa yuvarla
+    increase_pct = np.round(_price_change_pct(group_ids, prices), 2)
+    
+    # %10'dan fazla artış olan kayıtların konumları (NaN karşılaştırmaları False döner)
+    current_pos = np.flatnonzero(increase_pct > 10)
+    
+    if len(current_pos) == 0:
         return {
             "status": "ok",
             "message": "Birim fiyatlarda %10'dan fazla artış tespit edilmedi"
         }
     
-    # Sonuçları DataFrame'e dönüştür
-    result_df = pd.DataFrame(result_data)
+    previous_rows = sorted_df.iloc[current_pos - 1]
+    current_rows = sorted_df.iloc[current_pos]
+    previous_dates = previous_rows[date_column].to_numpy()
+    current_dates = current_rows[date_column].to_numpy()
+    
+    # Sonuçları DataFrame'e dönüştür (birim fiyatlar 2 ondalık basamağa yuvarlanır)
+    result_df = pd.DataFrame({
+        'Gonderici': current_rows['Adi_unvani'].to_numpy(),
+        'Gtip': current_rows['Gtip'].to_numpy(),
+        'Ticari_Tanim': current_rows['Ticari_tanimi'].to_numpy(),
+        'Doviz': current_rows[currency_column].to_numpy() if currency_column else "Bilinmiyor",
+        'Onceki_Beyanname_No': previous_rows['Beyanname_no'].to_numpy(),
+        'Yeni_Beyanname_No': current_rows['Beyanname_no'].to_numpy(),
+        'Onceki_Tarih': previous_dates,
+        'Yeni_Tarih': current_dates,
+        'Gun_Farki': pd.Series(current_dates - previous_dates).dt.days.to_numpy(),
+        'Onceki_Toplam_Kiymet': previous_rows['Istatistiki_kiymet'].round(2).to_numpy(),
+        'Yeni_Toplam_Kiymet': current_rows['Istatistiki_kiymet'].round(2).to_numpy(),
+        'Onceki_Miktar': previous_rows['Miktar'].round(2).to_numpy(),
+        'Yeni_Miktar': current_rows['Miktar'].round(2).to_numpy(),
+        'Onceki_Birim_Fiyat': np.round(prices[current_pos - 1], 2),
+        'Yeni_Birim_Fiyat': np.round(prices[current_pos], 2),
+        'Artis_Yuzdesi': increase_pct[current_pos]
+    })
     
     # Özet tablosu oluştur
     total_cases = len(result_df)
@@ -1,12 +1,14 @@
 import pandas as pd
+from collections import OrderedDict
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
                            QPushButton, QTableView, QAbstractItemView, QHeaderView,
                            QComboBox, QTabWidget, QMessageBox, QSpinBox, QSplitter, QLineEdit, QFileDialog,
                            QStyle, QGroupBox)
 from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSize
-from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
 from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import QApplication
+from sampling import write_frames_to_xlsx
 
 class PandasModel(QAbstractTableModel):
     """Model for displaying Pandas DataFrame in QTableView"""
@@ -332,6 +334,9 @@ class DataFrameViewer(QWidget):
 class CheckResultsWidget(QWidget):
     """Widget for displaying check results"""
     
+    # Önbellekte tutulacak en fazla HTML rapor sayfası sayısı
+    MAX_CACHED_REPORTS = 8
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -393,6 +398,11 @@ class CheckResultsWidget(QWidget):
         self.html_view = QWebEngineView()
         html_layout.addWidget(self.html_view)
         
+        # Anahtarsız raporlar için sayfa ve anahtar -> (html, sayfa) rapor önbelleği
+        self._default_page = QWebEnginePage(self)
+        self.html_view.setPage(self._default_page)
+        self._report_pages = OrderedDict()
+        
         # Add all tabs to the tab widget
         self.tabs.addTab(self.data_tab, "Veri Görünümü")
         self.tabs.addTab(self.details_tab, "Detaylar")
@@ -455,7 +465,7 @@ class CheckResultsWidget(QWidget):
             
             # Show HTML report if available
             if "html_report" in self.current_result:
-                self.set_html_report(self.current_result["html_report"])
+                self.set_html_report(self.current_result["html_report"], key=check_name)
             
             # Show summary if available
             if "summary" in self.current_result:
@@ -471,10 +481,23 @@ class CheckResultsWidget(QWidget):
             # Enable sorting
             self.details_view.setSortingEnabled(True)
             
-    def set_html_report(self, html_content):
-        """Set HTML content for the report view"""
+    def set_html_report(self, html_content, key=None):
+        """
+        Set HTML content for the report view
+        
+        key verilirse rapor o anahtarla ayrı bir QWebEnginePage üzerinde tutulur;
+        aynı rapor tekrar gösterildiğinde HTML yeniden ayrıştırılmaz, sadece sayfa
+        görünüme takılır.
+        """
         if html_content:
-            self.html_view.setHtml(html_content)
+            if key is None:
+                page = self._default_page
+                page.setHtml(html_content)
+            else:
+                page = self._get_report_page(key, html_content)
+            
+            if self.html_view.page() is not page:
+                self.html_view.setPage(page)
             
             # HTML rapor sekmesine geçiş yap ve görünür olduğundan emin ol
             if hasattr(self, 'detail_tabs'):
@@ -482,6 +505,33 @@ class CheckResultsWidget(QWidget):
             elif hasattr(self, 'tabs'):
                 self.tabs.setCurrentWidget(self.html_tab)
             
+    def _get_report_page(self, key, html_content):
+        """Anahtara ait rapor sayfasını döndürür, içerik değiştiyse yeniden yükler"""
+        cached = self._report_pages.get(key)
+        if cached is not None:
+            cached_html, page = cached
+            if cached_html is not html_content and cached_html != html_content:
+                page.setHtml(html_content)
+                self._report_pages[key] = (html_content, page)
+            self._report_pages.move_to_end(key)
+            return page
+        
+        page = QWebEnginePage(self)
+        page.setHtml(html_content)
+        self._report_pages[key] = (html_content, page)
+        
+        # En eski raporları at (görünümdeki sayfa hariç)
+        current_page = self.html_view.page()
+        for old_key in list(self._report_pages):
+            if len(self._report_pages) <= self.MAX_CACHED_REPORTS:
+                break
+            old_page = self._report_pages[old_key][1]
+            if old_page is not current_page:
+                del self._report_pages[old_key]
+                old_page.deleteLater()
+        
+        return page
+    
     def show_summary(self, summary_data):
         """Show summary data if available"""
         if isinstance(summary_data, pd.DataFrame):
@@ -505,15 +555,25 @@ class CheckResultsWidget(QWidget):
                 if not file_path.lower().endswith('.xlsx'):
                     file_path += '.xlsx'
                 
-                # Create Excel writer
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    # Write data if available
-                    if "data" in self.current_result and isinstance(self.current_result["data"], pd.DataFrame):
-                        self.current_result["data"].to_excel(writer, sheet_name='Veri Detayları', index=False)
-                    
-                    # If summary exists, write to another sheet
-                    if "summary" in self.current_result and isinstance(self.current_result["summary"], pd.DataFrame):
-                        self.current_result["summary"].to_excel(writer, sheet_name='Özet', index=True)
+                sheets = []
+                # Write data if available
+                if "data" in self.current_result and isinstance(self.current_result["data"], pd.DataFrame):
+                    sheets.append(('Veri Detayları', self.current_result["data"]))
+                
+                # If summary exists, write to another sheet
+                if "summary" in self.current_result and isinstance(self.current_result["summary"], pd.DataFrame):
+                    summary = self.current_result["summary"]
+                    # Dizin to_excel(index=True) gibi ilk sütun(lar) olarak yazılır; adsız dizinin
+                    # başlığı boş kalır, sütunlarla aynı adı taşıyan dizin de hata vermez
+                    index_df = summary.index.to_frame(index=False)
+                    index_df.columns = ['' if name is None else name for name in summary.index.names]
+                    sheets.append(('Özet', pd.concat([index_df, summary.reset_index(drop=True)], axis=1)))
+                
+                if not sheets:
+                    QMessageBox.warning(self, "Uyarı", "Aktarılacak tablo verisi bulunamadı")
+                    return
+                
+                write_frames_to_xlsx(file_path, sheets)
                 
                 QMessageBox.information(self, "Bilgi", f"Veriler başarıyla Excel dosyasına aktarıldı:\n{file_path}")
                 
@@ -543,7 +603,7 @@ class CheckResultsWidget(QWidget):
                     file_path += '.xlsx'
                 
                 # Export to Excel
-                data.to_excel(file_path, index=False)
+                write_frames_to_xlsx(file_path, [('Sheet1', data)])
                 QMessageBox.information(self, "Bilgi", f"Detay verileri başarıyla Excel dosyasına aktarıldı:\n{file_path}")
                 
             except Exception as e:
@@ -554,7 +614,8 @@ class CheckResultsWidget(QWidget):
         self.details_view.setModel(None)
         self.stats_view.setModel(None)
         self.summary_view.setModel(None)
-        self.html_view.setHtml("")
+        self._default_page.setHtml("")
+        self.html_view.setPage(self._default_page)
 
     def add_results(self, results, html_content=None):
         """Add new results to the widget"""
@@ -7,16 +7,32 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QFileDialog, QTabWidget,
                             QHBoxLayout, QMessageBox, QProgressBar, QComboBox,
                             QListWidget, QGridLayout, QSplitter, QSizePolicy, QDialog, QDialogButtonBox, QAbstractItemView,
                             QSpinBox, QFrame, QTableWidget, QTableWidgetItem, QScrollArea)
-from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal, QTimer, QObject, QRunnable, QThreadPool
 from PyQt5 import QtGui
+from openpyxl import LXML as OPENPYXL_LXML
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel as to_excel_serial
+from lxml import etree
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvas
 from matplotlib.figure import Figure
-import time
+import math
+import datetime
+import array
+import functools
+import string
+import threading
+import multiprocessing
+import faulthandler
+import logging
+import zipfile
+from itertools import count, product, repeat
 
 # Import XML processing functions from existing code
-from xml_processor import extract_beyanname_fixed, process_all_xml_files, process_multiple_xml_files, merge_dataframes
+from xml_processor import (extract_beyanname_fixed, process_all_xml_files, process_multiple_xml_files, merge_dataframes,
+                           optimize_categorical_columns, shrink_dataframe)
 from custom_widgets import PandasModel, DataFrameViewer, CheckResultsWidget
 
 # Import analysis modules
@@ -31,7 +47,7 @@ from analysis_modules import (
     check_gtip_urun_kodu_consistency, check_rarely_used_currency,
     check_rarely_used_origin_country, check_rarely_used_origin_country_by_sender_gtip,
     check_rarely_used_payment_method,
-    check_unit_price_increase, check_kdv_consistency,
+    check_unit_price_increase, warm_up_unit_price_kernels, check_kdv_consistency,
     check_domestic_expense_variation, check_foreign_expense_variation,
     check_supalan_depolama_kontrol,
     check_tedarikci_beyan_kontrol,
@@ -50,24 +66,285 @@ from analysis_modules.kkdf_kontrol import check_kkdf_kontrol
 from analysis_modules.gozetim_kontrol import check_gozetim_kontrol
 
 # Örnekleme modülünü içe aktar
-from sampling import BeyannameSampling
+from sampling import BeyannameSampling, ExportCancelled, write_xlsx_package_parts
+
+# Alıcı-Satıcı ilişki raporunun statik HTML/CSS iskeleti (her raporda yeniden
+# oluşturulmaması için modül yüklenirken bir kez hazırlanır)
+_ALICI_SATICI_HTML_HEADER = string.Template("""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="UTF-8">
+                <title>Alıcı-Satıcı Risk Analizi</title>
+            <style>
+                    body {
+                        font-family: 'Segoe UI', Arial, sans-serif;
+                margin: 0;
+                        padding: 20px;
+                        background: #f8f9fa;
+                    }
+                    .container {
+                        max-width: 1200px;
+                        margin: 0 auto;
+                        background: white;
+                        border-radius: 10px;
+                        box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+                        overflow: hidden;
+                    }
+                    .header {
+                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                        color: white;
+                        padding: 30px;
+                        text-align: center;
+                    }
+                    .header h1 {
+                        margin: 0;
+                        font-size: 24px;
+                        font-weight: 300;
+                    }
+                    .executive-summary {
+                        padding: 30px;
+                        background: #f8f9fa;
+                        border-bottom: 3px solid #dee2e6;
+                    }
+                    .risk-banner {
+                        background: $risk_color;
+                        color: white;
+                        padding: 20px;
+                        text-align: center;
+                        font-size: 20px;
+                        font-weight: bold;
+            margin-bottom: 20px;
+                        border-radius: 8px;
+                    }
+                    .metrics-grid {
+                        display: grid;
+                        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+                        gap: 20px;
+                        margin: 20px 0;
+                    }
+                    .metric-card {
+                        background: white;
+                        padding: 20px;
+                        border-radius: 8px;
+                        text-align: center;
+                        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+                        border-left: 4px solid #3498db;
+                    }
+                    .metric-value {
+                        font-size: 32px;
+                        font-weight: bold;
+                        color: #2c3e50;
+                        margin-bottom: 5px;
+                    }
+                    .metric-label {
+                        color: #7f8c8d;
+                        font-size: 14px;
+                        text-transform: uppercase;
+                        letter-spacing: 1px;
+                    }
+                    .action-required {
+                        background: #fff3cd;
+                        border: 1px solid #ffeaa7;
+                        border-radius: 8px;
+                        padding: 20px;
+                        margin: 20px 0;
+                    }
+                    .action-required h3 {
+                        color: #856404;
+                        margin-top: 0;
+                    }
+                    .summary-table {
+                width: 100%;
+                border-collapse: collapse;
+                        margin: 20px 0;
+                    }
+                    .summary-table th {
+                        background: #f8f9fa;
+                        padding: 12px;
+                text-align: left;
+                        border-bottom: 2px solid #dee2e6;
+                        font-weight: 600;
+                    }
+                    .summary-table td {
+                padding: 12px;
+                        border-bottom: 1px solid #dee2e6;
+                    }
+                    .summary-table tr:hover {
+                        background: #f8f9fa;
+                    }
+                    .recommendation {
+                        background: #e3f2fd;
+                        border-left: 4px solid #2196f3;
+                        padding: 20px;
+                        margin: 20px 0;
+                        border-radius: 0 8px 8px 0;
+                    }
+                    .detail-table {
+                        width: 100%;
+                        border-collapse: collapse;
+                        margin: 20px 0;
+                        font-size: 12px;
+                    }
+                    .detail-table th {
+                        background: linear-gradient(135deg, #1565c0 0%, #1976d2 100%);
+                        color: white;
+                        padding: 10px 8px;
+                        text-align: left;
+                        font-weight: 600;
+                    }
+                    .detail-table td {
+                        padding: 8px;
+                        border-bottom: 1px solid #e0e0e0;
+                        vertical-align: top;
+                    }
+                    .detail-table tr:nth-child(even) {
+                        background-color: #f8f9fa;
+                    }
+                    .detail-table tr:hover {
+                        background-color: #e3f2fd;
+                    }
+                    .beyanname-badge {
+                        background: #17a2b8;
+                        color: white;
+                        padding: 3px 8px;
+                        border-radius: 12px;
+                        font-size: 10px;
+                        font-weight: 500;
+                        display: inline-block;
+                    }
+                    .firma-name {
+                        font-weight: 500;
+                        color: #424242;
+                        max-width: 200px;
+                        word-wrap: break-word;
+                    }
+            </style>
+            </head>
+            <body>
+                <div class="container">
+                    <div class="header">
+                        <h1>🏢 Alıcı-Satıcı İlişki Kontrolü</h1>
+                        <p>Yönetici Özeti</p>
+                    </div>
+                    
+                    <div class="executive-summary">
+                        <div class="risk-banner">
+                            $risk_icon RİSK SEVİYESİ: $overall_risk
+                        </div>
+                        
+                        <div class="metrics-grid">
+                            <div class="metric-card">
+                                <div class="metric-value">$total_companies</div>
+                                <div class="metric-label">Toplam Şirket</div>
+                    </div>
+                            <div class="metric-card">
+                                <div class="metric-value">$total_transactions</div>
+                                <div class="metric-label">Toplam İşlem</div>
+                </div>
+                            <div class="metric-card">
+                                <div class="metric-value">$problematic_beyannames</div>
+                                <div class="metric-label">Sorunlu Beyanname</div>
+                    </div>
+                            <div class="metric-card">
+                                <div class="metric-value">$review_companies</div>
+                                <div class="metric-label">İncelenmesi Gereken Şirket</div>
+                        </div>
+                </div>
+                """)
+
+# Alıcı-Satıcı raporunun tekrarlayan tablo satırları; format metodu bir kez
+# bağlanır ve döngülerde doğrudan çağrılır
+_ALICI_SATICI_FIRMA_ROW = """
+                                        <tr>
+                                            <td><div class="firma-name">{firma}</div></td>
+                                            <td><span class="beyanname-badge">{beyanname_sayisi} beyanname</span></td>
+                                            <td>{iliski_durumu}</td>
+                                        </tr>
+                            """.format
+
+_ALICI_SATICI_BEYANNAME_ROW = """
+                                        <tr>
+                                            <td><div class="firma-name">{firma}</div></td>
+                                            <td><span class="beyanname-badge">{beyanname}</span></td>
+                                            <td>{iliski_durumu}</td>
+                                            <td>⚠️ İnceleme Gerekli</td>
+                                        </tr>
+                            """.format
+
+_ALICI_SATICI_TUTARSIZ_FIRMA_ROW = """
+                                    <tr style="background-color: {row_color}; border-left: 3px solid {border_color};">
+                                        <td><div class="firma-name">{firma}</div></td>
+                                        <td><span class="beyanname-badge" style="background: #4caf50;">{kod_0_sayisi} beyanname</span></td>
+                                        <td><span class="beyanname-badge" style="background: #2196f3;">{kod_6_sayisi} beyanname</span></td>
+                                        <td><span class="beyanname-badge" style="background: {border_color};">KOD {hatali_kod}</span></td>
+                                        <td><span class="beyanname-badge" style="background: {border_color};">{hatali_beyanname_sayisi} hatalı</span></td>
+                                    </tr>
+                        """.format
+
+_ALICI_SATICI_HATALI_BEYANNAME_ROW = """
+                                    <tr>
+                                        <td>
+                                            <div class="firma-name">{firma}</div>
+                                            <small style="color: #7f8c8d;">{firma_info}</small>
+                                        </td>
+                                        <td><span class="beyanname-badge">{beyanname_no}</span></td>
+                                        <td><span class="beyanname-badge" style="background: {kalem_color};">{kalem_sayisi} kalem</span></td>
+                                        <td><span class="beyanname-badge" style="background: #e74c3c;">KOD {kullandigi_kod}</span></td>
+                                        <td><span class="beyanname-badge" style="background: #27ae60;">KOD {dogru_kod}</span></td>
+                                    </tr>
+                        """.format
+
+# Uygulama günlüğü (setup_application_stability içinde dosyaya yönlendirilir)
+log = logging.getLogger("customs_check")
+
+# Kontrollerin ortak kullandığı sayısal ölçü sütunları (bir kez sayıya çevrilip önbelleğe alınır)
+NUMERIC_MEASURE_COLUMNS = ('Brut_agirlik', 'Net_agirlik', 'Miktar', 'Istatistiki_kiymet', 'Fatura_miktari',
+                           'Toplam_yurt_ici_harcamalar', 'Toplam_yurt_disi_harcamalar')
+
+# Excel'in sayfa adlarında izin vermediği karakterleri '_' ile değiştiren çeviri tablosu
+SHEET_NAME_TRANS = str.maketrans({c: '_' for c in '/\\?*[]:'})
+
+# Doğrudan XML ile yazılan sayfaların açılış etiketi ve lxml'deki xml:space öznitelik adı
+_XLSX_WORKSHEET_OPEN = (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">')
+_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
 
 # QThread sınıfı ekliyorum (Excel işlemini arka planda yapacak)
 class ExcelExportThread(QThread):
     # Sinyaller
-    progress = pyqtSignal(int, str)
     finished = pyqtSignal(bool, str, str)  # başarı/başarısız, mesaj, dosya yolu
     
+    # İlerleme yuvasındaki alanların sırası
+    SLOT_SEQ, SLOT_STAGE, SLOT_WRITTEN, SLOT_TOTAL = range(4)
+    
+    # Aşama numarası -> (yüzde, durum mesajı); yazma aşamasının yüzdesi satır sayısından hesaplanır
+    STAGES = (
+        (20, "Excel dosyası hazırlanıyor..."),
+        (None, "Excel'e yazılıyor... ({written}/{total} satır)"),
+        (70, "Excel formatlanıyor..."),
+    )
+    
     def __init__(self, sampling_tool, file_path):
         super().__init__()
         self.sampling_tool = sampling_tool
         self.file_path = file_path
-        self.is_cancelled = False
+        # Yazıcı döngüsü tarafından okunan, thread'ler arası güvenli iptal bayrağı
+        self._cancel = threading.Event()
+        # Tek yazar / tek okur "son değer geçerli" ilerleme yuvası: iş parçacığı sadece
+        # sayı yazar, GUI zamanlayıcısı okur. Sinyal kuyruğu ve kilit kullanılmaz;
+        # okuma alanlar arasında yarım kalsa bile bir sonraki turda düzelir.
+        self._progress_slot = array.array('q', [0, 0, 0, 0])
+        self._read_seq = 0
+    
+    @property
+    def is_cancelled(self):
+        return self._cancel.is_set()
     
     def run(self):
         try:
             # İlerleme bilgisi
-            self.progress.emit(20, "Excel dosyası hazırlanıyor...")
+            self._publish(0)
             
             # Güvenlik kontrolü - timeout ekleme
             self.timer = QTimer()
@@ -77,11 +354,13 @@ class ExcelExportThread(QThread):
             
             # Excel'e aktarma
             try:
-                output_path = self.sampling_tool.export_to_excel(self.file_path)
+                output_path = self.sampling_tool.export_to_excel(self.file_path,
+                                                                 progress_callback=self._on_rows_written,
+                                                                 cancel_event=self._cancel)
                 if self.is_cancelled:
                     return
                 
-                self.progress.emit(70, "Excel formatlanıyor...")
+                self._publish(2)
                 
                 # Excel dosyasını formatla
                 self.sampling_tool.format_excel_report(output_path)
@@ -90,11 +369,15 @@ class ExcelExportThread(QThread):
                 
                 # İşlem başarılı
                 self.finished.emit(True, f"Örnekleme sonuçları Excel'e aktarıldı: {output_path}", output_path)
+            
+            except ExportCancelled:
+                # Kullanıcı iptal etti; arayüz cancel_excel_export içinde güncellendi
+                log.info("Excel aktarma işlemi iptal edildi")
                 
             except Exception as e:
                 import traceback
                 error_details = traceback.format_exc()
-                print(f"Excel aktarma detaylı hata: {error_details}")
+                log.exception("Excel aktarma hatası")
                 
                 error_msg = str(e)
                 # Hata mesajını daha anlaşılır hale getir
@@ -105,64 +388,507 @@ class ExcelExportThread(QThread):
                 
                 self.finished.emit(False, f"Excel'e aktarma hatası: {error_msg}", "")
             
-            # Timer'ı durdur
-            self.timer.stop()
+            finally:
+                # Timer'ı her çıkış yolunda (iptal dahil) tam bir kez durdur
+                self.timer.stop()
                 
         except Exception as e:
             # Genel hata durumunda
-            import traceback
-            print(f"Excel thread beklenmeyen hata: {str(e)}")
-            print(traceback.format_exc())
+            log.exception("Excel thread beklenmeyen hata")
             self.finished.emit(False, f"Beklenmeyen hata: {str(e)}", "")
     
+    def _publish(self, stage, written_rows=0, total_rows=0):
+        """İlerleme yuvasını günceller; sıra numarası en son yazılır"""
+        slot = self._progress_slot
+        slot[self.SLOT_STAGE] = stage
+        slot[self.SLOT_WRITTEN] = written_rows
+        slot[self.SLOT_TOTAL] = total_rows
+        slot[self.SLOT_SEQ] += 1
+    
+    def _on_rows_written(self, written_rows, total_rows):
+        """Yazıcı döngüsünden gelen satır sayısını yuvaya yazar (sinyal gönderilmez)"""
+        self._publish(1, written_rows, total_rows)
+    
+    def poll_progress(self):
+        """
+        GUI thread'inden çağrılır; son okumadan bu yana yuva değiştiyse
+        (yüzde, mesaj) döndürür, değişmediyse None
+        """
+        slot = self._progress_slot
+        seq = slot[self.SLOT_SEQ]
+        if seq == self._read_seq:
+            return None
+        self._read_seq = seq
+        
+        stage = slot[self.SLOT_STAGE]
+        written_rows = slot[self.SLOT_WRITTEN]
+        total_rows = slot[self.SLOT_TOTAL]
+        percent, message = self.STAGES[stage]
+        if percent is None:
+            # Yazılan satırları %20-%70 aralığına yerleştir
+            percent = 20 + int(50 * min(written_rows, total_rows) / max(total_rows, 1))
+            message = message.format(written=written_rows, total=total_rows)
+        return percent, message
+    
     def handle_timeout(self):
         """İşlem zaman aşımına uğradığında çağrılır"""
-        self.is_cancelled = True
+        self._cancel.set()
         self.terminate()  # Thread'i sonlandır
         self.finished.emit(False, "İşlem zaman aşımına uğradı. Excel çok büyük olabilir.", "")
     
     def cancel(self):
-        """İşlemi iptal et"""
-        self.is_cancelled = True
-        self.timer.stop()
-        self.terminate()
+        """İşlemi iptal et; yazma döngüsü bayrağı görünce kendiliğinden durur"""
+        self._cancel.set()
 
-class CustomsCheckApp(QMainWindow):
-    def __init__(self):
+# Tüm analiz sonuçlarını tek Excel dosyasına arka planda yazan thread
+class AnalysisExportThread(QThread):
+    # Sinyaller
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(bool, str, str)  # başarı/başarısız, mesaj, dosya yolu
+    
+    # İptal bayrağının kontrol edildiği satır aralığı
+    CANCEL_CHECK_ROWS = 1000
+    
+    # Birleştirilmiş sayfada analiz türüne göre dönüşümlü satır renkleri
+    ROW_COLORS = [
+        "F8F9FA",  # Açık gri
+        "E3F2FD",  # Açık mavi
+        "F3E5F5",  # Açık mor
+        "E8F5E8",  # Açık yeşil
+        "FFF3E0",  # Açık turuncu
+        "FFEBEE",  # Açık kırmızı
+    ]
+    
+    # Birleştirilmiş sayfanın hücre biçimleri: s="1" başlık, s="2".. ROW_COLORS sırasıyla satırlar
+    HEADER_STYLE = '1'
+    ROW_STYLES = [str(2 + i) for i in range(len(ROW_COLORS))]
+    # Tarih hücreleri Excel tarih seri numarası olarak yazılır; her satır biçimi (biçimsiz dahil)
+    # için tarih-saat (164) ve yalnızca tarih (165) biçimli birer ek biçim bulunur
+    DATE_NUM_FMTS = (164, 165)
+    DATE_STYLES = dict(zip(product([None] + ROW_STYLES, DATE_NUM_FMTS), map(str, count(2 + len(ROW_COLORS)))))
+    _THIN_BORDER = '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+    STYLES_XML = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="2"><numFmt numFmtId="164" formatCode="yyyy-mm-dd h:mm:ss"/>'
+        '<numFmt numFmtId="165" formatCode="yyyy-mm-dd"/></numFmts>'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="12"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font></fonts>'
+        f'<fills count="{3 + len(ROW_COLORS)}">'
+        '<fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>'
+        + ''.join(f'<fill><patternFill patternType="solid"><fgColor rgb="FF{color}"/><bgColor rgb="FF{color}"/>'
+                  '</patternFill></fill>' for color in ["366092"] + ROW_COLORS)
+        + '</fills>'
+        f'<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>{_THIN_BORDER}</borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        f'<cellXfs count="{2 + len(ROW_COLORS) + len(DATE_STYLES)}"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" '
+        'applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf>'
+        + ''.join(f'<xf numFmtId="0" fontId="0" fillId="{3 + i}" borderId="1" xfId="0" applyFill="1" applyBorder="1" '
+                  'applyAlignment="1"><alignment horizontal="left" vertical="center"/></xf>'
+                  for i in range(len(ROW_COLORS)))
+        + ''.join(f'<xf numFmtId="{num_fmt}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+                  for num_fmt in DATE_NUM_FMTS)
+        + ''.join(f'<xf numFmtId="{num_fmt}" fontId="0" fillId="{3 + i}" borderId="1" xfId="0" applyNumberFormat="1" '
+                  'applyFill="1" applyBorder="1" applyAlignment="1"><alignment horizontal="left" vertical="center"/></xf>'
+                  for i, num_fmt in product(range(len(ROW_COLORS)), DATE_NUM_FMTS))
+        + '</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    )
+    
+    def __init__(self, all_results, file_path):
         super().__init__()
-        self.setWindowTitle("Beyanname Kontrol Uygulaması")
-        self.setGeometry(100, 100, 1200, 800)
+        self.all_results = all_results
+        self.file_path = file_path
+        self._cancel = threading.Event()
+    
+    def run(self):
+        try:
+            written_sheets = self._write_workbook()
+            if written_sheets == 0:
+                self.finished.emit(False, "Aktarılacak analiz verisi bulunamadı.", "")
+                return
+            self.finished.emit(True, "", self.file_path)
         
-        # Store loaded data
-        self.all_dataframes = {}
-        self.current_df = None
-        self.merged_df = None  # Birleştirilmiş tüm veriler için
+        except ExportCancelled:
+            log.info("Tüm analiz sonuçlarının aktarımı iptal edildi")
         
-        # Excel thread değişkeni
-        self.excel_thread = None
-        self.cancel_dialog = None
+        except Exception as e:
+            log.exception("Tüm analiz sonuçları Excel'e aktarılamadı")
+            self.finished.emit(False, str(e), "")
+    
+    def cancel(self):
+        """İşlemi iptal et; yazma döngüsü bayrağı görünce kendiliğinden durur"""
+        self._cancel.set()
+    
+    def _write_workbook(self):
+        """
+        Her analiz için ayrı sayfa ve tüm verileri birleştiren bir sayfa yazar
         
-        # Set application style
-        self.apply_modern_style()
+        Sayfalar sırayla doğrudan .xlsx (ZIP) arşivine akıtılır; satırlar lxml ile
+        üretilip hemen serileştirildiğinden bellekte hiçbir sayfanın tam XML ağacı
+        ya da baytları tutulmaz.
         
-        self.init_ui()
+        Returns:
+            int: Yazılan analiz sayfası sayısı
+        """
+        # (sayfa adı, DataFrame, biçimli mi) üçlüleri
+        sheets = []
+        # Birleştirilecek analiz adları ve DataFrame'leri (kopyalanmadan tutulur)
+        combined_names = []
+        combined_frames = []
+        
+        for analysis_name, result in self.all_results.items():
+            # Veri tek seferde alınır; DataFrame olmayan ya da boş sonuçlar atlanır
+            df_to_export = result.get("data") if result else None
+            if not isinstance(df_to_export, pd.DataFrame) or df_to_export.empty:
+                continue
+            
+            # Ayrı sheet oluştur
+            sheet_name = (analysis_name[:25] + f"_{len(sheets) + 1}").translate(SHEET_NAME_TRANS)
+            sheets.append((sheet_name, df_to_export, False))
+            
+            # Birleştirme için de hazırla
+            combined_names.append(analysis_name)
+            combined_frames.append(df_to_export)
+        
+        analysis_sheet_count = len(sheets)
+        if not analysis_sheet_count:
+            return 0
+        
+        # Şimdi tüm verileri birleştiren sheet'i oluştur: analiz adı sütunu birleştirmeden
+        # sonra tek seferde eklenir, böylece her sonuç ayrıca kopyalanmaz
+        combined_df = pd.concat(combined_frames, ignore_index=True, sort=False)
+        combined_df.insert(0, 'Analiz_Türü', np.repeat(combined_names, [len(df) for df in combined_frames]))
+        sheets.append(('Tüm_Analiz_Sonuçları', combined_df, True))
+        
+        # Her sayfa için ilerleme değeri (%0-%80) önceden tamsayı olarak hesaplanır
+        progress_steps = [(i * 80) // analysis_sheet_count for i in range(analysis_sheet_count)] + [80]
+        messages = [f"Yazılıyor: {sheet_name}" for sheet_name, _, _ in sheets[:-1]] + ["Birleştirilmiş sayfa yazılıyor..."]
+        emit_progress = self.progress.emit
         
-        # Stabilite ayarları
-        self.setup_application_stability()
+        try:
+            with zipfile.ZipFile(self.file_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+                for sheet_idx, (_, df, styled) in enumerate(sheets, start=1):
+                    emit_progress(progress_steps[sheet_idx - 1], messages[sheet_idx - 1])
+                    with zf.open(f'xl/worksheets/sheet{sheet_idx}.xml', 'w', force_zip64=True) as f:
+                        self._write_sheet(f, df, styled)
+                
+                emit_progress(95, "Excel dosyası kaydediliyor...")
+                write_xlsx_package_parts(zf, [sheet_name for sheet_name, _, _ in sheets], self.STYLES_XML)
+        except BaseException:
+            # Yarım kalan dosyayı sil
+            if os.path.exists(self.file_path):
+                os.remove(self.file_path)
+            raise
+        
+        return analysis_sheet_count
+    
+    def _iter_rows(self, df):
+        """
+        Boş değerleri None'a çevrilmiş satırları liste olarak üretir
         
-        # Kısayol tuşlarını ayarla
-        self.setup_shortcuts()
+        Satırlar CANCEL_CHECK_ROWS'luk parçalar halinde tek bir NumPy nesne dizisine
+        çevrilir ve tolist() ile açılır; böylece tüm tablonun nesne kopyası ya da
+        satır başına tuple kutulaması yapılmaz. İptal her parçada kontrol edilir.
+        """
+        chunk_size = self.CANCEL_CHECK_ROWS
+        for start in range(0, len(df), chunk_size):
+            if self._cancel.is_set():
+                raise ExportCancelled()
+            block = df.iloc[start:start + chunk_size].to_numpy(dtype=object, copy=True)
+            block[pd.isna(block)] = None
+            yield from block.tolist()
     
-    def apply_modern_style(self):
-        """Apply modern Apple-style theme to the application"""
-        style_sheet = """
-        /* Modern Apple-like Theme */
-        QMainWindow {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #f8fafb, stop:1 #e8edf2);
-            color: #1c1e21;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-        }
+    @classmethod
+    def _append_cell(cls, row_el, ref, value, style):
+        """Değerin türüne göre sayı, mantıksal, tarih ya da satır içi metin hücresi ekler"""
+        if isinstance(value, bool):
+            cell = etree.SubElement(row_el, 'c', r=ref, t='b')
+            etree.SubElement(cell, 'v').text = '1' if value else '0'
+        elif isinstance(value, (int, float, np.integer, np.floating)) and math.isfinite(value):
+            cell = etree.SubElement(row_el, 'c', r=ref)
+            etree.SubElement(cell, 'v').text = str(value)
+        elif isinstance(value, (int, float, np.integer, np.floating)):
+            # Sonsuz değerler Excel'de karşılığı olmadığından boş bırakılır
+            cell = etree.SubElement(row_el, 'c', r=ref)
+        elif isinstance(value, datetime.date):
+            # Tarihler (datetime ve pandas Timestamp dahil) seri numarası ve tarih biçimiyle
+            # yazılır; Excel saat dilimi desteklemediğinden saat dilimi bilgisi atılır
+            if isinstance(value, datetime.datetime):
+                num_fmt = cls.DATE_NUM_FMTS[0]
+                if value.tzinfo is not None:
+                    value = value.replace(tzinfo=None)
+            else:
+                num_fmt = cls.DATE_NUM_FMTS[1]
+            cell = etree.SubElement(row_el, 'c', r=ref)
+            etree.SubElement(cell, 'v').text = repr(to_excel_serial(value))
+            style = cls.DATE_STYLES[(style, num_fmt)]
+        else:
+            cell = etree.SubElement(row_el, 'c', r=ref, t='inlineStr')
+            text = etree.SubElement(etree.SubElement(cell, 'is'), 't')
+            text.set(_XML_SPACE, 'preserve')
+            text.text = ILLEGAL_CHARACTERS_RE.sub('', str(value))
+        if style is not None:
+            cell.set('s', style)
+    
+    def _write_sheet(self, f, df, styled):
+        """
+        Bir sayfanın worksheet XML'ini arşivdeki dosyaya satır satır yazar
+        
+        Biçimli (birleştirilmiş) sayfada sütun genişlikleri DataFrame üzerinden
+        hesaplanır, satırlar analiz türü değiştikçe sıradaki renk biçimini alır ve
+        boş hücreler de renk ile kenarlık için yazılır. Her satır öğesi oluşturulur
+        oluşturulmaz etree.xmlfile ile serileştirilir.
+        
+        Args:
+            f: xl/worksheets/sheetN.xml için yazma kipinde açılmış arşiv dosyası
+            df (pd.DataFrame): Yazılacak veri
+            styled (bool): Birleştirilmiş sayfa biçimi uygulansın mı
+        """
+        letters = [get_column_letter(i) for i in range(1, len(df.columns) + 1)]
+        append_cell = self._append_cell
+        sub_element = etree.SubElement
+        
+        cols = ''
+        header_style = None
+        if styled:
+            # Sütun genişliklerini otomatik ayarla (maksimum genişlik sınırı 50)
+            col_entries = []
+            for col_num, column in enumerate(df.columns, 1):
+                # pandas 3'te astype(str) boş değerleri NaN bırakır; tamamen boş sütunda veya
+                # boş tabloda en uzun değer NaN olur ve 0 sayılır
+                longest = df[column].astype(str).str.len().max()
+                max_length = max(len(str(column)), 0 if pd.isna(longest) else int(longest))
+                col_entries.append(f'<col min="{col_num}" max="{col_num}" width="{min(max_length + 2, 50)}" customWidth="1"/>')
+            cols = f'<cols>{"".join(col_entries)}</cols>'
+            header_style = self.HEADER_STYLE
+            
+            # Analiz türü sütununa göre satırları renklendir: yeni analiz türü başladığında renk değişir
+            analysis_types = df['Analiz_Türü']
+            color_indices = ((analysis_types != analysis_types.shift()).cumsum() % len(self.ROW_COLORS)).to_numpy()
+            row_styles = [self.ROW_STYLES[i] for i in color_indices]
+        else:
+            row_styles = repeat(None)
+        
+        f.write(_XLSX_WORKSHEET_OPEN)
+        f.write(cols.encode('utf-8'))
+        with etree.xmlfile(f, encoding='utf-8') as xf:
+            with xf.element('sheetData'):
+                header_row = etree.Element('row', r='1')
+                if styled:
+                    # Başlık satırının yüksekliğini ayarla
+                    header_row.set('ht', '25')
+                    header_row.set('customHeight', '1')
+                for letter, column in zip(letters, df.columns):
+                    append_cell(header_row, f'{letter}1', str(column), header_style)
+                xf.write(header_row)
+                
+                for row_num, (values, style) in enumerate(zip(self._iter_rows(df), row_styles), start=2):
+                    row_el = etree.Element('row', r=str(row_num))
+                    for letter, value in zip(letters, values):
+                        if value is None:
+                            if style is not None:
+                                sub_element(row_el, 'c', r=f'{letter}{row_num}', s=style)
+                            continue
+                        append_cell(row_el, f'{letter}{row_num}', value, style)
+                    xf.write(row_el)
+        f.write(b'</worksheet>')
+
+# DataFrame birleştirme işlemini arka planda yapan thread
+class MergeDataFramesThread(QThread):
+    # Sinyaller
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object, str)  # birleştirilmiş DataFrame (hata durumunda None), hata mesajı
+
+    def __init__(self, dataframes):
+        super().__init__()
+        self.dataframes = list(dataframes)
+
+    def run(self):
+        try:
+            self.progress.emit(20, "Veriler birleştiriliyor...")
+
+            if len(self.dataframes) == 1:
+                # Tek bir dataframe varsa direkt onu kullan
+                merged_df = self.dataframes[0].copy()
+            else:
+                # Birden fazla dataframe'i birleştir
+                merged_df = pd.concat(self.dataframes, ignore_index=True)
+
+            # Tekrarlayan kod sütunlarını birleştirilmiş veride bir kez category'ye çevir
+            optimize_categorical_columns(merged_df)
+
+            self.progress.emit(50, "Birleştirilmiş veri gösteriliyor...")
+            self.finished.emit(merged_df, "")
+
+        except Exception as e:
+            log.exception("Birleştirme thread hatası")
+            self.finished.emit(None, str(e))
+
+# Örnekleme işlemini arka planda yapan thread
+class SamplingThread(QThread):
+    # Sinyaller
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object, str)  # sonuç DataFrame'i (hata durumunda None), hata mesajı
+
+    def __init__(self, sampling_tool, df, min_count, max_count, sample_rate):
+        super().__init__()
+        self.sampling_tool = sampling_tool
+        self.df = df
+        self.min_count = min_count
+        self.max_count = max_count
+        self.sample_rate = sample_rate
+
+    def run(self):
+        try:
+            self.progress.emit(30, "Beyannameler seçiliyor...")
+            self.sampling_tool.set_dataframe(self.df)
+
+            self.progress.emit(50, "Beyannameler seçiliyor...")
+            results_df = self.sampling_tool.run_sampling(
+                min_sample_count=self.min_count,
+                max_sample_count=self.max_count,
+                sample_percentage=self.sample_rate
+            )
+
+            self.progress.emit(80, "Sonuçlar gösteriliyor...")
+            self.finished.emit(results_df, "")
+
+        except Exception as e:
+            log.exception("Örnekleme thread hatası")
+            self.finished.emit(None, str(e))
+
+# QRunnable sinyal tanımlayamadığı için kontrol sinyalleri ayrı bir QObject'te tutulur
+class CheckSignals(QObject):
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(str, object, str)  # kontrol adı, analiz sonucu (hata durumunda None), hata mesajı
+
+def _safe_check(fn):
+    """
+    Toplu çalıştırma sırasında kontrol işleyicisinin hatasını kaydedip devam eder
+    
+    Hata nesnesi self._check_errors listesine eklenir, metne çevrilmesi toplu
+    çalıştırmanın sonundaki özet mesajına bırakılır. Tek başına çalıştırılan bir
+    kontrolde hata her zamanki gibi yukarı iletilir.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return fn(self, *args, **kwargs)
+        except Exception as e:
+            if self._analysis_batch is None:
+                raise
+            self._check_errors.append((fn.__name__, e))
+    return wrapper
+
+# Tek bir analiz fonksiyonunu ortak thread havuzunda çalıştıran görev
+class CheckRunnable(QRunnable):
+    def __init__(self, name, analysis_func, df):
+        super().__init__()
+        self.name = name
+        self.analysis_func = analysis_func
+        self.df = df
+        self.signals = CheckSignals()
+
+    def run(self):
+        try:
+            self.signals.progress.emit(30, f"{self.name} çalışıyor...")
+            result = self.analysis_func(self.df)
+            # Sonuç tablosu önbellekte ve toplu çalıştırmada tutulduğundan saklamadan önce küçültülür
+            if isinstance(result, dict) and isinstance(result.get("data"), pd.DataFrame):
+                result["data"] = shrink_dataframe(result["data"])
+            self.signals.progress.emit(60, f"{self.name} sonuçları gösteriliyor...")
+            self.signals.finished.emit(self.name, result, "")
+
+        except Exception as e:
+            log.exception("%s hatası", self.name)
+            self.signals.finished.emit(self.name, None, str(e))
+
+class CustomsCheckApp(QMainWindow):
+    # Herhangi bir thread'de yakalanan hatayı GUI thread'ine taşıyan sinyal
+    unhandled_error = pyqtSignal(str)
+    
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Beyanname Kontrol Uygulaması")
+        self.setGeometry(100, 100, 1200, 800)
+        
+        # Store loaded data
+        self.all_dataframes = {}
+        self.current_df = None
+        self._df_cache = {}  # Sütun adı -> sayıya çevrilmiş NumPy dizisi
+        self._check_df = None  # Kontrollere verilen önbellekli veri görüntüsü
+        self.merged_df = None  # Birleştirilmiş tüm veriler için
+        
+        # Excel thread değişkeni
+        self.excel_thread = None
+        self.cancel_dialog = None
+        
+        # Durum çubuğu widget'ları (init_ui içinde oluşturulur)
+        self.progress_bar = None
+        self.status_label = None
+        
+        # Thread'lerden gelen ilerleme değerleri biriktirilip en fazla ~60 Hz ile ekrana yazılır
+        self._pending_progress = None  # (değer, mesaj)
+        self._ui_flush = QTimer(self)
+        self._ui_flush.setSingleShot(True)
+        self._ui_flush.setInterval(16)
+        self._ui_flush.timeout.connect(self._flush_progress)
+        
+        # Excel aktarımı ilerlemesini thread'in yuvasından okuyan periyodik zamanlayıcı
+        self._excel_poll = QTimer(self)
+        self._excel_poll.setInterval(16)
+        self._excel_poll.timeout.connect(self._poll_excel_progress)
+
+        # Birleştirme ve örnekleme thread değişkenleri
+        self.merge_thread = None
+        self.sampling_thread = None
+        
+        # Analiz kontrolleri için ortak thread havuzu (iş parçacığı sayısı = çekirdek sayısı)
+        self.check_pool = QThreadPool()
+        # Çalışan kontroller: kontrol adı -> (görev, sonuç gösterme fonksiyonu, önbellek anahtarı)
+        self.running_checks = {}
+        # Kontrol sonuçları önbelleği: (kontrol adı, veri parmak izi) -> sonuç
+        self._check_cache = {}
+        self._df_fp = None
+        # run_all_checks: bekleyen görevler (ad -> görev), gelen sonuçlar ve gösterim sırası
+        self._all_checks_pending = {}
+        self._all_checks_results = {}
+        self._all_checks_order = []
+        # run_all_analyses_and_export: toplu çalıştırma durumu ve Excel yazma thread'i
+        self._analysis_batch = None
+        self.analysis_export_thread = None
+        self._check_errors = []  # Toplu çalıştırmada kaydedilen (kontrol adı, hata) çiftleri
+        # Toplu çalıştırma dialog'unun ilerlemesi: çalışma kodu sadece (değer, mesaj) yazar,
+        # 50 ms'lik zamanlayıcı değişmişse widget'lara aktarır
+        self._batch_progress = (0, "")
+        self._batch_progress_timer = QTimer(self)
+        self._batch_progress_timer.setInterval(50)
+        self._batch_progress_timer.timeout.connect(self._flush_batch_progress)
+        
+        # Set application style
+        self.apply_modern_style()
+        
+        self.init_ui()
+        
+        # Stabilite ayarları
+        self.setup_application_stability()
+        
+        # Kısayol tuşlarını ayarla
+        self.setup_shortcuts()
+    
+    def apply_modern_style(self):
+        """Apply modern Apple-style theme to the application"""
+        style_sheet = """
+        /* Modern Apple-like Theme */
+        QMainWindow {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #f8fafb, stop:1 #e8edf2);
+            color: #1c1e21;
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
+        }
         
         /* Modern Tab Widget */
         QTabWidget {
@@ -900,7 +1626,9 @@ class CustomsCheckApp(QMainWindow):
             if gtip_col and df[gtip_col].nunique() > 0:
                 gtip_counts = df[gtip_col].value_counts()
                 for i in range(min(5, len(gtip_counts))):
-                    gtip_val = str(gtip_counts.index[i])[:15] + "..." if len(str(gtip_counts.index[i])) > 15 else str(gtip_counts.index[i])
+                    gtip_val = str(gtip_counts.index[i])
+                    if len(gtip_val) > 15:
+                        gtip_val = gtip_val[:15] + "..."
                     table.setItem(i, 0, QTableWidgetItem(gtip_val))
             
             # Ülke sütunu
@@ -1028,7 +1756,7 @@ class CustomsCheckApp(QMainWindow):
                 
                 if 'dataframe' in result and result['dataframe'] is not None:
                     # Get the DataFrame directly from the result
-                    df = result['dataframe']
+                    df = optimize_categorical_columns(result['dataframe'])
                     
                     # Store the DataFrame
                     file_name = os.path.basename(file_path)
@@ -1110,16 +1838,10 @@ class CustomsCheckApp(QMainWindow):
                 self.status_label.setText(message + " Birleştirilen veri hazırlanıyor...")
                 QApplication.processEvents()
                 
-                # 5. Birleştir ve göster
+                # 5. Birleştir ve göster (arka plan thread'i tamamlandığında
+                # on_merge_finished ilerleme çubuğunu gizler)
                 self.show_merged_dataframes()
-                self.progress_bar.setValue(100)
-                self.status_label.setText("Tüm dosyalar başarıyla birleştirildi ve gösteriliyor.")
-                QApplication.processEvents()
-                
-                # 6. Progress bar'ı kısa süre sonra gizle
-                from PyQt5.QtCore import QTimer
-                QTimer.singleShot(800, lambda: self.progress_bar.setVisible(False))
-                
+
             except Exception as e:
                 QMessageBox.critical(self, "Hata", f"Klasör işleme hatası: {str(e)}")
                 self.status_label.setText("Hata oluştu")
@@ -1148,6 +1870,12 @@ class CustomsCheckApp(QMainWindow):
         """Display a DataFrame in the data viewer and update other components"""
         self.current_df = df
         
+        # Yeni veri geldiğinde kontrol önbelleklerini geçersiz kıl
+        self._df_cache = {}
+        self._check_df = None
+        self._check_cache = {}
+        self._df_fp = (id(df), len(df), tuple(df.columns)) if df is not None else None
+        
         # Update data viewer
         self.data_viewer.set_dataframe(df)
         
@@ -1451,185 +2179,187 @@ class CustomsCheckApp(QMainWindow):
     
     # Check functions
     def run_all_checks(self):
-        """Run all data checks"""
+        """
+        Run all data checks
+        
+        Kontroller birbirinden bağımsız olduğundan her biri ortak thread havuzunda
+        ayrı bir görev olarak çalışır; toplam süre en uzun kontrolün süresine yaklaşır.
+        Sonuçlar geldikçe sayılır, hepsi bitince tek seferde gösterilir.
+        """
         if self.current_df is None:
             QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
             return
         
+        if self._all_checks_pending:
+            self.status_label.setText("Tüm kontroller zaten çalışıyor...")
+            return
+        
+        # (sonuç başlığı, kontrol türü, analiz fonksiyonu)
+        checks = [
+            ("GTIP-Ticari Tanım Kontrolü", "gtip_ticari_tanim", check_gtip_ticari_tanim_consistency),
+            ("GTİP-Tanım Detay Analizi", "gtip_tanim_detail", self._all_checks_gtip_tanim_detail),
+            ("Alıcı-Satıcı İlişki Kontrolü", "alici_satici_relationship", self._all_checks_alici_satici),
+            ("İşlem Niteliği Kontrolü", "islem_niteligi_consistency", self._all_checks_islem_niteligi),
+        ]
+        
         # İlerleme çubuğunu göster
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(10)
         self.status_label.setText("Tüm kontroller çalıştırılıyor...")
-        QApplication.processEvents()
         
-        results = {}
+        df = self._get_check_df()
+        self._all_checks_order = [(title, check_type) for title, check_type, _ in checks]
+        self._all_checks_results = {}
+        for title, _, analysis_func in checks:
+            runnable = CheckRunnable(title, analysis_func, df)
+            runnable.signals.finished.connect(self._on_all_checks_item_finished, Qt.QueuedConnection)
+            # Görev bitene kadar referansını tut
+            self._all_checks_pending[title] = runnable
+            self.check_pool.start(runnable)
+    
+    def _on_all_checks_item_finished(self, name, result, error_message):
+        """run_all_checks görevlerinden biri bittiğinde GUI thread'inde çağrılır"""
+        if self._all_checks_pending.pop(name, None) is None:
+            return
         
-        # İlerleme bildirimi için fonksiyon
-        def update_progress(value, message):
-            # Değeri ölçeklendir (0-100 aralığına)
-            scaled_value = int(10 + (value * 0.8))  # 10-90 arası
-            self.progress_bar.setValue(scaled_value)
-            self.status_label.setText(message)
-            QApplication.processEvents()
+        if error_message:
+            result = {
+                "status": "error",
+                "message": f"Analiz sırasında hata: {error_message}",
+            }
+        if result is not None:
+            self._all_checks_results[name] = result
         
-        # GTIP-Ticari Tanım tutarlılık kontrolü
-        self.status_label.setText("GTIP-Ticari Tanım kontrolü yapılıyor...")
-        self.progress_bar.setValue(30)
-        QApplication.processEvents()
+        total = len(self._all_checks_order)
+        done = total - len(self._all_checks_pending)
+        self.update_excel_progress(10 + int(80 * done / total), f"{name} tamamlandı ({done}/{total})")
         
-        gtip_ticari_tanim_check = check_gtip_ticari_tanim_consistency(self.current_df)
-        if gtip_ticari_tanim_check is not None:
-            gtip_ticari_tanim_check["type"] = "gtip_ticari_tanim"  # Kontrol türünü belirt
-            results["GTIP-Ticari Tanım Kontrolü"] = gtip_ticari_tanim_check
+        if self._all_checks_pending:
+            return
         
-        # GTİP-Tanım Detay Analizi
-        self.status_label.setText("GTİP-Tanım Detay Analizi yapılıyor...")
-        self.progress_bar.setValue(30)
-        QApplication.processEvents()
+        self._discard_pending_progress()
+        self.progress_bar.setValue(90)
+        self.status_label.setText("Sonuçlar gösteriliyor...")
         
+        # Sonuçları kontrollerin tanımlandığı sırayla ve kontrol türüyle birlikte topla
+        results = {}
+        for title, check_type in self._all_checks_order:
+            check = self._all_checks_results.get(title)
+            if check is not None:
+                check["type"] = check_type  # Kontrol türünü belirt
+                results[title] = check
+        self._all_checks_results = {}
+        
+        # Sonuçları CheckResultsWidget'a aktar
+        self.check_results_widget.set_check_results(results, self.current_df)
+        
+        # Otomatik olarak ilk sonucu seç
+        if self.check_results_widget.results_list.count() > 0:
+            self.check_results_widget.results_list.setCurrentRow(0)
+            self.check_results_widget.on_result_item_clicked(self.check_results_widget.results_list.currentItem())
+        
+        # İlerleme çubuğunu gizle
+        self.progress_bar.setValue(100)
+        self.status_label.setText("Tüm kontroller tamamlandı")
+        self.progress_bar.setVisible(False)
+    
+    @staticmethod
+    def _all_checks_gtip_tanim_detail(df):
+        """run_all_checks için kısaltılmış GTİP-Tanım detay analizi"""
         # Gerekli sütunları kontrol et
         required_columns_detail = ['Gtip', 'Ticari_tanimi']
-        missing_columns_detail = [col for col in required_columns_detail if col not in self.current_df.columns]
-        
-        if not missing_columns_detail:
-            try:
-                # Detay analizi çalıştır
-                filtered_df = self.current_df[
-                    self.current_df['Ticari_tanimi'].notna() & 
-                    (self.current_df['Ticari_tanimi'] != '') &
-                    self.current_df['Gtip'].notna() & 
-                    (self.current_df['Gtip'] != '')
-                ].copy()
-                
-                if len(filtered_df) > 0:
-                    grouped = filtered_df.groupby('Ticari_tanimi')['Gtip'].unique().reset_index()
-                    grouped['GTİP_Sayısı'] = grouped['Gtip'].apply(len)
-                    multiple_gtips = grouped[grouped['GTİP_Sayısı'] > 1]
-                    
-                    if not multiple_gtips.empty:
-                        # Detaylı sonuç oluştur (kısaltılmış versiyon)
-                        result_rows = []
-                        for _, row in multiple_gtips.head(10).iterrows():  # İlk 10 ticari tanım için
-                            ticari_tanim = row['Ticari_tanimi']
-                            ticari_rows = filtered_df[filtered_df['Ticari_tanimi'] == ticari_tanim].head(5)  # Her biri için 5 kayıt
-                            
-                            for _, data_row in ticari_rows.iterrows():
-                                result_row = {
-                                    'Ticari_tanimi': ticari_tanim,
-                                    'Gtip': data_row.get('Gtip', ''),
-                                    'Adi_unvani': data_row.get('Adi_unvani', ''),
-                                    'Beyanname_no': data_row.get('Beyanname_no', ''),
-                                }
-                                result_rows.append(result_row)
-                        
-                        result_df = pd.DataFrame(result_rows)
-                        
-                        results["GTİP-Tanım Detay Analizi"] = {
-                            "status": "warning",
-                            "message": f"{len(multiple_gtips)} ticari tanımda farklı GTİP kodları tespit edildi. (Özet: ilk 10 tanım)",
-                            "data": result_df,
-                            "type": "gtip_tanim_detail"
-                        }
-                    else:
-                        results["GTİP-Tanım Detay Analizi"] = {
-                            "status": "ok",
-                            "message": "Aynı ticari tanımda farklı GTİP kodu kullanımı tespit edilmedi.",
-                            "type": "gtip_tanim_detail"
-                        }
-                else:
-                    results["GTİP-Tanım Detay Analizi"] = {
-                        "status": "warning",
-                        "message": "Analiz için uygun veri bulunamadı.",
-                        "type": "gtip_tanim_detail"
-                    }
-            except Exception as e:
-                results["GTİP-Tanım Detay Analizi"] = {
-                    "status": "error",
-                    "message": f"Analiz sırasında hata: {str(e)}",
-                    "type": "gtip_tanim_detail"
-                }
-        else:
+        missing_columns_detail = [col for col in required_columns_detail if col not in df.columns]
+        if missing_columns_detail:
             missing_cols_str = ", ".join(missing_columns_detail)
-            results["GTİP-Tanım Detay Analizi"] = {
+            return {
                 "status": "error",
-                "message": f"Kontrol için gerekli sütunlar eksik: {missing_cols_str}",
-                "type": "gtip_tanim_detail"
+                "message": f"Kontrol için gerekli sütunlar eksik: {missing_cols_str}"
             }
         
-        # Alıcı-Satıcı ilişki kontrolü (firma seçimi olmadan çalıştır)
-        self.status_label.setText("Alıcı-Satıcı ilişki kontrolü yapılıyor...")
-        self.progress_bar.setValue(30)
-        QApplication.processEvents()
-        
-        if "Alici_satici_iliskisi" in self.current_df.columns:
-            alici_satici_check = check_alici_satici_relationship(self.current_df, 
-                                                              progress_callback=update_progress)
-            if alici_satici_check is not None:
-                alici_satici_check["type"] = "alici_satici_relationship"  # Kontrol türünü belirt
-                results["Alıcı-Satıcı İlişki Kontrolü"] = alici_satici_check
-        
-        # İşlem Niteliği kontrolü
-        self.status_label.setText("İşlem Niteliği kontrolü yapılıyor...")
-        self.progress_bar.setValue(60)
-        QApplication.processEvents()
-        
-        # İşlem Niteliği kontrolü için gerekli sütunların varlığını kontrol et
-        required_columns = ['Kalem_Islem_Niteligi', 'Odeme_sekli', 'Rejim']
-        missing_columns = [col for col in required_columns if col not in self.current_df.columns]
-        
-        if not missing_columns:
-            # 1. Kontrol: Ödeme şekli "bedelsiz" ise işlem niteliği kodu "99" olmalı
-            bedelsiz_payment_filter = self.current_df['Odeme_sekli'].str.lower().str.contains('bedelsiz', na=False)
-            incorrect_payment_code = self.current_df[bedelsiz_payment_filter & (self.current_df['Kalem_Islem_Niteligi'] != '99')]
-            
-            # 2. Kontrol: Rejim kodu "6123" ise işlem niteliği kodu "61" olmalı
-            rejim_filter = self.current_df['Rejim'] == '6123'
-            incorrect_rejim_code = self.current_df[rejim_filter & (self.current_df['Kalem_Islem_Niteligi'] != '61')]
-            
-            # Tüm tutarsızlıkları birleştir
-            all_inconsistencies = pd.concat([incorrect_payment_code, incorrect_rejim_code]).drop_duplicates()
+        try:
+            filtered_df = df[
+                df['Ticari_tanimi'].notna() & 
+                (df['Ticari_tanimi'] != '') &
+                df['Gtip'].notna() & 
+                (df['Gtip'] != '')
+            ]
             
-            # Sonuçları hazırla
-            if len(all_inconsistencies) > 0:
-                results["İşlem Niteliği Kontrolü"] = {
+            if len(filtered_df) == 0:
+                return {
                     "status": "warning",
-                    "message": f"{len(all_inconsistencies)} adet tutarsız işlem niteliği kodu bulundu.",
-                    "data": all_inconsistencies,
-                    "type": "islem_niteligi_consistency"
+                    "message": "Analiz için uygun veri bulunamadı."
                 }
-            else:
-                results["İşlem Niteliği Kontrolü"] = {
+            
+            grouped = filtered_df.groupby('Ticari_tanimi')['Gtip'].unique().reset_index()
+            grouped['GTİP_Sayısı'] = grouped['Gtip'].apply(len)
+            multiple_gtips = grouped[grouped['GTİP_Sayısı'] > 1]
+            
+            if multiple_gtips.empty:
+                return {
                     "status": "ok",
-                    "message": "Tüm işlem niteliği kodları ödeme şekli ve rejim kodu ile tutarlı.",
-                    "type": "islem_niteligi_consistency"
+                    "message": "Aynı ticari tanımda farklı GTİP kodu kullanımı tespit edilmedi."
                 }
-        else:
+            
+            # Detaylı sonuç oluştur (kısaltılmış versiyon: ilk 10 tanım, her biri için 5 kayıt)
+            result_df = CustomsCheckApp._gtip_tanim_detail_rows(
+                filtered_df, multiple_gtips['Ticari_tanimi'].head(10), per_tanim=5
+            )[['Ticari_tanimi', 'Gtip', 'Adi_unvani', 'Beyanname_no']]
+            
+            return {
+                "status": "warning",
+                "message": f"{len(multiple_gtips)} ticari tanımda farklı GTİP kodları tespit edildi. (Özet: ilk 10 tanım)",
+                "data": result_df
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Analiz sırasında hata: {str(e)}"
+            }
+    
+    @staticmethod
+    def _all_checks_alici_satici(df):
+        """run_all_checks için alıcı-satıcı ilişki kontrolü (firma seçimi olmadan)"""
+        if "Alici_satici_iliskisi" not in df.columns:
+            return None
+        return check_alici_satici_relationship(df)
+    
+    @staticmethod
+    def _all_checks_islem_niteligi(df):
+        """run_all_checks için işlem niteliği - ödeme şekli/rejim tutarlılık kontrolü"""
+        # İşlem Niteliği kontrolü için gerekli sütunların varlığını kontrol et
+        required_columns = ['Kalem_Islem_Niteligi', 'Odeme_sekli', 'Rejim']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
             missing_cols_str = ", ".join(missing_columns)
-            results["İşlem Niteliği Kontrolü"] = {
+            return {
                 "status": "error",
-                "message": f"Kontrol için gerekli sütunlar eksik: {missing_cols_str}",
-                "type": "islem_niteligi_consistency"
+                "message": f"Kontrol için gerekli sütunlar eksik: {missing_cols_str}"
             }
         
-        # Update the check results widget
-        self.progress_bar.setValue(80)
-        self.status_label.setText("Sonuçlar gösteriliyor...")
-        QApplication.processEvents()
+        # 1. Kontrol: Ödeme şekli "bedelsiz" ise işlem niteliği kodu "99" olmalı
+        bedelsiz_payment_filter = df['Odeme_sekli'].str.lower().str.contains('bedelsiz', na=False)
+        incorrect_payment_code = df[bedelsiz_payment_filter & (df['Kalem_Islem_Niteligi'] != '99')]
         
-        # Sonuçları CheckResultsWidget'a aktar
-        self.check_results_widget.set_check_results(results, self.current_df)
+        # 2. Kontrol: Rejim kodu "6123" ise işlem niteliği kodu "61" olmalı
+        rejim_filter = df['Rejim'] == '6123'
+        incorrect_rejim_code = df[rejim_filter & (df['Kalem_Islem_Niteligi'] != '61')]
         
-        # Otomatik olarak ilk sonucu seç
-        if self.check_results_widget.results_list.count() > 0:
-            self.check_results_widget.results_list.setCurrentRow(0)
-            self.check_results_widget.on_result_item_clicked(self.check_results_widget.results_list.currentItem())
+        # Tüm tutarsızlıkları birleştir
+        all_inconsistencies = pd.concat([incorrect_payment_code, incorrect_rejim_code]).drop_duplicates()
         
-        # İlerleme çubuğunu gizle
-        self.progress_bar.setValue(100)
-        self.status_label.setText("Tüm kontroller tamamlandı")
-        QApplication.processEvents()
-        self.progress_bar.setVisible(False)
+        # Sonuçları hazırla
+        if len(all_inconsistencies) > 0:
+            return {
+                "status": "warning",
+                "message": f"{len(all_inconsistencies)} adet tutarsız işlem niteliği kodu bulundu.",
+                "data": all_inconsistencies
+            }
+        return {
+            "status": "ok",
+            "message": "Tüm işlem niteliği kodları ödeme şekli ve rejim kodu ile tutarlı."
+        }
     
+    @_safe_check
     def check_missing_values(self):
         """Check for missing values"""
         if self.current_df is None:
@@ -1657,6 +2387,7 @@ class CustomsCheckApp(QMainWindow):
             }
             self.check_results_widget.set_check_results(result)
     
+    @_safe_check
     def check_duplicate_rows(self):
         """Check for duplicate rows"""
         if self.current_df is None:
@@ -1677,6 +2408,7 @@ class CustomsCheckApp(QMainWindow):
             duplicate_data = self.current_df[self.current_df.duplicated(keep='first')]
             self.check_results_widget.show_details(duplicate_data)
     
+    @_safe_check
     def check_weight_consistency(self):
         """Check for weight consistency (Brut_agirlik >= Net_agirlik)"""
         if self.current_df is None:
@@ -1699,6 +2431,7 @@ class CustomsCheckApp(QMainWindow):
             }
             self.check_results_widget.set_check_results(result)
     
+    @_safe_check
     def check_islem_niteligi_consistency(self):
         """Check for Kalem_Islem_Niteligi consistency with payment method and regime code"""
         if self.current_df is None:
@@ -1710,16 +2443,13 @@ class CustomsCheckApp(QMainWindow):
             self.status_label.setText("İşlem Niteliği tutarlılık kontrolü çalışıyor...")
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(10)
-            QApplication.processEvents()  # UI güncellemesi için
             
             # Modülü kullanarak kontrol yap
             self.progress_bar.setValue(50)
-            QApplication.processEvents()
             
             result = kontrol_islem_niteligi_tutarlilik(self.current_df)
             
             self.progress_bar.setValue(80)
-            QApplication.processEvents()
             
             # Sonuçları işle
             if result["status"] == "warning":
@@ -1782,6 +2512,7 @@ class CustomsCheckApp(QMainWindow):
         QMessageBox.information(self, "Bilgi", "Bu özellik kaldırılmıştır.")
         return
     
+    @_safe_check
     def check_alici_satici_relationship(self):
         """Alıcı-Satıcı ilişki kontrolü"""
         if self.current_df is None:
@@ -1817,7 +2548,6 @@ class CustomsCheckApp(QMainWindow):
             self.status_label.setText("Alıcı-Satıcı ilişki kontrolü çalışıyor...")
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(10)
-            QApplication.processEvents()
             
             selected_companies = None
             
@@ -1825,7 +2555,6 @@ class CustomsCheckApp(QMainWindow):
             def update_progress(value, message):
                 self.progress_bar.setValue(value)
                 self.status_label.setText(message)
-                QApplication.processEvents()  # UI'nin yanıt vermesini sağla
             
             # Kullanıcı firma seçmek isterse
             if response == QMessageBox.Yes:
@@ -1900,7 +2629,6 @@ class CustomsCheckApp(QMainWindow):
             
             # İlerleme çubuğunu güncelle
             self.progress_bar.setValue(30)
-            QApplication.processEvents()
             
             # Kontrol işlemini çağır
             result = check_alici_satici_relationship(self.current_df, selected_companies, progress_callback=update_progress)
@@ -1910,7 +2638,6 @@ class CustomsCheckApp(QMainWindow):
             
             # İlerleme çubuğunu güncelle
             self.progress_bar.setValue(80)
-            QApplication.processEvents()
             
             if result["status"] == "error":
                 QMessageBox.warning(self, "Uyarı", result["message"])
@@ -1961,7 +2688,6 @@ class CustomsCheckApp(QMainWindow):
             
             # İlerleme çubuğunu güncelle
             self.progress_bar.setValue(90)
-            QApplication.processEvents()
                 
             # Sonuçları göster
             if result["data"] is not None:
@@ -2027,7 +2753,6 @@ class CustomsCheckApp(QMainWindow):
             # İşlem tamamlandı
             self.progress_bar.setValue(100)
             self.progress_bar.setVisible(False)
-            QApplication.processEvents()
             
         except Exception as e:
             error_msg = f"Alıcı-Satıcı ilişki kontrolü sırasında hata: {str(e)}"
@@ -2155,189 +2880,16 @@ class CustomsCheckApp(QMainWindow):
             else:
                 high_risk_pct = medium_risk_pct = low_risk_pct = 0
             
-            # Yönetici özeti HTML
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>Alıcı-Satıcı Risk Analizi</title>
-            <style>
-                    body {{
-                        font-family: 'Segoe UI', Arial, sans-serif;
-                margin: 0;
-                        padding: 20px;
-                        background: #f8f9fa;
-                    }}
-                    .container {{
-                        max-width: 1200px;
-                        margin: 0 auto;
-                        background: white;
-                        border-radius: 10px;
-                        box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                        overflow: hidden;
-                    }}
-                    .header {{
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        color: white;
-                        padding: 30px;
-                        text-align: center;
-                    }}
-                    .header h1 {{
-                        margin: 0;
-                        font-size: 24px;
-                        font-weight: 300;
-                    }}
-                    .executive-summary {{
-                        padding: 30px;
-                        background: #f8f9fa;
-                        border-bottom: 3px solid #dee2e6;
-                    }}
-                    .risk-banner {{
-                        background: {risk_color};
-                        color: white;
-                        padding: 20px;
-                        text-align: center;
-                        font-size: 20px;
-                        font-weight: bold;
-            margin-bottom: 20px;
-                        border-radius: 8px;
-                    }}
-                    .metrics-grid {{
-                        display: grid;
-                        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                        gap: 20px;
-                        margin: 20px 0;
-                    }}
-                    .metric-card {{
-                        background: white;
-                        padding: 20px;
-                        border-radius: 8px;
-                        text-align: center;
-                        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                        border-left: 4px solid #3498db;
-                    }}
-                    .metric-value {{
-                        font-size: 32px;
-                        font-weight: bold;
-                        color: #2c3e50;
-                        margin-bottom: 5px;
-                    }}
-                    .metric-label {{
-                        color: #7f8c8d;
-                        font-size: 14px;
-                        text-transform: uppercase;
-                        letter-spacing: 1px;
-                    }}
-                    .action-required {{
-                        background: #fff3cd;
-                        border: 1px solid #ffeaa7;
-                        border-radius: 8px;
-                        padding: 20px;
-                        margin: 20px 0;
-                    }}
-                    .action-required h3 {{
-                        color: #856404;
-                        margin-top: 0;
-                    }}
-                    .summary-table {{
-                width: 100%;
-                border-collapse: collapse;
-                        margin: 20px 0;
-                    }}
-                    .summary-table th {{
-                        background: #f8f9fa;
-                        padding: 12px;
-                text-align: left;
-                        border-bottom: 2px solid #dee2e6;
-                        font-weight: 600;
-                    }}
-                    .summary-table td {{
-                padding: 12px;
-                        border-bottom: 1px solid #dee2e6;
-                    }}
-                    .summary-table tr:hover {{
-                        background: #f8f9fa;
-                    }}
-                    .recommendation {{
-                        background: #e3f2fd;
-                        border-left: 4px solid #2196f3;
-                        padding: 20px;
-                        margin: 20px 0;
-                        border-radius: 0 8px 8px 0;
-                    }}
-                    .detail-table {{
-                        width: 100%;
-                        border-collapse: collapse;
-                        margin: 20px 0;
-                        font-size: 12px;
-                    }}
-                    .detail-table th {{
-                        background: linear-gradient(135deg, #1565c0 0%, #1976d2 100%);
-                        color: white;
-                        padding: 10px 8px;
-                        text-align: left;
-                        font-weight: 600;
-                    }}
-                    .detail-table td {{
-                        padding: 8px;
-                        border-bottom: 1px solid #e0e0e0;
-                        vertical-align: top;
-                    }}
-                    .detail-table tr:nth-child(even) {{
-                        background-color: #f8f9fa;
-                    }}
-                    .detail-table tr:hover {{
-                        background-color: #e3f2fd;
-                    }}
-                    .beyanname-badge {{
-                        background: #17a2b8;
-                        color: white;
-                        padding: 3px 8px;
-                        border-radius: 12px;
-                        font-size: 10px;
-                        font-weight: 500;
-                        display: inline-block;
-                    }}
-                    .firma-name {{
-                        font-weight: 500;
-                        color: #424242;
-                        max-width: 200px;
-                        word-wrap: break-word;
-                    }}
-            </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🏢 Alıcı-Satıcı İlişki Kontrolü</h1>
-                        <p>Yönetici Özeti</p>
-                    </div>
-                    
-                    <div class="executive-summary">
-                        <div class="risk-banner">
-                            {risk_icon} RİSK SEVİYESİ: {overall_risk}
-                        </div>
-                        
-                        <div class="metrics-grid">
-                            <div class="metric-card">
-                                <div class="metric-value">{total_companies:,}</div>
-                                <div class="metric-label">Toplam Şirket</div>
-                    </div>
-                            <div class="metric-card">
-                                <div class="metric-value">{total_transactions:,}</div>
-                                <div class="metric-label">Toplam İşlem</div>
-                </div>
-                            <div class="metric-card">
-                                <div class="metric-value">{problematic_beyannames:,}</div>
-                                <div class="metric-label">Sorunlu Beyanname</div>
-                    </div>
-                            <div class="metric-card">
-                                <div class="metric-value">{high_risk_companies + medium_risk_companies:,}</div>
-                                <div class="metric-label">İncelenmesi Gereken Şirket</div>
-                        </div>
-                </div>
-                """
+            # Yönetici özeti HTML (statik iskelet modül yüklenirken hazırlanır)
+            html = _ALICI_SATICI_HTML_HEADER.substitute(
+                risk_color=risk_color,
+                risk_icon=risk_icon,
+                overall_risk=overall_risk,
+                total_companies=f"{total_companies:,}",
+                total_transactions=f"{total_transactions:,}",
+                problematic_beyannames=f"{problematic_beyannames:,}",
+                review_companies=f"{high_risk_companies + medium_risk_companies:,}"
+            )
             
             # Kontrol türüne göre ek bilgi ekle
             if result.get("type") == "selected_companies":
@@ -2358,12 +2910,29 @@ class CustomsCheckApp(QMainWindow):
                     
                     # Firma bazında grupla
                     if sender_column in data_df.columns:
-                        firma_summary = data_df.groupby(sender_column).agg({
-                            'Beyanname_no': 'nunique',
-                            'Alici_satici_iliskisi': 'first'
-                        }).reset_index()
-                        firma_summary.columns = ['Firma', 'Beyanname_Sayisi', 'İlişki_Durumu']
-                        firma_summary = firma_summary.sort_values('Beyanname_Sayisi', ascending=False)
+                        # Firma-beyanname çiftlerini tekilleştirip saymak, grup başına
+                        # nunique hash kümesi kurmaktan daha ucuzdur
+                        beyanname_sayisi = (
+                            data_df[[sender_column, 'Beyanname_no']]
+                            .dropna(subset=['Beyanname_no'])
+                            .drop_duplicates()
+                            .groupby(sender_column, sort=False, observed=True)
+                            .size()
+                            .rename('Beyanname_Sayisi')
+                        )
+                        iliski_durumu = (
+                            data_df.groupby(sender_column, sort=False, observed=True)['Alici_satici_iliskisi']
+                            .first()
+                            .rename('İlişki_Durumu')
+                        )
+                        firma_summary = (
+                            pd.concat([beyanname_sayisi, iliski_durumu], axis=1)
+                            .fillna({'Beyanname_Sayisi': 0})
+                            .rename_axis('Firma')
+                            .reset_index()
+                            .sort_values('Beyanname_Sayisi', ascending=False, kind='stable')
+                        )
+                        firma_summary['Beyanname_Sayisi'] = firma_summary['Beyanname_Sayisi'].astype(int)
                         
                         html += """
                                 <h3 style="color: #2c3e50; margin: 20px 0;">📊 Seçili Firmaların Detayları</h3>
@@ -2378,18 +2947,12 @@ class CustomsCheckApp(QMainWindow):
                                     <tbody>
                         """
                         
-                        for _, row in firma_summary.iterrows():
-                            firma = row['Firma']
-                            beyanname_sayisi = row['Beyanname_Sayisi']
-                            iliski_durumu = row['İlişki_Durumu']
-                            
-                            html += f"""
-                                        <tr>
-                                            <td><div class="firma-name">{firma}</div></td>
-                                            <td><span class="beyanname-badge">{beyanname_sayisi} beyanname</span></td>
-                                            <td>{iliski_durumu}</td>
-                                        </tr>
-                            """
+                        html += "".join(
+                            _ALICI_SATICI_FIRMA_ROW(firma=firma, beyanname_sayisi=beyanname_sayisi, iliski_durumu=iliski_durumu)
+                            for firma, beyanname_sayisi, iliski_durumu in zip(
+                                firma_summary['Firma'], firma_summary['Beyanname_Sayisi'], firma_summary['İlişki_Durumu']
+                            )
+                        )
                         
                         html += """
                                     </tbody>
@@ -2411,26 +2974,26 @@ class CustomsCheckApp(QMainWindow):
                                     <tbody>
                         """
                         
-                        # Maksimum 50 beyanname göster
-                        for _, row in data_df.head(50).iterrows():
-                            firma = row.get(sender_column, '')
-                            beyanname = row.get('Beyanname_no', '')
-                            iliski_durumu = row.get('Alici_satici_iliskisi', '')
-                            
-                            html += f"""
-                                        <tr>
-                                            <td><div class="firma-name">{firma}</div></td>
-                                            <td><span class="beyanname-badge">{beyanname}</span></td>
-                                            <td>{iliski_durumu}</td>
-                                            <td>⚠️ İnceleme Gerekli</td>
-                                        </tr>
-                            """
+                        # Maksimum 50 beyanname göster (önizleme kontrol fonksiyonunda hazırlanır)
+                        preview_df = result.get("preview")
+                        if preview_df is None:
+                            preview_df = data_df.head(50)
+                        total_rows = result.get("total_rows", len(data_df))
+                        
+                        row_parts = []
+                        for _, row in preview_df.iterrows():
+                            row_parts.append(_ALICI_SATICI_BEYANNAME_ROW(
+                                firma=row.get(sender_column, ''),
+                                beyanname=row.get('Beyanname_no', ''),
+                                iliski_durumu=row.get('Alici_satici_iliskisi', '')
+                            ))
+                        html += "".join(row_parts)
                         
-                        if len(data_df) > 50:
+                        if total_rows > 50:
                             html += f"""
                                         <tr>
                                             <td colspan="4" style="text-align: center; font-style: italic; padding: 15px; background-color: #f5f5f5;">
-                                                <strong>📋 Toplam {len(data_df)} beyanname bulundu, ilk 50 tanesi gösterilmektedir.</strong>
+                                                <strong>📋 Toplam {total_rows} beyanname bulundu, ilk 50 tanesi gösterilmektedir.</strong>
                                             </td>
                                         </tr>
                             """
@@ -2477,36 +3040,26 @@ class CustomsCheckApp(QMainWindow):
                                 <tbody>
                     """
                     
-                    for _, row in stats_df.iterrows():
-                        firma = row['Firma']
-                        kod_0_sayisi = row['Kod_0_Sayısı']
-                        kod_6_sayisi = row['Kod_6_Sayısı']
-                        hatali_kod = row['Hatalı_Kod']
-                        hatali_beyanname_sayisi = row['Hatalı_Beyanname_Sayısı']
-                        
-                        # Hata oranına göre renk belirle
-                        toplam = kod_0_sayisi + kod_6_sayisi
-                        hata_orani = (hatali_beyanname_sayisi / toplam * 100) if toplam > 0 else 0
-                        
-                        if hata_orani > 50:
-                            row_color = "#ffebee"
-                            border_color = "#e74c3c"
-                        elif hata_orani > 30:
-                            row_color = "#fff3e0"
-                            border_color = "#f39c12"
-                        else:
-                            row_color = "#f3e5f5"
-                            border_color = "#9c27b0"
-                        
-                        html += f"""
-                                    <tr style="background-color: {row_color}; border-left: 3px solid {border_color};">
-                                        <td><div class="firma-name">{firma}</div></td>
-                                        <td><span class="beyanname-badge" style="background: #4caf50;">{kod_0_sayisi} beyanname</span></td>
-                                        <td><span class="beyanname-badge" style="background: #2196f3;">{kod_6_sayisi} beyanname</span></td>
-                                        <td><span class="beyanname-badge" style="background: {border_color};">KOD {hatali_kod}</span></td>
-                                        <td><span class="beyanname-badge" style="background: {border_color};">{hatali_beyanname_sayisi} hatalı</span></td>
-                                    </tr>
-                        """
+                    # Hata oranına göre renkleri tüm firmalar için tek seferde belirle
+                    toplam = stats_df['Kod_0_Sayısı'].to_numpy() + stats_df['Kod_6_Sayısı'].to_numpy()
+                    hata_orani = np.divide(stats_df['Hatalı_Beyanname_Sayısı'].to_numpy() * 100.0, toplam,
+                                           out=np.zeros(len(stats_df)), where=toplam > 0)
+                    renk_kosullari = [hata_orani > 50, hata_orani > 30]
+                    row_colors = np.select(renk_kosullari, ["#ffebee", "#fff3e0"], default="#f3e5f5")
+                    border_colors = np.select(renk_kosullari, ["#e74c3c", "#f39c12"], default="#9c27b0")
+                    
+                    row_parts = []
+                    for (_, row), row_color, border_color in zip(stats_df.iterrows(), row_colors, border_colors):
+                        row_parts.append(_ALICI_SATICI_TUTARSIZ_FIRMA_ROW(
+                            row_color=row_color,
+                            border_color=border_color,
+                            firma=row['Firma'],
+                            kod_0_sayisi=row['Kod_0_Sayısı'],
+                            kod_6_sayisi=row['Kod_6_Sayısı'],
+                            hatali_kod=row['Hatalı_Kod'],
+                            hatali_beyanname_sayisi=row['Hatalı_Beyanname_Sayısı']
+                        ))
+                    html += "".join(row_parts)
                     
                     html += """
                                 </tbody>
@@ -2533,64 +3086,54 @@ class CustomsCheckApp(QMainWindow):
                                 <tbody>
                     """
                     
-                    # Benzersiz beyanname listesi oluştur
-                    unique_beyannames_data = []
+                    # İlk 50 benzersiz beyannamenin satırları (önizleme kontrol fonksiyonunda hazırlanır)
+                    preview_df = result.get("preview")
+                    if preview_df is None:
+                        preview_df = data_df[data_df['Beyanname_no'].isin(data_df['Beyanname_no'].unique()[:50])]
                     
-                    # Her beyanname için kalem sayısını hesapla
-                    for beyanname_no in data_df['Beyanname_no'].unique()[:50]:  # İlk 50 benzersiz beyanname
-                        beyanname_rows = data_df[data_df['Beyanname_no'] == beyanname_no]
-                        first_row = beyanname_rows.iloc[0]  # İlk satırı al
-                        kalem_sayisi = len(beyanname_rows)  # Kalem sayısı
-                        
-                        unique_beyannames_data.append({
-                            'beyanname_no': beyanname_no,
-                            'firma': first_row.get(sender_column, ''),
-                            'kullandigi_kod': first_row.get('Alici_satici_iliskisi', ''),
-                            'dogru_kod': first_row.get('Dogru_Kod', ''),
-                            'kalem_sayisi': kalem_sayisi
-                        })
+                    # Her beyannamenin ilk satırı ve kalem sayısı
+                    first_rows = preview_df.drop_duplicates(subset=['Beyanname_no'])
+                    kalem_sayilari = preview_df.groupby('Beyanname_no', sort=False, observed=True).size()
                     
-                    # Benzersiz beyannameleri göster
-                    for beyanname_data in unique_beyannames_data:
-                        firma = beyanname_data['firma']
-                        beyanname_no = beyanname_data['beyanname_no']
-                        kullandigi_kod = beyanname_data['kullandigi_kod']
-                        dogru_kod = beyanname_data['dogru_kod']
-                        kalem_sayisi = beyanname_data['kalem_sayisi']
-                        
-                        # Bu firmaya ait istatistikleri bul
-                        firma_stats = stats_df[stats_df['Firma'] == firma]
-                        if not firma_stats.empty:
-                            kod_0_sayisi = firma_stats.iloc[0]['Kod_0_Sayısı']
-                            kod_6_sayisi = firma_stats.iloc[0]['Kod_6_Sayısı']
-                            firma_info = f"(Toplam: {kod_0_sayisi} benzersiz beyanname kod-0, {kod_6_sayisi} benzersiz beyanname kod-6)"
-                        else:
-                            firma_info = ""
-                        
-                        # Kalem sayısı badge rengi
-                        if kalem_sayisi == 1:
-                            kalem_color = "#6c757d"  # Gri - tek kalem
-                        elif kalem_sayisi <= 5:
-                            kalem_color = "#17a2b8"  # Mavi - az kalem
-                        elif kalem_sayisi <= 10:
-                            kalem_color = "#ffc107"  # Sarı - orta kalem
-                        else:
-                            kalem_color = "#dc3545"  # Kırmızı - çok kalem
+                    # Kalem sayısı badge renkleri: 1 gri, 2-5 mavi, 6-10 sarı, 11+ kırmızı
+                    kalem_palette = np.array(["#6c757d", "#17a2b8", "#ffc107", "#dc3545"])
+                    kalem_colors = dict(zip(
+                        kalem_sayilari.index,
+                        kalem_palette[np.digitize(kalem_sayilari.to_numpy(), [2, 6, 11])]
+                    ))
+                    
+                    # Firma istatistiklerini bir kez sözlüğe al
+                    firma_stats_map = {
+                        firma: f"(Toplam: {kod_0_sayisi} benzersiz beyanname kod-0, {kod_6_sayisi} benzersiz beyanname kod-6)"
+                        for firma, kod_0_sayisi, kod_6_sayisi in zip(
+                            stats_df['Firma'], stats_df['Kod_0_Sayısı'], stats_df['Kod_6_Sayısı']
+                        )
+                    }
+                    
+                    # Benzersiz beyannameleri tek geçişte göster
+                    row_parts = []
+                    for _, first_row in first_rows.iterrows():
+                        beyanname_no = first_row['Beyanname_no']
+                        firma = first_row.get(sender_column, '')
+                        kullandigi_kod = first_row.get('Alici_satici_iliskisi', '')
+                        dogru_kod = first_row.get('Dogru_Kod', '')
+                        kalem_sayisi = kalem_sayilari[beyanname_no]
+                        firma_info = firma_stats_map.get(firma, "")
                         
-                        html += f"""
-                                    <tr>
-                                        <td>
-                                            <div class="firma-name">{firma}</div>
-                                            <small style="color: #7f8c8d;">{firma_info}</small>
-                                        </td>
-                                        <td><span class="beyanname-badge">{beyanname_no}</span></td>
-                                        <td><span class="beyanname-badge" style="background: {kalem_color};">{kalem_sayisi} kalem</span></td>
-                                        <td><span class="beyanname-badge" style="background: #e74c3c;">KOD {kullandigi_kod}</span></td>
-                                        <td><span class="beyanname-badge" style="background: #27ae60;">KOD {dogru_kod}</span></td>
-                                    </tr>
-                        """
+                        row_parts.append(_ALICI_SATICI_HATALI_BEYANNAME_ROW(
+                            firma=firma,
+                            firma_info=firma_info,
+                            beyanname_no=beyanname_no,
+                            kalem_color=kalem_colors[beyanname_no],
+                            kalem_sayisi=kalem_sayisi,
+                            kullandigi_kod=kullandigi_kod,
+                            dogru_kod=dogru_kod
+                        ))
+                    html += "".join(row_parts)
                     
-                    total_unique_beyannames = len(data_df['Beyanname_no'].unique())
+                    total_unique_beyannames = result.get("total_unique_beyannames")
+                    if total_unique_beyannames is None:
+                        total_unique_beyannames = len(data_df['Beyanname_no'].unique())
                     if total_unique_beyannames > 50:
                         html += f"""
                                     <tr>
@@ -2688,33 +3231,44 @@ class CustomsCheckApp(QMainWindow):
             """
 
     def show_merged_dataframes(self):
-        """Tüm dataframe'leri birleştir ve göster"""
+        """Tüm dataframe'leri birleştir ve göster - Arka plan thread ile"""
         if not self.all_dataframes:
             QMessageBox.warning(self, "Uyarı", "Birleştirilecek veri bulunamadı")
             return
+        
+        # Önceki birleştirme devam ediyorsa yenisini başlatma
+        if self.merge_thread is not None and self.merge_thread.isRunning():
+            return
             
         try:
             # İlerleme çubuğunu göster
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(10)
             self.status_label.setText("Veriler birleştiriliyor...")
-            QApplication.processEvents()
             
-            # Tüm dataframe'leri birleştir
-            dfs_to_merge = list(self.all_dataframes.values())
-            
-            if len(dfs_to_merge) == 1:
-                # Tek bir dataframe varsa direkt onu göster
-                merged_df = dfs_to_merge[0].copy()
-            else:
-                # Birden fazla dataframe'i birleştir
-                merged_df = pd.concat(dfs_to_merge, ignore_index=True)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(50)
-            self.status_label.setText("Birleştirilmiş veri gösteriliyor...")
-            QApplication.processEvents()
+            # Birleştirme işlemini thread'de başlat
+            self.merge_thread = MergeDataFramesThread(self.all_dataframes.values())
+            self.merge_thread.progress.connect(self.update_excel_progress)
+            self.merge_thread.finished.connect(self.on_merge_finished)
+            self.merge_thread.start()
             
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Veriler birleştirilirken hata oluştu: {str(e)}")
+            self.progress_bar.setVisible(False)
+            self.status_label.setText("Hata oluştu")
+            return
+
+    def on_merge_finished(self, merged_df, error_message):
+        """Birleştirme thread'i tamamlandığında"""
+        self._discard_pending_progress()
+        
+        if merged_df is None:
+            QMessageBox.critical(self, "Hata", f"Veriler birleştirilirken hata oluştu: {error_message}")
+            self.progress_bar.setVisible(False)
+            self.status_label.setText("Hata oluştu")
+            return
+        
+        try:
             # Birleştirilmiş veriyi göster
             self.merged_df = merged_df
             self.display_dataframe(merged_df)
@@ -2728,17 +3282,14 @@ class CustomsCheckApp(QMainWindow):
             self.file_selector.setEnabled(False)
             
             # İlerleme çubuğunu gizle
+            self.progress_bar.setValue(100)
             self.progress_bar.setVisible(False)
             self.status_label.setText(f"Toplam {file_count} dosya birleştirildi. Toplam {row_count} satır, {len(merged_df.columns)} sütun.")
             
-            # Dashboard'u da güncelle (birleştirilmiş veriyle)
-            self.update_dashboard()
-            
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Veriler birleştirilirken hata oluştu: {str(e)}")
             self.progress_bar.setVisible(False)
             self.status_label.setText("Hata oluştu")
-            return
 
     def create_gtip_summary(self):
         """Create GTIP summary table"""
@@ -2775,41 +3326,51 @@ class CustomsCheckApp(QMainWindow):
         if reply == QMessageBox.No:
             return
         
+        # Önceki örnekleme devam ediyorsa yenisini başlatma
+        if self.sampling_thread is not None and self.sampling_thread.isRunning():
+            return
+        
         try:
             # İşleme başladığını göster
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(10)
             self.status_label.setText("Örnekleme yapılıyor...")
-            QApplication.processEvents()
             
             # Parametreleri al
             sample_rate = float(self.sample_rate_combo.currentText()) / 100
             min_count = self.min_sample_spin.value()
             max_count = self.max_sample_spin.value()
             
-            # İlerleme
-            self.progress_bar.setValue(30)
-            self.status_label.setText("Beyannameler seçiliyor...")
-            QApplication.processEvents()
-            
-            # Örnekleme yap
-            self.sampling_tool.set_dataframe(self.current_df)
+            # Örnekleme sürerken butonu devre dışı bırak
+            self.start_sampling_btn.setEnabled(False)
             
-            # İlerleme
-            self.progress_bar.setValue(50)
-            QApplication.processEvents()
-            
-            results_df = self.sampling_tool.run_sampling(
-                min_sample_count=min_count,
-                max_sample_count=max_count,
-                sample_percentage=sample_rate
+            # Örneklemeyi thread'de başlat
+            self.sampling_thread = SamplingThread(
+                self.sampling_tool, self.current_df, min_count, max_count, sample_rate
             )
+            self.sampling_thread.progress.connect(self.update_excel_progress)
+            self.sampling_thread.finished.connect(self.on_sampling_finished)
+            self.sampling_thread.start()
             
-            # İlerleme
-            self.progress_bar.setValue(80)
-            self.status_label.setText("Sonuçlar gösteriliyor...")
-            QApplication.processEvents()
-            
+        except Exception as e:
+            # Hata durumunda kullanıcıyı bilgilendir
+            QMessageBox.critical(self, "Hata", f"Örnekleme sırasında hata oluştu: {str(e)}")
+            self.status_label.setText("Örnekleme sırasında hata oluştu")
+            self.progress_bar.setVisible(False)
+            self.start_sampling_btn.setEnabled(True)
+    
+    def on_sampling_finished(self, results_df, error_message):
+        """Örnekleme thread'i tamamlandığında"""
+        self._discard_pending_progress()
+        self.start_sampling_btn.setEnabled(True)
+        
+        if results_df is None:
+            QMessageBox.critical(self, "Hata", f"Örnekleme sırasında hata oluştu: {error_message}")
+            self.status_label.setText("Örnekleme sırasında hata oluştu")
+            self.progress_bar.setVisible(False)
+            return
+        
+        try:
             # Sonuçları göster
             self.sampling_viewer.set_dataframe(results_df)
             
@@ -2891,7 +3452,6 @@ class CustomsCheckApp(QMainWindow):
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(10)
             self.status_label.setText("Excel aktarma işlemi başlatılıyor...")
-            QApplication.processEvents()
             
             # İptal butonu göster (QDialog içinde)
             self.cancel_dialog = QDialog(self)
@@ -2909,47 +3469,80 @@ class CustomsCheckApp(QMainWindow):
             # Thread oluştur ve başlat
             self.excel_thread = ExcelExportThread(self.sampling_tool, file_path)
             
-            # Thread sinyallerini bağla
-            self.excel_thread.progress.connect(self.update_excel_progress)
-            self.excel_thread.finished.connect(self.on_excel_export_finished)
+            # Bitiş sinyalini bağla (GUI thread'ine kuyruklu olarak iletilir); ilerleme
+            # sinyalle değil, 16 ms'lik zamanlayıcının yuvayı okumasıyla alınır
+            self.excel_thread.finished.connect(self.on_excel_export_finished, Qt.QueuedConnection)
+            self._excel_poll.start()
+            
+            # Dialog'u thread başlamadan önce göster (non-blocking)
+            self.cancel_dialog.show()
             
             # Thread'i başlat
             self.excel_thread.start()
             
-            # Dialog'u göster (non-blocking)
-            self.cancel_dialog.show()
-            
         except Exception as e:
             # Beklenmeyen hata durumunda
-            import traceback
-            print(f"Excel'e aktarma sırasında beklenmeyen hata: {str(e)}")
-            print(traceback.format_exc())
+            log.exception("Excel'e aktarma sırasında beklenmeyen hata")
             
             QMessageBox.critical(self, "Hata", f"Excel'e aktarma sırasında beklenmeyen bir hata oluştu: {str(e)}")
             self.status_label.setText("Excel'e aktarma sırasında beklenmeyen hata oluştu")
             self.progress_bar.setVisible(False)
 
     def update_excel_progress(self, value, message):
-        """Excel export progress güncellemesi"""
-        if hasattr(self, 'progress_bar'):
+        """
+        Thread ilerleme sinyallerini karşılar
+        
+        Değer hemen yazılmaz, sadece saklanır; 16 ms'lik zamanlayıcı son değeri tek
+        seferde uygular. Böylece sinyal sıklığından bağımsız olarak en fazla ~60 Hz
+        yeniden çizim yapılır.
+        """
+        self._pending_progress = (value, message)
+        if not self._ui_flush.isActive():
+            self._ui_flush.start()
+    
+    def _flush_progress(self):
+        """Bekleyen son ilerleme değerini, değişmişse, widget'lara yazar"""
+        if self._pending_progress is None:
+            return
+        value, message = self._pending_progress
+        self._pending_progress = None
+        
+        if self.progress_bar is not None and self.progress_bar.value() != value:
             self.progress_bar.setValue(value)
-        if hasattr(self, 'status_label'):
+        if self.status_label is not None and self.status_label.text() != message:
             self.status_label.setText(message)
-        QApplication.processEvents()
+    
+    def _poll_excel_progress(self):
+        """Excel thread'inin ilerleme yuvasını okur, değiştiyse ekrana yazar"""
+        if self.excel_thread is None:
+            self._excel_poll.stop()
+            return
+        update = self.excel_thread.poll_progress()
+        if update is not None:
+            self._pending_progress = update
+            self._flush_progress()
+    
+    def _discard_pending_progress(self):
+        """İşlem bittiğinde henüz yazılmamış eski ilerleme değerini atar"""
+        self._pending_progress = None
+        self._ui_flush.stop()
 
     def on_excel_export_finished(self, success, message, file_path):
         """Excel export thread tamamlandığında"""
+        self._excel_poll.stop()
+        self._discard_pending_progress()
+        
         # İlerleme çubuğunu güncelle
-        if hasattr(self, 'progress_bar'):
+        if self.progress_bar is not None:
             self.progress_bar.setValue(100 if success else 0)
             self.progress_bar.setVisible(False)
         
         # Durum mesajını güncelle
-        if hasattr(self, 'status_label'):
+        if self.status_label is not None:
             self.status_label.setText(message)
         
         # İptal dialog'unu kapat
-        if hasattr(self, 'cancel_dialog') and self.cancel_dialog:
+        if self.cancel_dialog is not None:
             self.cancel_dialog.accept()
             self.cancel_dialog = None
         
@@ -2961,7 +3554,7 @@ class CustomsCheckApp(QMainWindow):
 
     def cancel_excel_export(self):
         """Excel export işlemini iptal et"""
-        if hasattr(self, 'excel_thread') and self.excel_thread.isRunning():
+        if self.excel_thread is not None and self.excel_thread.isRunning():
             reply = QMessageBox.question(self, "İşlemi İptal Et", 
                                         "Excel aktarma işlemini iptal etmek istediğinizden emin misiniz?",
                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
@@ -2969,18 +3562,19 @@ class CustomsCheckApp(QMainWindow):
             if reply == QMessageBox.Yes:
                 # Thread'i iptal et
                 self.excel_thread.cancel()
+                self._excel_poll.stop()
                 
                 # Dialog'u kapat
-                if hasattr(self, 'cancel_dialog') and self.cancel_dialog:
+                if self.cancel_dialog is not None:
                     self.cancel_dialog.accept()
                     self.cancel_dialog = None
                 
                 # İlerleme çubuğunu güncelle
-                if hasattr(self, 'progress_bar'):
+                if self.progress_bar is not None:
                     self.progress_bar.setVisible(False)
                 
                 # Durum mesajını güncelle
-                if hasattr(self, 'status_label'):
+                if self.status_label is not None:
                     self.status_label.setText("Excel aktarma işlemi iptal edildi")
                 
                 QMessageBox.information(self, "İşlem İptal Edildi", "Excel aktarma işlemi kullanıcı tarafından iptal edildi.")
@@ -2989,8 +3583,7 @@ class CustomsCheckApp(QMainWindow):
         """Örnekleme sonuçlarını temizler"""
         if hasattr(self, 'sampling_tool'):
             # Örnekleme aracını temizle
-            self.sampling_tool.selected_beyannames = set()
-            self.sampling_tool.selection_reasons = {}
+            self.sampling_tool.clear_selection()
             
             # UI'ı temizle
             self.sampling_viewer.set_dataframe(None)
@@ -3005,571 +3598,277 @@ class CustomsCheckApp(QMainWindow):
 
     def setup_application_stability(self):
         """Uygulama stabilitesini arttırıcı ayarlar yapar"""
-        # Ana uygulama için 5 dakikada bir otomatik kurtarma
+        # Ana uygulama için 30 dakikada bir sağlık kontrolü
         self.stability_timer = QTimer(self)
         self.stability_timer.timeout.connect(self.check_application_health)
-        self.stability_timer.start(300000)  # 5 dakika
+        self.stability_timer.start(1800000)  # 30 dakika
+        
+        # Günlük kayıtlarını dönen dosyaya yaz (konsolsuz paketlenmiş uygulamada da çalışır)
+        self.setup_logging()
         
-        # Hata yakalama hook'u
+        # Çökme (segfault vb.) durumunda Python yığınını stderr'e yazdır
+        if sys.stderr is not None:
+            faulthandler.enable()
+        
+        # Hata diyaloğu her zaman olay döngüsünün bir sonraki turunda, GUI thread'inde açılır
+        self.unhandled_error.connect(self.show_unhandled_error, Qt.QueuedConnection)
+        
+        # Hata yakalama hook'ları (ana thread ve diğer thread'ler)
         sys.excepthook = self.global_exception_handler
+        threading.excepthook = self.thread_exception_handler
 
+    def setup_logging(self):
+        """Uygulama günlüğünü kullanıcı dizinindeki dönen dosyaya ve varsa konsola yönlendirir"""
+        if log.handlers:
+            return
+        
+        from logging.handlers import RotatingFileHandler
+        formatter = logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s")
+        log.setLevel(logging.INFO)
+        
+        try:
+            log_path = os.path.join(os.path.expanduser("~"), "customs_check.log")
+            file_handler = RotatingFileHandler(log_path, maxBytes=2 * 1024 * 1024, backupCount=3, encoding="utf-8")
+            file_handler.setFormatter(formatter)
+            log.addHandler(file_handler)
+        except OSError as e:
+            print(f"Günlük dosyası açılamadı: {str(e)}")
+        
+        if sys.stderr is not None:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            log.addHandler(console_handler)
+        
+        # Write-only Excel aktarımları lxml olmadan çok daha yavaş olan ElementTree yolunu kullanır
+        if not OPENPYXL_LXML:
+            log.warning("openpyxl lxml kullanmıyor; Excel aktarımları yavaş olabilir "
+                        "(lxml kurulu değil ya da OPENPYXL_LXML=False)")
+    
     def check_application_health(self):
-        """Uygulama sağlık kontrolü"""
+        """
+        Uygulama sağlık kontrolü
+        
+        Bellek, referans sayımı ve Python'un kuşak bazlı çöp toplayıcısı tarafından
+        yönetilir; büyük DataFrame'ler tutulurken tüm nesne grafiğini dolaşan tam
+        toplama yapılmaz. Sızıntı takibi için APP_GC_DEBUG ortam değişkeni ile
+        genç kuşak toplaması ve nesne sayısı raporu açılabilir.
+        """
+        if not os.environ.get("APP_GC_DEBUG"):
+            return
+        
         try:
-            # Bellek ve diğer kaynakları temizle
             import gc
-            gc.collect()
-            
-            # UI ile ilgili tüm bekleyen olayları işle
-            QApplication.processEvents()
-        except Exception as e:
-            print(f"Sağlık kontrolü hatası: {str(e)}")
+            collected = gc.collect(generation=1)
+            log.info("Sağlık kontrolü: %d nesne toplandı, izlenen nesne sayısı: %d", collected, len(gc.get_objects()))
+        except Exception:
+            log.exception("Sağlık kontrolü hatası")
 
     def global_exception_handler(self, exctype, value, traceback):
         """Global exception handler - uygulama kapanmasını önler"""
+        if issubclass(exctype, KeyboardInterrupt):
+            sys.__excepthook__(exctype, value, traceback)
+            return
+        
         try:
             # Hatayı logla
-            import traceback as tb
-            error_msg = ''.join(tb.format_exception(exctype, value, traceback))
-            print(f"Yakalanan hata:\n{error_msg}")
-            
-            # Kullanıcıya hatayı bildir ama kapanmayı önle
-            QMessageBox.critical(
-                self, 
-                "Uygulama Hatası", 
-                "Bir hata oluştu, ancak uygulama çalışmaya devam edecek.\n\n"
-                f"Hata detayı: {str(value)}"
-            )
-        except:
+            log.error("Yakalanan hata", exc_info=(exctype, value, traceback))
+            
+            # Kullanıcıya hatayı bildir ama kapanmayı önle (diyalog kuyruklu olarak açılır)
+            self.unhandled_error.emit(str(value))
+        except Exception:
             # Çift hata durumundan kaçın
             pass
+    
+    def thread_exception_handler(self, args):
+        """threading.excepthook - arka plan thread'lerinde yakalanmayan hataları bildirir"""
+        self.global_exception_handler(args.exc_type, args.exc_value, args.exc_traceback)
+    
+    def show_unhandled_error(self, message):
+        """Yakalanmayan hatayı kullanıcıya gösterir (GUI thread'inde çalışır)"""
+        QMessageBox.critical(
+            self, 
+            "Uygulama Hatası", 
+            "Bir hata oluştu, ancak uygulama çalışmaya devam edecek.\n\n"
+            f"Hata detayı: {message}"
+        )
 
-    def check_gtip_urun_kodu_consistency(self):
-        """GTİP-Ürün Kodu tutarlılık kontrolü"""
+    def _get_check_df(self):
+        """
+        Kontrollere verilecek, ölçü sütunları önceden sayıya çevrilmiş veri görüntüsünü döndürür
+        
+        XML'den gelen ölçü sütunları metin olduğundan her kontrol aynı sütunları yeniden
+        pd.to_numeric ile çeviriyordu. Dönüşüm veri yüklendiğinde bir kez yapılır ve
+        sütun bazında (_df_cache) saklanır; zaten sayısal olan sütunlarda to_numeric
+        maliyetsizdir. Sadece hiçbir değeri kaybetmeden çevrilebilen sütunlar değiştirilir.
+        """
         if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
+            return None
+        if self._check_df is not None:
+            return self._check_df
+        
+        df = self.current_df
+        self._df_cache = {}
+        for col in NUMERIC_MEASURE_COLUMNS:
+            if col not in df.columns or pd.api.types.is_numeric_dtype(df[col]):
+                continue
+            try:
+                converted = pd.to_numeric(df[col], errors='coerce')
+            except (TypeError, ValueError):
+                continue
+            if converted.isna().sum() == df[col].isna().sum():
+                self._df_cache[col] = converted.to_numpy()
+        
+        # Orijinal veriyi değiştirmeden sığ kopya üzerinde sütunları değiştir
+        snapshot = df.copy(deep=False)
+        for col, values in self._df_cache.items():
+            snapshot[col] = values
+        self._check_df = snapshot
+        return snapshot
+    
+    def _start_check(self, name, analysis_func, df, on_result):
+        """
+        Analiz fonksiyonunu ortak thread havuzunda çalıştırır
+        
+        Kontroller birbirinden bağımsızdır ve current_df'i yalnızca okur; bu yüzden
+        aynı anda birden fazla kontrol farklı çekirdeklerde çalışabilir. Sonuçlar
+        kuyruklu bağlantı ile _on_check_finished'e, oradan on_result'a iletilir.
+        """
+        if name in self.running_checks:
+            self.status_label.setText(f"{name} zaten çalışıyor...")
             return
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("GTİP-Ürün Kodu tutarlılık kontrolü çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()  # UI güncellemesi için
-            
-            # Analiz öncesi veri büyüklüğünü kontrol et
-            if len(self.current_df) > 1000:
-                # Büyük veri setleri için örnekleme yap
-                sample_size = min(1000, len(self.current_df))
-                sample_df = self.current_df.sample(sample_size)
-                process_df = sample_df
-                self.status_label.setText(f"Büyük veri seti ({len(self.current_df)} satır): Analiz için {sample_size} satır örnekleniyor...")
-            else:
-                process_df = self.current_df
-            
-            QApplication.processEvents()  # UI güncellemesi için
-            
-            # Analiz fonksiyonunu çağır
-            gtip_urun_kodu_check = check_gtip_urun_kodu_consistency(process_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(50)
-            QApplication.processEvents()
-            
-            if gtip_urun_kodu_check is not None:
-                result = {
-                    "GTIP-Ürün Kodu tutarlılık kontrolü": gtip_urun_kodu_check
-                }
-                
-                # Sonuçları widget'a aktar
-                self.check_results_widget.set_check_results(result)
-                
-                # İlerleme çubuğunu güncelle
-                self.progress_bar.setValue(80)
-                QApplication.processEvents()
-                
-                # HTML raporunu CheckResultsWidget'a ekle (arka planda)
-                if "html_report" in gtip_urun_kodu_check:
-                    print("HTML raporu bulundu, gösteriliyor...")
-                    
-                    # Görsel rapor için ekran boyutunu optimize et
-                    try:
-                        # Panelin genişliğini mümkün olduğunca artır
-                        self.check_results_widget.html_view.setSizePolicy(
-                            QSizePolicy.Expanding, QSizePolicy.Expanding)
-                    except Exception as e:
-                        print(f"Görünüm boyutu ayarlanamadı: {str(e)}")
-                    
-                    # Önce kısa bir yükleme bildirimi göster
-                    loading_html = """
-                        <html>
-                        <body style="font-family: Arial; padding: 20px; text-align: center;">
-                            <h2>GTİP-Ürün Kodu Raporu Hazırlanıyor</h2>
-                            <p>Lütfen bekleyin, rapor hazırlanıyor...</p>
-                            <div style="width:50%;height:20px;background-color:#f0f0f0;margin:20px auto;border-radius:10px;">
-                                <div style="width:100%;height:20px;background-color:#4299e1;border-radius:10px;animation:loading 1.5s infinite;"></div>
-                            </div>
-                            <style>
-                                @keyframes loading {
-                                    0% { width: 0%; }
-                                    50% { width: 100%; }
-                                    100% { width: 0%; }
-                                }
-                            </style>
-                        </body>
-                        </html>
-                    """
-                    self.check_results_widget.html_view.setHtml(loading_html)
-                    
-                    # Görsel rapor sekmesine doğrudan geçiş yap
-                    self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                    QApplication.processEvents()  # UI güncellemesi için
-                    
-                    # HTML içeriğini gecikmeli yükle (zamanlayıcı ile)
-                    from PyQt5.QtCore import QTimer
-                    QTimer.singleShot(300, lambda: self.check_results_widget.set_html_report(gtip_urun_kodu_check["html_report"]))
-                        
-                # Durum bilgisini güncelle
-                status = gtip_urun_kodu_check.get("status", "")
-                if status == "warning":
-                    self.status_label.setText("GTİP-Ürün Kodu tutarsızlıkları bulundu")
-                else:
-                    self.status_label.setText("GTİP-Ürün Kodu kontrolü tamamlandı")
-            else:
-                result = {
-                    "GTIP-Ürün Kodu tutarlılık kontrolü": {
-                        "status": "ok",
-                        "message": "GTIP-Ürün Kodu tutarlılık kontrolü bulunamadı."
-                    }
-                }
-                self.check_results_widget.set_check_results(result)
-                self.status_label.setText("GTİP-Ürün Kodu kontrolü tamamlandı")
-                
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
+        self.status_label.setText(f"{name} çalışıyor...")
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(10)
         
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"GTİP-Ürün Kodu kontrolü sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
-
-    def check_rarely_used_currency(self):
-        """Nadiren kullanılan döviz kontrolü"""
-        if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
+        # Aynı veri üzerinde daha önce çalıştırıldıysa sonucu önbellekten göster
+        cache_key = (name, self._df_fp)
+        cached_result = self._check_cache.get(cache_key)
+        if cached_result is not None:
+            self.running_checks[name] = (None, on_result, cache_key)
+            self._on_check_finished(name, cached_result, "")
             return
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("Nadiren kullanılan döviz analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Analiz fonksiyonunu çağır
-            currency_check = check_rarely_used_currency(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if currency_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", currency_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(currency_check["message"])
-                return
-            
-            result = {
-                "Nadiren Kullanılan Döviz Analizi": currency_check
-            }
-            
-            # Sonuçları widget'a aktar
-            self.check_results_widget.set_check_results(result)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in currency_check:
-                self.check_results_widget.set_html_report(currency_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in currency_check and "summary" in currency_check:
-                self.check_results_widget.show_details(currency_check["data"])
-                self.check_results_widget.show_summary(currency_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(currency_check["message"])
-            
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
+        runnable = CheckRunnable(name, analysis_func, df)
+        runnable.signals.progress.connect(self.update_excel_progress, Qt.QueuedConnection)
+        runnable.signals.finished.connect(self._on_check_finished, Qt.QueuedConnection)
         
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"Nadiren kullanılan döviz analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
-            
-    def check_rarely_used_origin_country(self):
-        """Nadiren kullanılan menşe ülke kontrolü"""
-        if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
+        # Görev bitene kadar referansını tut
+        self.running_checks[name] = (runnable, on_result, cache_key)
+        self.check_pool.start(runnable)
+    
+    def _on_check_finished(self, name, result, error_message):
+        """Havuzdaki bir kontrol tamamlandığında sonucu GUI thread'inde işler"""
+        self._discard_pending_progress()
+        _, on_result, cache_key = self.running_checks.pop(name, (None, None, None))
+        if on_result is None:
             return
         
+        # Toplu çalıştırmanın beklediği bir kontrolse sonucunu ayrıca topla
+        batch_analysis = None
+        if self._analysis_batch is not None:
+            batch_analysis = self._analysis_batch["pending"].pop(name, None)
+            results_before = self._snapshot_check_results()
+        
         try:
-            # İşlem başladığını göster
-            self.status_label.setText("Nadiren kullanılan menşe ülke analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
+            if error_message:
+                raise RuntimeError(error_message)
             
-            # Analiz fonksiyonunu çağır
-            country_check = check_rarely_used_origin_country(self.current_df)
+            # Veri o arada değişmediyse sonucu sakla
+            if result is not None and cache_key[1] == self._df_fp:
+                self._check_cache[cache_key] = result
             
-            # İşlem tamamlandığını göster
             self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if country_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", country_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(country_check["message"])
-                return
-            
-            result = {
-                "Nadiren Kullanılan Menşe Ülke Analizi": country_check
-            }
-            
-            # Sonuçları widget'a aktar
-            self.check_results_widget.set_check_results(result)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in country_check:
-                self.check_results_widget.set_html_report(country_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in country_check and "summary" in country_check:
-                self.check_results_widget.show_details(country_check["data"])
-                self.check_results_widget.show_summary(country_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(country_check["message"])
-            
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
+            on_result(result)
         
         except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"Nadiren kullanılan menşe ülke analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
-            
-    def check_rarely_used_payment_method(self):
-        """Nadiren kullanılan ödeme şekli kontrolü"""
-        if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
-            return
+            if batch_analysis is not None:
+                # Toplu çalıştırmada hatalar sonda tek mesajda gösterilir
+                self._check_errors.append((name, e))
+            else:
+                # Hata durumunda kullanıcıyı bilgilendir
+                error_msg = f"{name} sırasında hata: {str(e)}"
+                log.error(error_msg)
+                QMessageBox.critical(self, "Hata", error_msg)
+                self.status_label.setText("Hata oluştu")
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("Nadiren kullanılan ödeme şekli analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Analiz fonksiyonunu çağır
-            payment_check = check_rarely_used_payment_method(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if payment_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", payment_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(payment_check["message"])
-                return
-            
-            result = {
-                "Nadiren Kullanılan Ödeme Şekli Analizi": payment_check
-            }
-            
-            # Sonuçları widget'a aktar
-            self.check_results_widget.set_check_results(result)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in payment_check:
-                self.check_results_widget.set_html_report(payment_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in payment_check and "summary" in payment_check:
-                self.check_results_widget.show_details(payment_check["data"])
-                self.check_results_widget.show_summary(payment_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(payment_check["message"])
-            
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
+        # Çalışan başka kontrol kalmadıysa ilerleme çubuğunu gizle
+        if not self.running_checks:
             self.progress_bar.setVisible(False)
         
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"Nadiren kullanılan ödeme şekli analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
-
-    def check_unit_price_increase(self):
-        """Birim fiyat artış kontrolü"""
+        if batch_analysis is not None:
+            self._collect_analysis_result(batch_analysis, results_before)
+            self._advance_analysis_batch()
+    
+    def _run_check(self, title, analysis_func, result_key):
+        """
+        Standart sonuç yapısı döndüren bir analizi çalıştırır
+        
+        Args:
+            title (str): Durum çubuğunda ve hata mesajlarında kullanılan analiz adı
+            analysis_func (callable): DataFrame alıp sonuç sözlüğü döndüren analiz fonksiyonu
+            result_key (str): Sonuç widget'ında gösterilecek başlık
+        """
         if self.current_df is None:
             QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
             return
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("Birim fiyat artış analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Analiz fonksiyonunu çağır
-            price_check = check_unit_price_increase(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if price_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", price_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(price_check["message"])
-                return
-            
-            result = {
-                "Birim Fiyat Artış Analizi": price_check
-            }
-            
-            # Sonuçları widget'a aktar
-            self.check_results_widget.set_check_results(result)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in price_check:
-                self.check_results_widget.set_html_report(price_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in price_check and "summary" in price_check:
-                self.check_results_widget.show_details(price_check["data"])
-                self.check_results_widget.show_summary(price_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(price_check["message"])
-            
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
-        
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            import traceback
-            error_details = traceback.format_exc()
-            error_msg = f"Birim fiyat artış analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            print(f"Hata detayı: {error_details}")
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
-
-    def check_kdv_consistency(self):
-        """KDV Kontrol - Aynı GTİP kodunda farklı Vergi_2_Oran değerleri kontrolü"""
-        if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
+        self._start_check(title, analysis_func, self._get_check_df(),
+                          lambda check: self._show_check_result(result_key, check))
+    
+    def _show_check_result(self, title, check):
+        """Standart analiz sonucunu (status, message, data, summary, html_report) gösterir"""
+        if check["status"] == "error":
+            QMessageBox.warning(self, "Uyarı", check["message"])
+            self.status_label.setText(check["message"])
             return
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("KDV kontrol analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Yeni KDV kontrol fonksiyonunu çağır
-            from analysis_modules.kdv_kontrol import check_kdv_kontrol
-            kdv_check = check_kdv_kontrol(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if kdv_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", kdv_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(kdv_check["message"])
-                return
-            
-            result = {
-                "KDV Kontrol Analizi": kdv_check
-            }
-            
-            # Sonuçları widget'a aktar
-            self.check_results_widget.set_check_results(result)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in kdv_check:
-                self.check_results_widget.set_html_report(kdv_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in kdv_check and "summary" in kdv_check:
-                self.check_results_widget.show_details(kdv_check["data"])
-                self.check_results_widget.show_summary(kdv_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(kdv_check["message"])
-            
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
+        # Sonuçları widget'a aktar
+        self.check_results_widget.set_check_results({title: check})
         
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"KDV kontrol analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
-
-    def check_domestic_expense_variation(self):
-        """Yurt İçi Gider Kontrol - Beyanname bazında gider ve ağırlık analizi"""
-        if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
-            return
+        # İlerleme çubuğunu güncelle
+        self.progress_bar.setValue(80)
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("Yurt içi gider kontrol analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Yeni yurt içi gider kontrol fonksiyonunu çağır
-            from analysis_modules.yurt_ici_gider_kontrol import check_yurt_ici_gider_kontrol
-            expense_check = check_yurt_ici_gider_kontrol(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if expense_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", expense_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(expense_check["message"])
-                return
-            
-            result = {
-                "Yurt İçi Gider Kontrol Analizi": expense_check
-            }
-            
-            # Sonuçları widget'a aktar
-            self.check_results_widget.set_check_results(result)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in expense_check:
-                self.check_results_widget.set_html_report(expense_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in expense_check and "summary" in expense_check:
-                self.check_results_widget.show_details(expense_check["data"])
-                self.check_results_widget.show_summary(expense_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(expense_check["message"])
+        # HTML raporunu göster
+        if "html_report" in check:
+            self.check_results_widget.set_html_report(check["html_report"], key=title)
+            self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
             
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
+        # Tablo ve özet verilerini göster
+        if "data" in check and "summary" in check:
+            self.check_results_widget.show_details(check["data"])
+            self.check_results_widget.show_summary(check["summary"])
         
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"Yurt içi gider kontrol analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
+        # Durum bilgisini güncelle
+        self.status_label.setText(check["message"])
+        
+        # İşlem tamamlandı
+        self.progress_bar.setValue(100)
 
-    def check_foreign_expense_variation(self):
-        """Yurt Dışı Gider Kontrol - İki farklı kontrol analizi"""
+    @_safe_check
+    def check_gtip_urun_kodu_consistency(self):
+        """GTİP-Ürün Kodu tutarlılık kontrolü"""
         if self.current_df is None:
             QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
             return
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("Yurt dışı gider kontrol analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Yeni yurt dışı gider kontrol fonksiyonunu çağır
-            from analysis_modules.yurt_disi_gider_kontrol import check_yurt_disi_gider_kontrol
-            expense_check = check_yurt_disi_gider_kontrol(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if expense_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", expense_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(expense_check["message"])
-                return
-            
+        # Analiz öncesi veri büyüklüğünü kontrol et
+        if len(self.current_df) > 1000:
+            # Büyük veri setleri için örnekleme yap
+            sample_size = min(1000, len(self.current_df))
+            process_df = self.current_df.sample(sample_size)
+            log.info("Büyük veri seti (%d satır): Analiz için %d satır örnekleniyor...", len(self.current_df), sample_size)
+        else:
+            process_df = self.current_df
+        
+        self._start_check("GTİP-Ürün Kodu kontrolü", check_gtip_urun_kodu_consistency,
+                          process_df, self._show_gtip_urun_kodu_result)
+    
+    def _show_gtip_urun_kodu_result(self, gtip_urun_kodu_check):
+        """GTİP-Ürün Kodu kontrol sonucunu gösterir"""
+        if gtip_urun_kodu_check is not None:
             result = {
-                "Yurt Dışı Gider Kontrol Analizi": expense_check
+                "GTIP-Ürün Kodu tutarlılık kontrolü": gtip_urun_kodu_check
             }
             
             # Sonuçları widget'a aktar
@@ -3577,170 +3876,160 @@ class CustomsCheckApp(QMainWindow):
             
             # İlerleme çubuğunu güncelle
             self.progress_bar.setValue(80)
-            QApplication.processEvents()
             
-            # HTML raporunu göster
-            if "html_report" in expense_check:
-                self.check_results_widget.set_html_report(expense_check["html_report"])
+            # HTML raporunu CheckResultsWidget'a ekle (arka planda)
+            if "html_report" in gtip_urun_kodu_check:
+                log.debug("HTML raporu bulundu, gösteriliyor...")
+                
+                # Görsel rapor için ekran boyutunu optimize et
+                try:
+                    # Panelin genişliğini mümkün olduğunca artır
+                    self.check_results_widget.html_view.setSizePolicy(
+                        QSizePolicy.Expanding, QSizePolicy.Expanding)
+                except Exception as e:
+                    log.warning("Görünüm boyutu ayarlanamadı: %s", e)
+                
+                # Önce kısa bir yükleme bildirimi göster
+                loading_html = """
+                    <html>
+                    <body style="font-family: Arial; padding: 20px; text-align: center;">
+                        <h2>GTİP-Ürün Kodu Raporu Hazırlanıyor</h2>
+                        <p>Lütfen bekleyin, rapor hazırlanıyor...</p>
+                        <div style="width:50%;height:20px;background-color:#f0f0f0;margin:20px auto;border-radius:10px;">
+                            <div style="width:100%;height:20px;background-color:#4299e1;border-radius:10px;animation:loading 1.5s infinite;"></div>
+                        </div>
+                        <style>
+                            @keyframes loading {
+                                0% { width: 0%; }
+                                50% { width: 100%; }
+                                100% { width: 0%; }
+                            }
+                        </style>
+                    </body>
+                    </html>
+                """
+                self.check_results_widget.set_html_report(loading_html)
+                
+                # Görsel rapor sekmesine doğrudan geçiş yap
                 self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
                 
-            # Tablo ve özet verilerini göster
-            if "data" in expense_check and "summary" in expense_check:
-                self.check_results_widget.show_details(expense_check["data"])
-                self.check_results_widget.show_summary(expense_check["summary"])
-            
+                # HTML içeriğini gecikmeli yükle (zamanlayıcı ile)
+                QTimer.singleShot(300, lambda: self.check_results_widget.set_html_report(
+                    gtip_urun_kodu_check["html_report"], key="GTIP-Ürün Kodu tutarlılık kontrolü"))
+                    
             # Durum bilgisini güncelle
-            self.status_label.setText(expense_check["message"])
-            
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
-        
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"Yurt dışı gider kontrol analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
-
-    def check_supalan_storage(self):
-        """Supalan Depolama Kontrol - TAŞIT ÜSTÜ - SUPALAN SAHASI depolama gideri kontrolü"""
-        if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
-            return
-        
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("Supalan depolama kontrol analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Supalan depolama kontrol fonksiyonunu çağır
-            supalan_check = check_supalan_depolama_kontrol(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if supalan_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", supalan_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(supalan_check["message"])
-                return
-            
+            status = gtip_urun_kodu_check.get("status", "")
+            if status == "warning":
+                self.status_label.setText("GTİP-Ürün Kodu tutarsızlıkları bulundu")
+            else:
+                self.status_label.setText("GTİP-Ürün Kodu kontrolü tamamlandı")
+        else:
             result = {
-                "Supalan Depolama Kontrol": supalan_check
+                "GTIP-Ürün Kodu tutarlılık kontrolü": {
+                    "status": "ok",
+                    "message": "GTIP-Ürün Kodu tutarlılık kontrolü bulunamadı."
+                }
             }
-            
-            # Sonuçları widget'a aktar
             self.check_results_widget.set_check_results(result)
+            self.status_label.setText("GTİP-Ürün Kodu kontrolü tamamlandı")
             
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in supalan_check:
-                self.check_results_widget.set_html_report(supalan_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in supalan_check and "summary" in supalan_check:
-                self.check_results_widget.show_details(supalan_check["data"])
-                self.check_results_widget.show_summary(supalan_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(supalan_check["message"])
+        # İşlem tamamlandı
+        self.progress_bar.setValue(100)
+
+    @_safe_check
+    def check_rarely_used_currency(self):
+        """Nadiren kullanılan döviz kontrolü"""
+        self._run_check("Nadiren kullanılan döviz analizi", check_rarely_used_currency, "Nadiren Kullanılan Döviz Analizi")
             
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
-        
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"Supalan depolama kontrol analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
+    @_safe_check
+    def check_rarely_used_origin_country(self):
+        """Nadiren kullanılan menşe ülke kontrolü"""
+        self._run_check("Nadiren kullanılan menşe ülke analizi", check_rarely_used_origin_country, "Nadiren Kullanılan Menşe Ülke Analizi")
+
+    @_safe_check
+    def check_rarely_used_payment_method(self):
+        """Nadiren kullanılan ödeme şekli kontrolü"""
+        self._run_check("Nadiren kullanılan ödeme şekli analizi", check_rarely_used_payment_method, "Nadiren Kullanılan Ödeme Şekli Analizi")
+
+    @_safe_check
+    def check_unit_price_increase(self):
+        """Birim fiyat artış kontrolü"""
+        self._run_check("Birim fiyat artış analizi", check_unit_price_increase, "Birim Fiyat Artış Analizi")
+
+    @_safe_check
+    def check_kdv_consistency(self):
+        """KDV Kontrol - Aynı GTİP kodunda farklı Vergi_2_Oran değerleri kontrolü"""
+        from analysis_modules.kdv_kontrol import check_kdv_kontrol
+        self._run_check("KDV kontrol analizi", check_kdv_kontrol, "KDV Kontrol Analizi")
+
+    @_safe_check
+    def check_domestic_expense_variation(self):
+        """Yurt İçi Gider Kontrol - Beyanname bazında gider ve ağırlık analizi"""
+        from analysis_modules.yurt_ici_gider_kontrol import check_yurt_ici_gider_kontrol
+        self._run_check("Yurt içi gider kontrol analizi", check_yurt_ici_gider_kontrol, "Yurt İçi Gider Kontrol Analizi")
+
+    @_safe_check
+    def check_foreign_expense_variation(self):
+        """Yurt Dışı Gider Kontrol - İki farklı kontrol analizi"""
+        from analysis_modules.yurt_disi_gider_kontrol import check_yurt_disi_gider_kontrol
+        self._run_check("Yurt dışı gider kontrol analizi", check_yurt_disi_gider_kontrol, "Yurt Dışı Gider Kontrol Analizi")
+
+    @_safe_check
+    def check_supalan_storage(self):
+        """Supalan Depolama Kontrol - TAŞIT ÜSTÜ - SUPALAN SAHASI depolama gideri kontrolü"""
+        self._run_check("Supalan depolama kontrol analizi", check_supalan_depolama_kontrol, "Supalan Depolama Kontrol")
 
+    @_safe_check
     def check_igv_consistency(self):
         """IGV (İlave Gümrük Vergisi) tutarlılığını kontrol eder"""
         if self.current_df is None:
             QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
             return
         
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("IGV kontrol analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # IGV kontrol fonksiyonunu çağır
-            from analysis_modules.igv_analysis import check_igv_consistency as igv_analysis_func
-            result = igv_analysis_func(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if not result["success"]:
-                QMessageBox.warning(self, "Uyarı", result["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(result["message"])
-                return
-            
-            # HTML raporu oluştur
-            html_report = self._generate_igv_html_report(result)
-            
-            # Sonuçları widget'a aktar
-            check_result = {
-                "status": "success",
-                "message": result["message"],
-                "data": result["data"],
-                "summary": result.get("summary", {}),
-                "html_report": html_report
-            }
-            
-            results = {"IGV Kontrol Analizi": check_result}
-            self.check_results_widget.set_check_results(results)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            self.check_results_widget.set_html_report(html_report)
-            self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if not result["data"].empty:
-                self.check_results_widget.show_details(result["data"])
-                if "summary" in result:
-                    self.check_results_widget.show_summary(result["summary"])
-            
-            # Durum bilgisini güncelle
+        from analysis_modules.igv_analysis import check_igv_consistency as igv_analysis_func
+        self._start_check("IGV kontrol analizi", igv_analysis_func, self._get_check_df(),
+                          self._show_igv_result)
+    
+    def _show_igv_result(self, result):
+        """IGV kontrol sonucunu gösterir"""
+        if not result["success"]:
+            QMessageBox.warning(self, "Uyarı", result["message"])
             self.status_label.setText(result["message"])
+            return
+        
+        # HTML raporu oluştur
+        html_report = self._generate_igv_html_report(result)
+        
+        # Sonuçları widget'a aktar
+        check_result = {
+            "status": "success",
+            "message": result["message"],
+            "data": result["data"],
+            "summary": result.get("summary", {}),
+            "html_report": html_report
+        }
+        
+        results = {"IGV Kontrol Analizi": check_result}
+        self.check_results_widget.set_check_results(results)
+        
+        # İlerleme çubuğunu güncelle
+        self.progress_bar.setValue(80)
+        
+        # HTML raporunu göster
+        self.check_results_widget.set_html_report(html_report, key="IGV Kontrol Analizi")
+        self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
             
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
+        # Tablo ve özet verilerini göster
+        if not result["data"].empty:
+            self.check_results_widget.show_details(result["data"])
+            if "summary" in result:
+                self.check_results_widget.show_summary(result["summary"])
         
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"IGV kontrol analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
+        # Durum bilgisini güncelle
+        self.status_label.setText(result["message"])
+        
+        # İşlem tamamlandı
+        self.progress_bar.setValue(100)
     
     def _generate_igv_html_report(self, result):
         """IGV analizi için HTML raporu oluşturur"""
@@ -3920,6 +4209,9 @@ class CustomsCheckApp(QMainWindow):
         # Alt+F ile arama kısayolu
         search_shortcut = QShortcut(QKeySequence("Alt+F"), self)
         search_shortcut.activated.connect(self.show_search_dialog)
+        
+        # Analizlerdeki derlenmiş çekirdekleri arka planda önceden derle (ilk kontrol beklemesin)
+        threading.Thread(target=warm_up_unit_price_kernels, name="kernel-warmup", daemon=True).start()
     
     def show_search_dialog(self):
         """Alt+F basıldığında metin arama dialog'unu göster"""
@@ -4138,6 +4430,61 @@ class CustomsCheckApp(QMainWindow):
         """Ana tab değişiminde çağrılan fonksiyon"""
         self.on_main_tab_changed(index)
 
+    @staticmethod
+    def _gtip_tanim_detail_rows(filtered_df, ticari_tanimlar, per_tanim=None):
+        """
+        Verilen ticari tanımlara ait kayıtları tek seferde detay tablosuna dönüştürür
+        
+        Satır satır sözlük kurmak yerine ilgili kayıtlar isin ile seçilir, tanım
+        sırasına göre kararlı biçimde sıralanır ve sütunlar vektörel olarak atanır.
+        
+        Args:
+            filtered_df (pd.DataFrame): Boş tanım/GTİP içermeyen veri
+            ticari_tanimlar (pd.Series): Sonuçta yer alacak ticari tanımlar (gösterim sırasıyla)
+            per_tanim (int, optional): Her tanım için alınacak en fazla kayıt sayısı
+            
+        Returns:
+            pd.DataFrame: Ticari_tanimi, Gtip, Adi_unvani, Beyanname_no, BeyannameKalemNo
+            ve varsa ek bilgi sütunlarını içeren tablo
+        """
+        order = {tanim: i for i, tanim in enumerate(ticari_tanimlar)}
+        tanim_values = filtered_df['Ticari_tanimi'].astype(object)
+        mask = tanim_values.isin(order.keys()).to_numpy()
+        positions = np.argsort(tanim_values[mask].map(order).to_numpy(), kind='stable')
+        subset = filtered_df[mask].iloc[positions].reset_index(drop=True)
+        tanimlar = tanim_values[mask].iloc[positions].reset_index(drop=True)
+        if per_tanim is not None:
+            keep = (tanimlar.groupby(tanimlar, sort=False).cumcount() < per_tanim).to_numpy()
+            subset = subset[keep].reset_index(drop=True)
+            tanimlar = tanimlar[keep].reset_index(drop=True)
+        
+        row_count = len(subset)
+        result_df = pd.DataFrame({
+            'Ticari_tanimi': tanimlar,
+            'Gtip': subset['Gtip'],
+            'Adi_unvani': subset['Adi_unvani'] if 'Adi_unvani' in subset.columns else '',
+            'Beyanname_no': subset['Beyanname_no'] if 'Beyanname_no' in subset.columns else '',
+        }, index=subset.index)
+        
+        # Beyanname kalem numarası için farklı sütun isimlerini dene (ilk dolu sütun geçerli)
+        kalem_no = np.full(row_count, '', dtype=object)
+        filled = np.zeros(row_count, dtype=bool)
+        for col_name in ['BeyannameKalemNo', 'Kalem_sira_no', 'Kalem_No', 'KalemNo']:
+            if col_name in subset.columns:
+                values = subset[col_name]
+                col_mask = ~filled & values.notna().to_numpy()
+                kalem_no[col_mask] = [str(v) for v in values.to_numpy()[col_mask]]
+                filled |= col_mask
+        result_df['BeyannameKalemNo'] = kalem_no
+        
+        # Diğer yararlı sütunları da ekle
+        for col in ['Mensei_ulke', 'Fatura_miktari', 'Fatura_miktarinin_dovizi']:
+            if col in subset.columns:
+                result_df[col] = subset[col]
+        
+        return result_df
+    
+    @_safe_check
     def check_gtip_tanim_detail(self):
         """GTİP-Tanım Detay Analizi: Aynı ticari tanımda farklı GTIP kodları kullanılan eşyaları detaylı göster"""
         if self.current_df is None:
@@ -4157,7 +4504,6 @@ class CustomsCheckApp(QMainWindow):
             self.status_label.setText("GTİP-Tanım Detay Analizi çalışıyor...")
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(20)
-            QApplication.processEvents()
             
             # Boş ticari tanımları filtrele
             filtered_df = self.current_df[
@@ -4168,7 +4514,6 @@ class CustomsCheckApp(QMainWindow):
             ].copy()
             
             self.progress_bar.setValue(40)
-            QApplication.processEvents()
             
             if len(filtered_df) == 0:
                 QMessageBox.information(self, "Bilgi", "Analiz için uygun veri bulunamadı.")
@@ -4183,7 +4528,6 @@ class CustomsCheckApp(QMainWindow):
             multiple_gtips = grouped[grouped['GTİP_Sayısı'] > 1].sort_values(by='GTİP_Sayısı', ascending=False)
             
             self.progress_bar.setValue(60)
-            QApplication.processEvents()
             
             if multiple_gtips.empty:
                 QMessageBox.information(self, "Sonuç", "Aynı ticari tanımda farklı GTİP kodu kullanımı tespit edilmedi.")
@@ -4191,41 +4535,9 @@ class CustomsCheckApp(QMainWindow):
                 return
             
             # Detaylı sonuç DataFrame'i oluştur
-            result_rows = []
-            
-            for _, row in multiple_gtips.iterrows():
-                ticari_tanim = row['Ticari_tanimi']
-                
-                # Bu ticari tanıma sahip tüm kayıtları al
-                ticari_rows = filtered_df[filtered_df['Ticari_tanimi'] == ticari_tanim]
-                
-                for _, data_row in ticari_rows.iterrows():
-                    result_row = {
-                        'Ticari_tanimi': ticari_tanim,
-                        'Gtip': data_row.get('Gtip', ''),
-                        'Adi_unvani': data_row.get('Adi_unvani', ''),
-                        'Beyanname_no': data_row.get('Beyanname_no', ''),
-                    }
-                    
-                    # Beyanname kalem numarası için farklı sütun isimlerini dene
-                    kalem_no = ''
-                    for col_name in ['BeyannameKalemNo', 'Kalem_sira_no', 'Kalem_No', 'KalemNo']:
-                        if col_name in data_row and pd.notna(data_row[col_name]):
-                            kalem_no = str(data_row[col_name])
-                            break
-                    result_row['BeyannameKalemNo'] = kalem_no
-                    
-                    # Diğer yararlı sütunları da ekle
-                    for col in ['Mensei_ulke', 'Fatura_miktari', 'Fatura_miktarinin_dovizi']:
-                        if col in data_row:
-                            result_row[col] = data_row[col]
-                    
-                    result_rows.append(result_row)
-            
-            result_df = pd.DataFrame(result_rows)
+            result_df = self._gtip_tanim_detail_rows(filtered_df, multiple_gtips['Ticari_tanimi'])
             
             self.progress_bar.setValue(80)
-            QApplication.processEvents()
             
             # HTML raporu oluştur
             html_content = self._generate_gtip_tanim_detail_html(result_df, multiple_gtips)
@@ -4244,7 +4556,6 @@ class CustomsCheckApp(QMainWindow):
             
             # İşlem tamamlandı
             self.progress_bar.setValue(100)
-            QApplication.processEvents()
             self.progress_bar.setVisible(False)
             self.status_label.setText(f"GTİP-Tanım Detay Analizi tamamlandı. {len(multiple_gtips)} ticari tanımda tutarsızlık bulundu.")
             
@@ -4532,8 +4843,7 @@ class CustomsCheckApp(QMainWindow):
         # Her ticari tanım için gruplu analiz
         colors = ['highlight-red', 'highlight-blue', 'highlight-green', 'highlight-yellow']
         
-        for idx, (_, tanim_row) in enumerate(multiple_gtips.iterrows()):
-            ticari_tanim = tanim_row['Ticari_tanimi']
+        for idx, ticari_tanim in enumerate(multiple_gtips['Ticari_tanimi'].tolist()):
             
             # Bu ticari tanıma ait kayıtları filtrele
             tanim_records = result_df[result_df['Ticari_tanimi'] == ticari_tanim]
@@ -4575,12 +4885,9 @@ class CustomsCheckApp(QMainWindow):
             """
             
             # GTİP kodları için özet satırlar
-            for _, gtip_row in gtip_analysis.iterrows():
-                gtip_code = gtip_row['Gtip']
-                beyanname_count = gtip_row['Beyanname_Sayisi']
-                firma_count = gtip_row['Firma_Sayisi']
-                firmalar = gtip_row['Firmalar']
-                
+            for gtip_code, beyanname_count, firma_count, firmalar in zip(
+                    gtip_analysis['Gtip'].tolist(), gtip_analysis['Beyanname_Sayisi'].tolist(),
+                    gtip_analysis['Firma_Sayisi'].tolist(), gtip_analysis['Firmalar'].tolist()):
                 # Firma listesini kısalt ve daha okunabilir yap
                 if len(firmalar) <= 2:
                     firma_display = ', '.join(firmalar)
@@ -4621,15 +4928,15 @@ class CustomsCheckApp(QMainWindow):
             # Detaylı kayıtları GTİP koduna göre sırala
             sorted_records = tanim_records.sort_values(['Gtip', 'Adi_unvani', 'Beyanname_no'])
             
-            for _, record in sorted_records.iterrows():
-                gtip = record.get('Gtip', '')
-                firma = record.get('Adi_unvani', '')
-                beyanname = record.get('Beyanname_no', '')
-                kalem_no = record.get('BeyannameKalemNo', '')
-                mensei = record.get('Mensei_ulke', '')
-                fatura_miktar = record.get('Fatura_miktari', '')
-                fatura_doviz = record.get('Fatura_miktarinin_dovizi', '')
-                
+            # Satır başına Series oluşturmamak için sütunlar listeye çevrilip birlikte gezilir;
+            # olmayan sütunlar boş değerle doldurulur
+            def column_values(column):
+                return sorted_records[column].tolist() if column in sorted_records.columns else repeat('')
+            
+            for gtip, firma, beyanname, kalem_no, mensei, fatura_miktar, fatura_doviz in zip(
+                    sorted_records['Gtip'].tolist(), column_values('Adi_unvani'), column_values('Beyanname_no'),
+                    column_values('BeyannameKalemNo'), column_values('Mensei_ulke'),
+                    column_values('Fatura_miktari'), column_values('Fatura_miktarinin_dovizi')):
                 fatura_info = f"{fatura_miktar} {fatura_doviz}" if fatura_miktar and fatura_doviz else "-"
                 
                 html += f"""
@@ -4658,75 +4965,28 @@ class CustomsCheckApp(QMainWindow):
         
         return html
 
+    @_safe_check
     def check_rarely_used_origin_country_by_sender_gtip(self):
         """Aynı gönderici ve GTİP kodunda nadiren kullanılan menşe ülke kontrolü"""
-        if self.current_df is None:
-            QMessageBox.warning(self, "Uyarı", "Veri yüklenmedi")
-            return
-        
-        try:
-            # İşlem başladığını göster
-            self.status_label.setText("Gönderici-GTİP bazında nadir menşe ülke analizi çalışıyor...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(10)
-            QApplication.processEvents()
-            
-            # Analiz fonksiyonunu çağır
-            sender_gtip_check = check_rarely_used_origin_country_by_sender_gtip(self.current_df)
-            
-            # İşlem tamamlandığını göster
-            self.progress_bar.setValue(60)
-            QApplication.processEvents()
-            
-            if sender_gtip_check["status"] == "error":
-                QMessageBox.warning(self, "Uyarı", sender_gtip_check["message"])
-                self.progress_bar.setVisible(False)
-                self.status_label.setText(sender_gtip_check["message"])
-                return
-            
-            result = {
-                "Gönderici-GTİP Bazında Nadir Menşe Ülke Analizi": sender_gtip_check
-            }
-            
-            # Sonuçları widget'a aktar
-            self.check_results_widget.set_check_results(result)
-            
-            # İlerleme çubuğunu güncelle
-            self.progress_bar.setValue(80)
-            QApplication.processEvents()
-            
-            # HTML raporunu göster
-            if "html_report" in sender_gtip_check:
-                self.check_results_widget.set_html_report(sender_gtip_check["html_report"])
-                self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
-                
-            # Tablo ve özet verilerini göster
-            if "data" in sender_gtip_check and "summary" in sender_gtip_check:
-                self.check_results_widget.show_details(sender_gtip_check["data"])
-                self.check_results_widget.show_summary(sender_gtip_check["summary"])
-            
-            # Durum bilgisini güncelle
-            self.status_label.setText(sender_gtip_check["message"])
-            
-            # İşlem tamamlandı
-            self.progress_bar.setValue(100)
-            QApplication.processEvents()
-            self.progress_bar.setVisible(False)
-        
-        except Exception as e:
-            # Hata durumunda kullanıcıyı bilgilendir
-            error_msg = f"Gönderici-GTİP bazında nadir menşe ülke analizi sırasında hata: {str(e)}"
-            print(error_msg)
-            QMessageBox.critical(self, "Hata", error_msg)
-            self.status_label.setText("Hata oluştu")
-            self.progress_bar.setVisible(False)
+        self._run_check("Gönderici-GTİP bazında nadir menşe ülke analizi", check_rarely_used_origin_country_by_sender_gtip,
+                        "Gönderici-GTİP Bazında Nadir Menşe Ülke Analizi")
 
     def run_all_analyses_and_export(self):
-        """Tüm analizleri çalıştır ve sonuçları tek Excel dosyasına aktar"""
+        """
+        Tüm analizleri çalıştır ve sonuçları tek Excel dosyasına aktar
+        
+        Ana thread'de olay kuyruğu pompalanmaz: havuzda çalışan kontroller paralel
+        yürür ve sonuçları _on_check_finished üzerinden toplanır; hepsi geldiğinde
+        Excel dosyası AnalysisExportThread ile arka planda yazılır.
+        """
         if self.current_df is None:
             QMessageBox.warning(self, "Uyarı", "Önce veri yükleyin!")
             return
         
+        if self._analysis_batch is not None:
+            QMessageBox.information(self, "Bilgi", "Analizler zaten çalışıyor.")
+            return
+        
         # Progress dialog oluştur
         progress_dialog = QDialog(self)
         progress_dialog.setWindowTitle("Tüm Analizler Çalıştırılıyor...")
@@ -4743,225 +5003,229 @@ class CustomsCheckApp(QMainWindow):
         layout.addWidget(progress_bar)
         
         cancel_btn = QPushButton("İptal")
+        cancel_btn.clicked.connect(self._cancel_analysis_batch)
         layout.addWidget(cancel_btn)
         
-        # İptal flag'i
-        self.analysis_cancelled = False
-        cancel_btn.clicked.connect(lambda: setattr(self, 'analysis_cancelled', True))
-        
         progress_dialog.show()
-        QApplication.processEvents()
         
-        try:
-            # Tüm analiz fonksiyonları listesi
-            analysis_functions = [
-                ("Eksik Değerler", self.check_missing_values),
-                ("Tekrarlanan Satırlar", self.check_duplicate_rows),
-                ("Ağırlık Tutarlılığı", self.check_weight_consistency),
-                ("İşlem Niteliği Tutarlılığı", self.check_islem_niteligi_consistency),
-                ("GTİP-Ürün Kodu Tutarlılığı", self.check_gtip_urun_kodu_consistency),
-                ("Alıcı-Satıcı İlişkisi", self.check_alici_satici_relationship),
-                ("GTİP Tanım Detayı", self.check_gtip_tanim_detail),
-                ("Nadir Döviz Kullanımı", self.check_rarely_used_currency),
-                ("Nadir Menşe Ülke", self.check_rarely_used_origin_country),
-                ("Gönderici-GTİP Nadir Menşe", self.check_rarely_used_origin_country_by_sender_gtip),
-                ("Nadir Ödeme Şekli", self.check_rarely_used_payment_method),
-                ("Birim Fiyat Artışı", self.check_unit_price_increase),
-                ("KDV Kontrol", self.check_kdv_consistency),
-                ("Yurt İçi Gider Değişimi", self.check_domestic_expense_variation),
-                ("Yurt Dışı Gider Değişimi", self.check_foreign_expense_variation),
-                ("Supalan Depolama Kontrol", self.check_supalan_storage),
-                ("IGV Kontrol", self.check_igv_consistency),
-                ("Tedarikçi Beyan Kontrol", self.check_tedarikci_beyan_kontrol)
-            ]
-            
-            total_analyses = len(analysis_functions)
-            all_results = {}
+        # Tüm analiz fonksiyonları listesi
+        analysis_functions = [
+            ("Eksik Değerler", self.check_missing_values),
+            ("Tekrarlanan Satırlar", self.check_duplicate_rows),
+            ("Ağırlık Tutarlılığı", self.check_weight_consistency),
+            ("İşlem Niteliği Tutarlılığı", self.check_islem_niteligi_consistency),
+            ("GTİP-Ürün Kodu Tutarlılığı", self.check_gtip_urun_kodu_consistency),
+            ("Alıcı-Satıcı İlişkisi", self.check_alici_satici_relationship),
+            ("GTİP Tanım Detayı", self.check_gtip_tanim_detail),
+            ("Nadir Döviz Kullanımı", self.check_rarely_used_currency),
+            ("Nadir Menşe Ülke", self.check_rarely_used_origin_country),
+            ("Gönderici-GTİP Nadir Menşe", self.check_rarely_used_origin_country_by_sender_gtip),
+            ("Nadir Ödeme Şekli", self.check_rarely_used_payment_method),
+            ("Birim Fiyat Artışı", self.check_unit_price_increase),
+            ("KDV Kontrol", self.check_kdv_consistency),
+            ("Yurt İçi Gider Değişimi", self.check_domestic_expense_variation),
+            ("Yurt Dışı Gider Değişimi", self.check_foreign_expense_variation),
+            ("Supalan Depolama Kontrol", self.check_supalan_storage),
+            ("IGV Kontrol", self.check_igv_consistency),
+            ("Tedarikçi Beyan Kontrol", self.check_tedarikci_beyan_kontrol)
+        ]
+        
+        batch = {
+            "dialog": progress_dialog,
+            "label": progress_label,
+            "bar": progress_bar,
+            "order": [analysis_name for analysis_name, _ in analysis_functions],
+            "results": {},   # analiz adı -> sonuç
+            "pending": {},   # havuzda çalışan kontrol adı -> analiz adı
+            "done": 0,
+            "dispatched": False,
+        }
+        self._analysis_batch = batch
+        self._check_errors = []
+        self._batch_progress = (0, "Analizler başlatılıyor...")
+        self._batch_progress_timer.start()
+        
+        # Her analizi başlat; havuz kullananlar arka planda devam eder, diğerleri burada biter
+        for analysis_name, analysis_func in analysis_functions:
+            self._batch_progress = (self._batch_progress[0], f"Çalıştırılıyor: {analysis_name}")
+            running_before = set(self.running_checks)
+            results_before = self._snapshot_check_results()
             
-            # Her analizi çalıştır
-            for i, (analysis_name, analysis_func) in enumerate(analysis_functions):
-                if self.analysis_cancelled:
-                    progress_dialog.close()
-                    return
-                
-                progress_label.setText(f"Çalıştırılıyor: {analysis_name}")
-                progress_bar.setValue(int((i / total_analyses) * 90))  # %90'a kadar analiz
-                QApplication.processEvents()
-                
-                try:
-                    # Analizi çalıştır
-                    analysis_func()
-                    
-                    # Kısa bir bekleme süresi ekle (analiz tamamlanması için)
-                    QApplication.processEvents()
-                    time.sleep(0.1)
-                    
-                    # Sonucu al - daha geniş arama
-                    if hasattr(self.check_results_widget, 'check_results'):
-                        # Önce tam eşleşme ara
-                        for check_name, result in self.check_results_widget.check_results.items():
-                            if check_name == analysis_name:
-                                all_results[analysis_name] = result
-                                break
-                        else:
-                            # Tam eşleşme bulunamazsa kısmi eşleşme ara
-                            for check_name, result in self.check_results_widget.check_results.items():
-                                # Anahtar kelimeler ile eşleştir
-                                analysis_keywords = analysis_name.lower().split()
-                                check_keywords = check_name.lower().split()
-                                
-                                # En az bir anahtar kelime eşleşirse
-                                if any(keyword in check_name.lower() for keyword in analysis_keywords) or \
-                                   any(keyword in analysis_name.lower() for keyword in check_keywords):
-                                    all_results[analysis_name] = result
-                                    break
-                    
-                except Exception as e:
-                    print(f"Analiz hatası ({analysis_name}): {str(e)}")
-                    continue
+            analysis_func()
             
-            if self.analysis_cancelled:
-                progress_dialog.close()
+            # Analiz sırasında açılan bir dialog içinden iptal edilmiş olabilir
+            if self._analysis_batch is not batch:
                 return
             
-            # Excel'e aktar
-            progress_label.setText("Excel dosyası oluşturuluyor...")
-            progress_bar.setValue(95)
-            QApplication.processEvents()
-            
-            # Dosya kaydetme dialog'u
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "Tüm Analiz Sonuçlarını Kaydet", 
-                f"tum_analiz_sonuclari_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                "Excel Files (*.xlsx)"
-            )
-            
-            if file_path:
-                if not file_path.lower().endswith('.xlsx'):
-                    file_path += '.xlsx'
-                
-                # Excel dosyası oluştur
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    # Tüm analiz sonuçlarını birleştirmek için liste
-                    all_combined_data = []
-                    sheet_index = 1
-                    
-                    # Önce her analiz için ayrı sheet'ler oluştur
-                    for analysis_name, result in all_results.items():
-                        if result and "data" in result and result["data"] is not None:
-                            df_to_export = result["data"]
-                            if isinstance(df_to_export, pd.DataFrame) and not df_to_export.empty:
-                                # Ayrı sheet oluştur
-                                sheet_name = analysis_name[:25] + f"_{sheet_index}"
-                                sheet_name = sheet_name.replace("/", "_").replace("\\", "_")
-                                df_to_export.to_excel(writer, sheet_name=sheet_name, index=False)
-                                
-                                # Birleştirme için de hazırla
-                                df_copy = df_to_export.copy()
-                                df_copy.insert(0, 'Analiz_Türü', analysis_name)
-                                all_combined_data.append(df_copy)
-                                
-                                sheet_index += 1
-                    
-                    # Şimdi tüm verileri birleştiren sheet'i oluştur
-                    if all_combined_data:
-                        # Tüm DataFrame'leri alt alta birleştir
-                        combined_df = pd.concat(all_combined_data, ignore_index=True, sort=False)
-                        
-                        # Birleştirilmiş sheet'e yaz
-                        combined_df.to_excel(writer, sheet_name='Tüm_Analiz_Sonuçları', index=False)
-                        
-                        # Birleştirilmiş sheet'i formatla
-                        workbook = writer.book
-                        worksheet = writer.sheets['Tüm_Analiz_Sonuçları']
-                        
-                        # Başlık satırını formatla
-                        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-                        header_font = Font(bold=True, color="FFFFFF", size=12)
-                        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                        
-                        # Kenarlık stili
-                        thin_border = Border(
-                            left=Side(style='thin'),
-                            right=Side(style='thin'),
-                            top=Side(style='thin'),
-                            bottom=Side(style='thin')
-                        )
-                        
-                        # Başlık satırını formatla
-                        for col_num in range(1, len(combined_df.columns) + 1):
-                            cell = worksheet.cell(row=1, column=col_num)
-                            cell.font = header_font
-                            cell.fill = header_fill
-                            cell.alignment = Alignment(horizontal="center", vertical="center")
-                            cell.border = thin_border
-                        
-                        # Analiz türü sütununa göre satırları renklendir
-                        current_analysis = None
-                        color_index = 0
-                        colors = [
-                            "F8F9FA",  # Açık gri
-                            "E3F2FD",  # Açık mavi
-                            "F3E5F5",  # Açık mor
-                            "E8F5E8",  # Açık yeşil
-                            "FFF3E0",  # Açık turuncu
-                            "FFEBEE",  # Açık kırmızı
-                        ]
-                        
-                        for row_num in range(2, len(combined_df) + 2):
-                            analysis_type = worksheet.cell(row=row_num, column=1).value
-                            
-                            # Yeni analiz türü başladığında renk değiştir
-                            if analysis_type != current_analysis:
-                                current_analysis = analysis_type
-                                color_index = (color_index + 1) % len(colors)
-                            
-                            # Satırı renklendir
-                            row_fill = PatternFill(start_color=colors[color_index], end_color=colors[color_index], fill_type="solid")
-                            
-                            for col_num in range(1, len(combined_df.columns) + 1):
-                                cell = worksheet.cell(row=row_num, column=col_num)
-                                cell.fill = row_fill
-                                cell.border = thin_border
-                                cell.alignment = Alignment(horizontal="left", vertical="center")
-                        
-                        # Sütun genişliklerini otomatik ayarla
-                        for column in worksheet.columns:
-                            max_length = 0
-                            column_letter = column[0].column_letter
-                            
-                            for cell in column:
-                                try:
-                                    if len(str(cell.value)) > max_length:
-                                        max_length = len(str(cell.value))
-                                except:
-                                    pass
-                            
-                            # Maksimum genişlik sınırı
-                            adjusted_width = min(max_length + 2, 50)
-                            worksheet.column_dimensions[column_letter].width = adjusted_width
-                        
-                        # Başlık satırının yüksekliğini ayarla
-                        worksheet.row_dimensions[1].height = 25
-                
-                progress_bar.setValue(100)
-                progress_label.setText("Tamamlandı!")
-                QApplication.processEvents()
-                
-                # Başarı mesajı
-                QMessageBox.information(
-                    self, "Başarılı", 
-                    f"Tüm analiz sonuçları başarıyla kaydedildi:\n{file_path}\n\n"
-                    f"📊 Toplam {len(all_results)} analiz sonucu aktarıldı.\n"
-                    f"📁 Her analiz için ayrı sheet + 1 birleştirilmiş sheet oluşturuldu.\n"
-                    f"🔗 'Tüm_Analiz_Sonuçları' sheet'inde tüm veriler birleştirilmiş halde."
-                )
+            started = set(self.running_checks) - running_before
+            if started:
+                for check_name in started:
+                    batch["pending"][check_name] = analysis_name
+            else:
+                self._collect_analysis_result(analysis_name, results_before)
+        
+        batch["dispatched"] = True
+        self._advance_analysis_batch()
+    
+    def _snapshot_check_results(self):
+        """Sonuç widget'ındaki sonuçların o anki kimliklerini döndürür"""
+        check_results = self.check_results_widget.check_results
+        return id(check_results), {name: id(result) for name, result in check_results.items()}
+    
+    def _collect_analysis_result(self, analysis_name, results_before):
+        """
+        Bir analizin sonuç widget'ına yazdığı sonucu toplu çalıştırmanın sonuçlarına ekler
+        
+        Sadece analiz öncesindeki görüntüden bu yana eklenen ya da değişen sonuçlar
+        dikkate alınır; böylece hata veren bir analiz önceki bir sonucu sahiplenmez.
+        """
+        batch = self._analysis_batch
+        if batch is None:
+            return
+        batch["done"] += 1
+        
+        check_results = self.check_results_widget.check_results
+        dict_id, result_ids = results_before
+        if id(check_results) == dict_id:
+            changed = {name: result for name, result in check_results.items()
+                       if result_ids.get(name) != id(result)}
+        else:
+            changed = check_results
+        if not changed:
+            return
+        
+        # Önce tam eşleşme ara
+        if analysis_name in changed:
+            batch["results"][analysis_name] = changed[analysis_name]
+            return
+        
+        # Tam eşleşme bulunamazsa kısmi eşleşme ara
+        analysis_keywords = analysis_name.lower().split()
+        for check_name, result in changed.items():
+            check_keywords = check_name.lower().split()
             
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Analiz sırasında hata oluştu:\n{str(e)}")
+            # En az bir anahtar kelime eşleşirse
+            if any(keyword in check_name.lower() for keyword in analysis_keywords) or \
+               any(keyword in analysis_name.lower() for keyword in check_keywords):
+                batch["results"][analysis_name] = result
+                return
         
-        finally:
-            progress_dialog.close()
+        # Tek yeni sonuç varsa bu analize aittir
+        if len(changed) == 1:
+            batch["results"][analysis_name] = next(iter(changed.values()))
+    
+    def _advance_analysis_batch(self):
+        """Toplu çalıştırmanın ilerlemesini günceller; tüm analizler bittiyse aktarımı başlatır"""
+        batch = self._analysis_batch
+        if batch is None:
+            return
+        
+        total_analyses = len(batch["order"])
+        value = (batch["done"] * 90) // total_analyses  # %90'a kadar analiz
+        self._batch_progress = (value, self._batch_progress[1])
+        
+        if not batch["dispatched"]:
+            return
+        if batch["pending"]:
+            self._batch_progress = (value, f"Bekleniyor: {len(batch['pending'])} analiz çalışıyor...")
+            return
+        
+        # Excel'e aktar; dosya dialog'u açılmadan önce son durum hemen gösterilir
+        self._batch_progress = (95, "Excel dosyası oluşturuluyor...")
+        self._flush_batch_progress()
+        
+        # Dosya kaydetme dialog'u
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Tüm Analiz Sonuçlarını Kaydet", 
+            f"tum_analiz_sonuclari_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            "Excel Files (*.xlsx)"
+        )
+        
+        # Dialog açıkken iptal edilmiş olabilir
+        if self._analysis_batch is not batch:
+            return
+        if not file_path:
+            self._close_analysis_batch()
+            return
+        if not file_path.lower().endswith('.xlsx'):
+            file_path += '.xlsx'
+        
+        # Sonuçları analiz sırasıyla aktar
+        all_results = {name: batch["results"][name] for name in batch["order"] if name in batch["results"]}
+        batch["result_count"] = len(all_results)
+        
+        self.analysis_export_thread = AnalysisExportThread(all_results, file_path)
+        self.analysis_export_thread.progress.connect(self._on_analysis_export_progress, Qt.QueuedConnection)
+        self.analysis_export_thread.finished.connect(self._on_analysis_export_finished, Qt.QueuedConnection)
+        self.analysis_export_thread.start()
+    
+    def _on_analysis_export_progress(self, value, message):
+        """Excel yazma ilerlemesini %90-%100 aralığında gösterir"""
+        batch = self._analysis_batch
+        if batch is None:
+            return
+        self._batch_progress = (90 + value // 10, message)
+    
+    def _on_analysis_export_finished(self, success, message, file_path):
+        """Tüm analiz sonuçlarının Excel'e yazılması bittiğinde"""
+        batch = self._analysis_batch
+        if batch is None:
+            return
+        
+        result_count = batch.get("result_count", 0)
+        self._close_analysis_batch()
+        error_summary = self._format_check_errors()
+        
+        if success:
+            # Başarı mesajı
+            QMessageBox.information(
+                self, "Başarılı", 
+                f"Tüm analiz sonuçları başarıyla kaydedildi:\n{file_path}\n\n"
+                f"📊 Toplam {result_count} analiz sonucu aktarıldı.\n"
+                f"📁 Her analiz için ayrı sheet + 1 birleştirilmiş sheet oluşturuldu.\n"
+                f"🔗 'Tüm_Analiz_Sonuçları' sheet'inde tüm veriler birleştirilmiş halde."
+                + error_summary
+            )
+        else:
+            QMessageBox.critical(self, "Hata", f"Analiz sırasında hata oluştu:\n{message}" + error_summary)
+    
+    def _format_check_errors(self):
+        """Toplu çalıştırmada kaydedilen kontrol hatalarını loglar ve mesaj metnine çevirir"""
+        errors, self._check_errors = self._check_errors, []
+        if not errors:
+            return ""
+        
+        lines = []
+        for check_name, error in errors:
+            log.warning("%s hatası", check_name, exc_info=error)
+            lines.append(f"• {check_name}: {error}")
+        return "\n\n⚠️ Hata veren analizler:\n" + "\n".join(lines)
+    
+    def _cancel_analysis_batch(self):
+        """Toplu çalıştırmayı iptal eder; havuzdaki kontrollerin sonuçları artık toplanmaz"""
+        if self.analysis_export_thread is not None and self.analysis_export_thread.isRunning():
+            self.analysis_export_thread.cancel()
+        self._close_analysis_batch()
+    
+    def _close_analysis_batch(self):
+        """Toplu çalıştırma dialog'unu kapatır ve durumunu temizler"""
+        batch = self._analysis_batch
+        if batch is None:
+            return
+        self._analysis_batch = None
+        self._batch_progress_timer.stop()
+        batch["dialog"].close()
+    
+    def _flush_batch_progress(self):
+        """Toplu çalıştırmanın son ilerleme değerini, değişmişse, dialog'a yazar"""
+        batch = self._analysis_batch
+        if batch is None:
+            return
+        value, message = self._batch_progress
+        if batch["bar"].value() != value:
+            batch["bar"].setValue(value)
+        if batch["label"].text() != message:
+            batch["label"].setText(message)
 
     def create_word_report(self):
         """Tüm görsel raporları Word belgesine aktar"""
@@ -4995,6 +5259,10 @@ class CustomsCheckApp(QMainWindow):
         QApplication.processEvents()
         
         try:
+            # Sonuçların anlık kopyası: rapor yazılırken olay kuyruğu pompalandığında biten
+            # bir kontrol sözlüğü değiştirse de özet ve detay bölümleri aynı sonuçları görür
+            results_snapshot = dict(self.check_results_widget.check_results)
+            
             # Dosya kaydetme dialog'u
             file_path, _ = QFileDialog.getSaveFileName(
                 self, "Word Raporu Kaydet", 
@@ -5091,13 +5359,13 @@ class CustomsCheckApp(QMainWindow):
             dashboard_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
             
             # Analiz istatistiklerini topla
-            total_analyses = len(self.check_results_widget.check_results)
+            total_analyses = len(results_snapshot)
             error_count = 0
             warning_count = 0
             success_count = 0
             total_records = 0
             
-            for result in self.check_results_widget.check_results.values():
+            for result in results_snapshot.values():
                 if result:
                     status = result.get('status', 'unknown')
                     if status == 'error':
@@ -5107,11 +5375,9 @@ class CustomsCheckApp(QMainWindow):
                     elif status == 'success':
                         success_count += 1
                     
-                    if 'data' in result and result['data'] is not None:
-                        try:
-                            total_records += len(result['data'])
-                        except:
-                            pass
+                    data = result.get('data')
+                    if isinstance(data, pd.DataFrame):
+                        total_records += len(data)
             
             # Dashboard tablosu oluştur
             dashboard_table = doc.add_table(rows=5, cols=4)
@@ -5168,7 +5434,7 @@ class CustomsCheckApp(QMainWindow):
             
             # Tüm analiz sonuçlarını topla (HTML raporu olan ve olmayan)
             all_results = []
-            for check_name, result in self.check_results_widget.check_results.items():
+            for check_name, result in results_snapshot.items():
                 if result:
                     all_results.append((check_name, result))
             
@@ -5180,15 +5446,20 @@ class CustomsCheckApp(QMainWindow):
                 # Geçici dizin oluştur (resimler için)
                 temp_dir = tempfile.mkdtemp()
                 
+                # Olay kuyruğu her raporda değil, toplamda en fazla ~10 kez pompalanır
+                process_events = QApplication.processEvents
+                pump_every = max(1, total_reports // 10)
+                
                 # Her analiz için rapor ekle
                 for i, (check_name, result) in enumerate(all_results):
                     if self.word_cancelled:
                         progress_dialog.close()
                         return
                     
-                    progress_label.setText(f"İşleniyor: {check_name}")
-                    progress_bar.setValue(30 + int((i / total_reports) * 60))
-                    QApplication.processEvents()
+                    if i % pump_every == 0:
+                        progress_label.setText(f"İşleniyor: {check_name}")
+                        progress_bar.setValue(30 + (i * 60) // total_reports)
+                        process_events()
                     
                     # Analiz başlığı
                     heading = doc.add_heading(f'{i+1}. {check_name.upper()}', level=2)
@@ -5252,10 +5523,10 @@ class CustomsCheckApp(QMainWindow):
                                 error_run.font.color.rgb = RGBColor(231, 76, 60)
                     else:
                         # HTML raporu yoksa veri tablosu ekle
-                        if 'data' in result and result['data'] is not None:
+                        if result.get('data') is not None:
                             try:
                                 data = result['data']
-                                if hasattr(data, 'head'):  # DataFrame ise
+                                if isinstance(data, pd.DataFrame):
                                     # DataFrame'i Word tablosuna çevir
                                     if len(data) > 0:
                                         # En fazla 20 satır göster
@@ -5273,11 +5544,12 @@ class CustomsCheckApp(QMainWindow):
                                                 for run in paragraph.runs:
                                                     run.font.bold = True
                                         
-                                        # Veri satırları
-                                        for row_idx, (_, row) in enumerate(display_data.iterrows(), 1):
+                                        # Veri satırları: hücre metinleri tek bir vektörel geçişte hazırlanır
+                                        cell_texts = display_data.astype(str).where(display_data.notna(), "")
+                                        for row_idx, row_texts in enumerate(cell_texts.to_numpy().tolist(), 1):
                                             cells = table.rows[row_idx].cells
-                                            for col_idx, value in enumerate(row):
-                                                cells[col_idx].text = str(value) if pd.notna(value) else ""
+                                            for col_idx, text in enumerate(row_texts):
+                                                cells[col_idx].text = text
                                         
                                         if len(data) > 20:
                                             doc.add_paragraph(f"Not: Toplam {len(data)} kayıt bulundu, ilk 20 tanesi gösterildi.")
@@ -5796,6 +6068,7 @@ class CustomsCheckApp(QMainWindow):
             if table_text:
                 doc.add_paragraph(f"📊 Tablo Verisi:\n{table_text}")
 
+    @_safe_check
     def check_tedarikci_beyan_kontrol(self):
         """Tedarikçi Beyan Kontrolü"""
         if self.current_df is None:
@@ -5807,13 +6080,11 @@ class CustomsCheckApp(QMainWindow):
             self.status_label.setText("Tedarikçi beyan kontrol analizi çalışıyor...")
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(10)
-            QApplication.processEvents()
             
             # Tedarikçi beyan kontrol fonksiyonunu çağır
             check_result = check_tedarikci_beyan_kontrol(self.current_df)
             
             self.progress_bar.setValue(80)
-            QApplication.processEvents()
             
             if not check_result['success']:
                 QMessageBox.warning(self, "Uyarı", check_result['message'])
@@ -5953,7 +6224,7 @@ class CustomsCheckApp(QMainWindow):
             
             # HTML raporunu göster
             if "html_report" in kkdf_check:
-                self.check_results_widget.set_html_report(kkdf_check["html_report"])
+                self.check_results_widget.set_html_report(kkdf_check["html_report"], key="KKDF Kontrol Analizi")
                 self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
                 
             # Tablo ve özet verilerini göster
@@ -6016,7 +6287,7 @@ class CustomsCheckApp(QMainWindow):
             
             # HTML raporunu göster
             if "html_report" in gozetim_check:
-                self.check_results_widget.set_html_report(gozetim_check["html_report"])
+                self.check_results_widget.set_html_report(gozetim_check["html_report"], key="Gözetim Kontrol Analizi")
                 self.check_results_widget.tabs.setCurrentIndex(3)  # Görsel Rapor sekmesine geçiş
                 
             # Tablo ve özet verilerini göster
@@ -6041,6 +6312,8 @@ class CustomsCheckApp(QMainWindow):
             self.progress_bar.setVisible(False)
 
 if __name__ == "__main__":
+    # Paketlenmiş (frozen) uygulamada Excel aktarımının süreç havuzu için gerekli
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = CustomsCheckApp()
     window.show()
@@ -1,11 +1,355 @@
+import functools
 import pandas as pd
 import numpy as np
-import random
 import os
+import re
+import math
+import zipfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.utils import get_column_letter
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import pyexcelerate
+except ImportError:
+    pyexcelerate = None
+
+# Doğrudan XML/ZIP yazımında kullanılan sabit .xlsx parçaları
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_XLSX_SHEET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_SHEET_FOOTER = '</sheetData></worksheet>'
+
+# openpyxl write-only başlık hücrelerinin paylaştığı stil nesneleri (hücre başına yeniden oluşturulmaz)
+_HEADER_FONT = Font(bold=True)
+_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+
+def _one_per_category_python(group_beyns, offsets, taken, draws):
+    """
+    Kategori başına, kategoride henüz seçilmiş beyanname yoksa bir beyanname seçer
+    
+    Args:
+        group_beyns (np.ndarray): Kategoriye göre (kararlı) sıralanmış satırların beyanname kodları
+        offsets (np.ndarray): Kategori c'nin satırları group_beyns[offsets[c]:offsets[c + 1]]
+        taken (np.ndarray): Beyanname kodu başına seçildi bayrağı (yerinde güncellenir)
+        draws (np.ndarray): Kategori başına [0, 1) aralığında rastgele sayı
+    
+    Returns:
+        np.ndarray: Kategori başına seçilen beyanname kodu (seçim yoksa -1)
+    """
+    n_cats = offsets.size - 1
+    picked = np.full(n_cats, -1, np.int64)
+    stamp = np.full(taken.size, -1, np.int64)  # Beyannamenin son görüldüğü kategori
+    buffer = np.empty(group_beyns.size, np.int64)  # Kategorinin benzersiz beyannameleri
+    for c in range(n_cats):
+        count = 0
+        already_selected = False
+        for i in range(offsets[c], offsets[c + 1]):
+            b = group_beyns[i]
+            if taken[b]:
+                already_selected = True
+                break
+            if stamp[b] != c:
+                stamp[b] = c
+                buffer[count] = b
+                count += 1
+        if already_selected or count == 0:
+            continue
+        b = buffer[min(int(draws[c] * count), count - 1)]
+        picked[c] = b
+        taken[b] = True
+    return picked
+
+
+@functools.lru_cache(maxsize=None)
+def _one_per_category_kernel():
+    """
+    Kategori başına seçim çekirdeğini ilk kullanımda derler
+    
+    numba kurulu değilse None döner; bu durumda pandas tabanlı yol kullanılır.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_one_per_category_python)
+
+
+def _xlsx_text_cell(ref, value):
+    """Satır içi (inlineStr) metin hücresi XML'i üretir"""
+    text = ILLEGAL_CHARACTERS_RE.sub('', escape(str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _render_xlsx_rows(sheet_df, letters, numeric_flags, first_row_num):
+    """
+    DataFrame satırlarını sheetData içine yazılacak <row> XML'i olarak üretir
+    
+    Modül seviyesinde olduğu için süreç havuzundaki işçilerde de çalıştırılabilir.
+    
+    Returns:
+        bytes: UTF-8 kodlanmış <row> elemanları
+    """
+    rows = []
+    for row_num, values in enumerate(BeyannameSampling._iter_sheet_rows(sheet_df), start=first_row_num):
+        cells = []
+        for letter, is_numeric, value in zip(letters, numeric_flags, values):
+            # Boş (None/NaN) hücreleri atla
+            if value is None or value != value:
+                continue
+            if is_numeric:
+                if math.isfinite(value):
+                    cells.append(f'<c r="{letter}{row_num}"><v>{value}</v></c>')
+            else:
+                cells.append(_xlsx_text_cell(f'{letter}{row_num}', value))
+        rows.append(f'<row r="{row_num}">{"".join(cells)}</row>')
+    return ''.join(rows).encode('utf-8')
+
+
+def write_frames_to_xlsx(file_path, sheets):
+    """
+    DataFrame'leri openpyxl write-only modunda biçimsiz olarak Excel dosyasına yazar
+    
+    Write-only modda hücre nesneleri bellekte tutulmaz, satırlar doğrudan XML'e
+    akıtılır. Satırlar BeyannameSampling._iter_sheet_rows ile parça parça üretilir;
+    boş değerler None olarak yazılır (openpyxl NaN yazamaz).
+    
+    Args:
+        file_path (str): Excel dosyasının yolu
+        sheets (list): (sayfa adı, DataFrame) ikililerinden oluşan liste
+    """
+    workbook = Workbook(write_only=True)
+    for sheet_name, sheet_df in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet.append([str(col) for col in sheet_df.columns])
+        for values in BeyannameSampling._iter_sheet_rows(sheet_df):
+            worksheet.append(values)
+    workbook.save(file_path)
+
+
+def write_xlsx_package_parts(zf, sheet_names, styles_xml=None):
+    """
+    Sayfa XML'leri dışındaki sabit .xlsx paket parçalarını ZIP arşivine yazar
+    
+    Sayfaların arşive xl/worksheets/sheet{i}.xml adıyla, sheet_names sırasıyla
+    yazıldığı varsayılır.
+    
+    Args:
+        zf (zipfile.ZipFile): Yazma kipinde açılmış arşiv
+        sheet_names (list): Sayfa adları
+        styles_xml (str, optional): Hücrelerin s="..." ile başvurduğu xl/styles.xml içeriği
+    """
+    sheet_count = len(sheet_names)
+    content_types = ''.join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, sheet_count + 1))
+    rel_entries = ''.join(
+        f'<Relationship Id="rId{i}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, sheet_count + 1))
+    if styles_xml is not None:
+        content_types += ('<Override PartName="/xl/styles.xml" '
+                          'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>')
+        rel_entries += (f'<Relationship Id="rId{sheet_count + 1}" '
+                        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+                        'Target="styles.xml"/>')
+        zf.writestr('xl/styles.xml', styles_xml)
+    
+    zf.writestr('[Content_Types].xml',
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                f'{content_types}</Types>')
+    zf.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+    
+    sheet_entries = ''.join(
+        f'<sheet name={quoteattr(str(sheet_name))} sheetId="{i}" r:id="rId{i}"/>'
+        for i, sheet_name in enumerate(sheet_names, start=1))
+    zf.writestr('xl/workbook.xml',
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                f'<sheets>{sheet_entries}</sheets></workbook>')
+    zf.writestr('xl/_rels/workbook.xml.rels',
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                f'{rel_entries}</Relationships>')
+
+
+# xlsxwriter ile yazarken uygulanan rapor biçimi (format_excel_report'un openpyxl biçimiyle aynı).
+# Sayfa adı öneki -> başlık rengi, alternatif satır rengi, biçimlenen en fazla satır/sütun,
+# sütun genişlikleri ve ortalanan değer sütunu
+_XLSX_REPORT_LAYOUTS = (
+    ('Örnekleme Özeti', {'header': '#4472C4', 'alternate': '#E9EDF4', 'max_row': 1000, 'max_col': 3,
+                         'widths': {0: 20}, 'wrap_header': True, 'centered_col': None}),
+    ('Beyanname Detayları', {'header': '#5B9BD5', 'alternate': '#DEEBF7', 'max_row': 1000, 'max_col': 20,
+                             'widths': {col: 15 for col in range(10)}, 'wrap_header': True, 'centered_col': None}),
+    ('İstatistikler', {'header': '#70AD47', 'alternate': None, 'max_row': None, 'max_col': 2,
+                       'widths': {0: 25}, 'wrap_header': False, 'centered_col': 1}),
+)
+
+
+def _xlsxwriter_report_formats(workbook, sheet_name, column_count):
+    """
+    Sayfa rapor sayfalarından biriyse xlsxwriter biçimlerini hazırlar
+    
+    Returns:
+        dict veya None: 'header' biçimi, satır ve alternatif satır için sütun başına
+        biçim listeleri ve biçimlenen en fazla satır sayısı
+    """
+    layout = next((layout for prefix, layout in _XLSX_REPORT_LAYOUTS if sheet_name.startswith(prefix)), None)
+    if layout is None:
+        return None
+    
+    header_format = workbook.add_format({'bold': True, 'font_color': '#FFFFFF', 'bg_color': layout['header'],
+                                         'border': 1, 'align': 'center', 'valign': 'vcenter',
+                                         'text_wrap': layout['wrap_header']})
+    body_format = workbook.add_format({'border': 1})
+    centered_format = workbook.add_format({'border': 1, 'align': 'center'})
+    alternate_format = (workbook.add_format({'border': 1, 'bg_color': layout['alternate']})
+                        if layout['alternate'] else body_format)
+    
+    styled_columns = min(column_count, layout['max_col'])
+    body = [centered_format if col == layout['centered_col'] else body_format for col in range(styled_columns)]
+    alternate = [centered_format if col == layout['centered_col'] else alternate_format
+                 for col in range(styled_columns)]
+    return {'header': header_format, 'body': body, 'alternate': alternate,
+            'max_row': layout['max_row'], 'widths': layout['widths']}
+
+
+def _solid_fill(color):
+    """Düz renk dolgusu oluşturur"""
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def _add_report_styles(workbook):
+    """
+    format_excel_report'un kullandığı adlandırılmış stilleri çalışma kitabına ekler
+    
+    Hücrelere yazı tipi, dolgu, kenarlık ve hizalama ayrı ayrı atanmak yerine tek bir
+    stil adı atanır; openpyxl her atamada stil tekilleştirmesi yapmak zorunda kalmaz.
+    """
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_font = Font(bold=True, color="FFFFFF")
+    header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    body_font = Font(name='Calibri', size=11)
+    
+    styles = [
+        NamedStyle('ozet_baslik', font=header_font, fill=_solid_fill("4472C4"),
+                   border=border, alignment=header_alignment),
+        NamedStyle('ozet_satir', font=body_font, border=border),
+        NamedStyle('ozet_satir_alt', font=body_font, border=border, fill=_solid_fill("E9EDF4")),
+        NamedStyle('detay_baslik', font=header_font, fill=_solid_fill("5B9BD5"),
+                   border=border, alignment=header_alignment),
+        NamedStyle('detay_satir', border=border),
+        NamedStyle('detay_satir_alt', border=border, fill=_solid_fill("DEEBF7")),
+        NamedStyle('istatistik_baslik', font=header_font, fill=_solid_fill("70AD47"),
+                   border=border, alignment=Alignment(horizontal='center', vertical='center')),
+        NamedStyle('istatistik_satir', border=border),
+        NamedStyle('istatistik_deger', border=border, alignment=Alignment(horizontal='center')),
+    ]
+    for style in styles:
+        if style.name not in workbook.named_styles:
+            workbook.add_named_style(style)
+
+
+def _style_rows(ws, max_row, max_col, header_style, body_style, alternate_style=None):
+    """İlk max_row satır ve max_col sütuna başlık, satır ve (çift satırlarda) alternatif stilini atar"""
+    for row in ws.iter_rows(min_row=1, max_row=max_row, min_col=1, max_col=max_col):
+        row_idx = row[0].row
+        if row_idx == 1:
+            style = header_style
+        elif alternate_style and row_idx % 2 == 0:
+            style = alternate_style
+        else:
+            style = body_style
+        for cell in row:
+            cell.style = style
+
+
+def _concat_unique(arrays):
+    """Beyanname dizilerini tek seferde birleştirip benzersizleştirir (ilk görülme sırası korunur)"""
+    if not arrays:
+        return np.empty(0, dtype=object)
+    return pd.unique(np.concatenate(arrays))
+
+
+def _keyword_pattern(keywords):
+    """Anahtar kelimelerden tek geçişte aranabilecek bir regex deseni oluşturur"""
+    return '|'.join(map(re.escape, keywords))
+
+
+# set_dataframe'de category tipine çevrilen sütunlar (muafiyet ve doküman kod sütunları da
+# çevrilir). Açıklama sütunları yüksek kardinaliteli olduğundan bilerek dışarıda bırakıldı.
+_CATEGORY_COLUMNS = (
+    'Beyanname_no', 'Rejim', 'Gtip',
+    'Mensei_ulke', 'Cikis_ulkesi', 'Ihracat_ulkesi',
+    'Gonderen', 'Gonderen_adi', 'Gonderen_firma', 'Adi_unvani', 'Ihracatci',
+    'Tasima_sekli', 'Tasima_araci', 'Tasima_turu', 'Teslim_sekli',
+    'Odeme', 'Odeme_sekli', 'Odeme_yontemi',
+    'Basitlestirilmis_usul', 'Basitlestirilmis_usul_kodu', 'Islem_kodu',
+)
+
+
+# Sütun keşfinde öncelik sırasıyla denenen aday sütun adları
+_EXEMPTION_COLUMNS = ("Muafiyet_kodu", "Muafiyet", "Muafiyet1", "Muafiyet2")
+_QUANTITY_COLUMNS = ("Miktar_birimi", "Olcu_birimi")
+_DESCRIPTION_COLUMNS = ("Aciklama", "Ticari_tanimi", "Esya_tanimi")
+
+
+# Doküman kod sütunlarında aranan belge kodları
+_ORIGIN_PROOF_CODES = ('0302', '0807', '0307')  # Menşe ispat belgeleri
+_ATR_CODE = '0301'  # A.TR Dolaşım Belgesi
+_SUPPLIER_CODE = '0819'  # Tedarikçi Beyanı
+_DECLARATION_CODES = ('0876', '0842')  # Tedarikçi beyanı / menşe beyanı
+# Kod dizini ilk kullanımda bu kodların tümü için tek geçişte oluşturulur
+_INDEXED_DOC_CODES = _ORIGIN_PROOF_CODES + (_ATR_CODE, _SUPPLIER_CODE) + _DECLARATION_CODES
+
+
+# Excel'e yazılamayan karakterler (U+FFFF ve BMP dışı karakterler); tek regex ile C tarafında temizlenir
+_XLSX_UNSUPPORTED_CHARS = re.compile('[\uffff\U00010000-\U0010ffff]')
+
+
+def _is_doc_code_column(column):
+    """Adında hem "dokuman" hem "kod" geçen doküman kod sütunu olup olmadığını döndürür"""
+    lowered = str(column).lower()
+    return "dokuman" in lowered and "kod" in lowered
+
+
+# Değeri hiç görülmeyen sütunlar için boş satır konumu dizisi
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+
+class ExportCancelled(Exception):
+    """Excel aktarımı kullanıcı tarafından iptal edildiğinde yazıcılar tarafından fırlatılır"""
+
 
 class BeyannameSampling:
     """
@@ -13,25 +357,109 @@ class BeyannameSampling:
     belirli kriterlere göre örnekleme yaparak Excel raporlama yapar.
     """
     
+    # Bu satır sayısının üzerindeki çıktılar doğrudan XML/ZIP olarak yazılır
+    DIRECT_XLSX_ROW_THRESHOLD = 200000
+    
+    # PyExcelerate tüm sayfayı bellekte liste olarak kurar; bu satır sayısının üzerinde
+    # satırları diske akıtan yazıcılar kullanılır
+    PYEXCELERATE_ROW_LIMIT = 50000
+    
+    # Bu satır sayısının üzerindeki sayfaların XML'i süreç havuzunda paralel üretilir
+    PARALLEL_XLSX_ROW_THRESHOLD = 500000
+    
+    # Yazıcıların iptal bayrağını kontrol etme sıklığı (satır)
+    CANCEL_CHECK_ROWS = 1000
+    
+    # Bu satır sayısından itibaren önceki seçimlere bakmayan kriterler iş parçacığı havuzunda çalışır
+    PARALLEL_SAMPLING_ROW_THRESHOLD = 200000
+    
+    # Önceki seçimlere bakan (kategori başına "henüz seçilmediyse" kuralı) kriterler; bunlar sıralı çalışır
+    SELECTION_DEPENDENT_SAMPLERS = frozenset({
+        '_sample_by_sender', '_sample_by_gtip_code', '_sample_by_country',
+        '_sample_by_exemption_code', '_sample_by_origin_code', '_sample_by_transport_type',
+    })
+    
+    # Kategori döngülerinde hedef kontrolünün yapılma sıklığı (değer sayısı)
+    TARGET_CHECK_INTERVAL = 256
+    
+    # Bu satır sayısından itibaren kategori başına seçim numba çekirdeğiyle yapılır (numba kuruluysa)
+    NUMBA_CATEGORY_ROW_THRESHOLD = 1000000
+    
     def __init__(self, df=None):
         """
         Args:
             df (pandas.DataFrame): Beyanname verileri içeren DataFrame
         """
         self.df = df
-        self.unique_beyanname_df = None
+        self.unique_beyanname_df = None  # Beyanname başına bir satır (yalnızca Beyanname_no)
+        self._unique_positions = None  # unique_beyanname_df satırlarının df içindeki konumları
         self.selected_beyannames = set()
-        self.selection_reasons = {}  # Beyanname no -> seçim nedenleri listesi
+        self._selected_arr = None  # Seçilen beyannameler, seçim sırasıyla dizi halinde (ilk okumada oluşturulur)
+        self.selection_reasons = {}  # Beyanname no -> {seçim nedeni: None}; anahtarlar seçim sırasını tutar
         self.sampling_stats = {}  # İstatistikler
+        self._group_index_cache = {}  # Sütun adı -> {değer: satır konumları}
+        self._beyanname_values = None  # Beyanname_no sütununun NumPy dizisi
+        self._rng = np.random.default_rng()  # Örnekleme seçimleri için rastgele sayı üreteci
+        self._lowered_columns = None  # (sütun, küçük harfli ad) ikilileri
+        self._beyanname_codes = None  # Beyanname_no için (kodlar, benzersiz değerler)
+        self._stop_target = None  # run_sampling(stop_at_target=True) iken hedef örnekleme sayısı
+        self._text_columns = {}  # Sütun adı -> metin taramalarında kullanılan Series
+        self._dtype_checks = {}  # (sütun adı, kontrol) -> sonuç
+        self._local = threading.local()  # Paralel kriterlerde iş parçacığına özel seçim tamponu ve RNG
+        self._doc_code_cols = None  # Doküman kod sütunları (_discover_columns ile bulunur)
+        self._exemption_column = None  # İlk bulunan muafiyet sütunu
+        self._quantity_column = None  # İlk bulunan miktar/ölçü birimi sütunu
+        self._description_cols = []  # Bulunan açıklama sütunları
+        self._doc_code_index = {}  # Belge kodu -> bu kodu taşıyan benzersiz beyannameler
+        self._formatted_report_path = None  # Rapor biçimi yazılırken uygulanmış son Excel dosyası
     
     def set_dataframe(self, df):
         """DataFrame'i ayarlar ve örnekleme için hazırlar"""
-        self.df = df
+        self.df = self._categorize_columns(df)
+        self._group_index_cache = {}
+        self._beyanname_values = None
+        self._lowered_columns = None
+        self._beyanname_codes = None
+        self._text_columns = {}
+        self._dtype_checks = {}
+        self._doc_code_index = {}
+        self._discover_columns()
         self._prepare_unique_beyannames()
         self.selected_beyannames = set()
+        self._selected_arr = None
         self.selection_reasons = {}
         self.sampling_stats = {}
     
+    @staticmethod
+    def _categorize_columns(df):
+        """
+        Örneklemede gruplanan/karşılaştırılan metin sütunlarını category tipine çevirir
+        
+        groupby, unique, == ve isin işlemleri metin yerine tamsayı kodlar üzerinde çalışır.
+        Çağıranın DataFrame'i değiştirilmez; gerekirse sığ kopya üzerinde dönüştürülür.
+        """
+        if df is None:
+            return df
+        
+        columns = [col for col in df.columns
+                   if (col in _CATEGORY_COLUMNS or col in _EXEMPTION_COLUMNS or _is_doc_code_column(col))
+                   and pd.api.types.is_string_dtype(df[col])]
+        if not columns:
+            return df
+        
+        df = df.copy(deep=False)
+        for col in columns:
+            df[col] = df[col].astype('category')
+        return df
+    
+    @staticmethod
+    def _with_object_columns(df):
+        """Kategorik sütunları tekrar object tipine çevirir (fillna('') ve arayüz düzenlemeleri için)"""
+        columns = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+        if not columns:
+            return df
+        return df.astype({col: object for col in columns})
+    
     def _prepare_unique_beyannames(self):
         """
         Benzersiz beyanname numaralarına göre bir DataFrame hazırlar.
@@ -40,8 +468,12 @@ class BeyannameSampling:
         if self.df is None or 'Beyanname_no' not in self.df.columns:
             return None
         
-        # Beyanname numarasına göre grupla ve ilk satırı al
-        self.unique_beyanname_df = self.df.drop_duplicates(subset=['Beyanname_no'])
+        # Her beyannamenin ilk satırının konumu; yalnızca Beyanname_no sütunu hashlenir
+        self._unique_positions = np.flatnonzero(~self.df['Beyanname_no'].duplicated().to_numpy())
+        
+        # Tüm sütunları kopyalamak yerine yalnızca beyanname numaralarını tut; tam satırlar
+        # sadece seçilen beyannameler için _selected_rows ile alınır
+        self.unique_beyanname_df = self.df[['Beyanname_no']].take(self._unique_positions)
         
         # Toplam beyanname sayısını kaydet
         self.sampling_stats['total_beyannames'] = len(self.unique_beyanname_df)
@@ -52,20 +484,95 @@ class BeyannameSampling:
         """
         Seçilen beyannameye seçim nedeni ekler
         
+        Nedenler beyanname başına sıralı bir sözlükte (anahtar = neden) tutulur; böylece
+        aynı neden tekrar eklenmez, üyelik kontrolü O(1) olur ve ekleme sırası korunur.
+        Paralel çalışan bir kriterin içinden çağrıldığında seçim yalnızca tampona yazılır.
+        
         Args:
             beyanname_no (str): Beyanname numarası
             reason (str): Seçim nedeni
         """
-        if beyanname_no not in self.selection_reasons:
-            self.selection_reasons[beyanname_no] = []
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            buffer.append((beyanname_no, reason))
+            return
         
-        if reason not in self.selection_reasons[beyanname_no]:
-            self.selection_reasons[beyanname_no].append(reason)
+        self.selection_reasons.setdefault(beyanname_no, {})[reason] = None
         
         # Seçilen beyannameler setine ekle
         self.selected_beyannames.add(beyanname_no)
+        self._selected_arr = None
     
-    def run_sampling(self, min_sample_count=100, max_sample_count=150, sample_percentage=0.05):
+    def _add_selection_reasons(self, beyanname_nos, reason):
+        """
+        Aynı seçim nedenini birden çok beyannameye toplu olarak ekler
+        
+        Args:
+            beyanname_nos (iterable): Beyanname numaraları
+            reason (str): Seçim nedeni
+        """
+        beyanname_nos = list(beyanname_nos)
+        if not beyanname_nos:
+            return
+        
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            buffer.extend((beyanname_no, reason) for beyanname_no in beyanname_nos)
+            return
+        
+        reasons = self.selection_reasons
+        for beyanname_no in beyanname_nos:
+            reasons.setdefault(beyanname_no, {})[reason] = None
+        
+        self.selected_beyannames.update(beyanname_nos)
+        self._selected_arr = None
+    
+    def _target_reached(self):
+        """stop_at_target ile çalışılıyorsa ve hedef sayıya ulaşıldıysa True döndürür"""
+        return self._stop_target is not None and len(self.selected_beyannames) >= self._stop_target
+    
+    def clear_selection(self):
+        """Seçilen beyannameleri ve seçim nedenlerini temizler"""
+        self.selected_beyannames = set()
+        self._selected_arr = None
+        self.selection_reasons = {}
+    
+    def _selected_array(self):
+        """
+        Seçilen beyannameleri seçim sırasıyla dizi olarak döndürür
+        
+        Üyelik kontrolleri selected_beyannames kümesiyle yapılır; isin karşılaştırmaları ve
+        çıktılar için sıralı liste selection_reasons anahtarlarından bir kez oluşturulur.
+        """
+        if self._selected_arr is None:
+            self._selected_arr = np.array(list(self.selection_reasons), dtype=object)
+        return self._selected_arr
+    
+    def get_selected_positions(self):
+        """
+        Seçilen beyannamelerin unique_beyanname_df içindeki satır konumlarını döndürür
+        
+        Returns:
+            numpy.ndarray: int64 satır konumları (iloc/take ile kullanılabilir)
+        """
+        if self.unique_beyanname_df is None or not self.selected_beyannames:
+            return np.empty(0, dtype=np.int64)
+        
+        mask = self.unique_beyanname_df['Beyanname_no'].isin(self._selected_array()).to_numpy()
+        return np.flatnonzero(mask).astype(np.int64, copy=False)
+    
+    def _selected_rows(self, columns=None):
+        """
+        Seçilen beyannamelerin ilk satırlarını (unique_beyanname_df sırasıyla) tam tablodan alır
+        
+        Args:
+            columns (list, optional): Alınacak sütunlar; verilmezse tüm sütunlar
+        """
+        positions = self._unique_positions[self.get_selected_positions()]
+        source = self.df if columns is None else self.df[columns]
+        return source.take(positions)
+    
+    def run_sampling(self, min_sample_count=100, max_sample_count=150, sample_percentage=0.05, stop_at_target=False):
         """
         Tüm kriterlere göre örnekleme yapar
         
@@ -73,6 +580,9 @@ class BeyannameSampling:
             min_sample_count (int): Minimum örnekleme sayısı
             max_sample_count (int): Maksimum örnekleme sayısı
             sample_percentage (float): Örnekleme yüzdesi (0-1 arası)
+            stop_at_target (bool): True ise seçilen sayı hedefe ulaşınca kalan kriterler
+                (ve kategori döngüleri) erken bırakılır. Varsayılan olarak tüm kriterler
+                uygulanır; kapsama kriterleri hedefi aşsa da eksiksiz kalır.
         
         Returns:
             pandas.DataFrame: Seçilen beyannameleri ve seçim nedenlerini içeren DataFrame
@@ -87,31 +597,52 @@ class BeyannameSampling:
         
         self.sampling_stats['target_sample_count'] = target_sample_count
         
-        # Temel seçim kriterlerini uygula
-        self._sample_by_rejim_code()
-        self._sample_by_sender()
-        self._sample_by_gtip_code()
-        self._sample_by_country()
-        self._sample_by_highest_weight()
-        self._sample_by_highest_value()
-        self._sample_by_exemption_code()
-        self._sample_by_simplified_procedure()
-        self._sample_by_origin_code()
-        self._sample_by_transport_type()
-        
-        # Özel kriterleri uygula
-        self._sample_by_delivery_type()
-        self._sample_by_foreign_expense()
-        self._sample_by_exceptional_value()
-        self._sample_by_onboard_process()
-        self._sample_by_payment_method()
-        self._sample_by_discount()
-        self._sample_by_origin_proof_document()
-        self._sample_by_atr_and_supplier_declaration()
-        self._sample_by_set_classification()
-        self._sample_by_supplier_origin_declaration()
-        self._sample_by_special_purpose_exemption()
-        self._sample_by_inward_outward_processing()
+        # stop_at_target açıksa hedefe ulaşıldığında kalan kriterler atlanır
+        self._stop_target = target_sample_count if stop_at_target else None
+        
+        samplers = (
+            # Temel seçim kriterleri
+            self._sample_by_rejim_code,
+            self._sample_by_sender,
+            self._sample_by_gtip_code,
+            self._sample_by_country,
+            self._sample_by_highest_weight,
+            self._sample_by_highest_value,
+            self._sample_by_exemption_code,
+            self._sample_by_simplified_procedure,
+            self._sample_by_origin_code,
+            self._sample_by_transport_type,
+            # Özel kriterler
+            self._sample_by_delivery_type,
+            self._sample_by_foreign_expense,
+            self._sample_by_exceptional_value,
+            self._sample_by_onboard_process,
+            self._sample_by_payment_method,
+            self._sample_by_discount,
+            self._sample_by_origin_proof_document,
+            self._sample_by_atr_and_supplier_declaration,
+            self._sample_by_set_classification,
+            self._sample_by_supplier_origin_declaration,
+            self._sample_by_special_purpose_exemption,
+            self._sample_by_inward_outward_processing,
+        )
+        
+        # Büyük tablolarda önceki seçimlere bakmayan kriterler önceden paralel hesaplanır
+        precomputed = {}
+        if not stop_at_target and len(self.df) >= self.PARALLEL_SAMPLING_ROW_THRESHOLD:
+            precomputed = self._run_independent_samplers(
+                [sampler for sampler in samplers if sampler.__name__ not in self.SELECTION_DEPENDENT_SAMPLERS])
+        
+        # Seçimler her zaman kriter sırasıyla uygulanır; böylece önceki seçimlere bakan
+        # kriterler sıralı çalışmadakiyle aynı durumu görür
+        for sampler in samplers:
+            if self._target_reached():
+                break
+            if sampler.__name__ in precomputed:
+                for beyanname_no, reason in precomputed[sampler.__name__]:
+                    self._add_selection_reason(beyanname_no, reason)
+            else:
+                sampler()
         
         # Hedef sayıya ulaşana kadar rastgele ek beyannameler seç
         self._random_sampling_to_target(target_sample_count)
@@ -119,179 +650,399 @@ class BeyannameSampling:
         # Sonuçları DataFrame olarak hazırla
         return self._prepare_results_dataframe()
     
+    def _run_independent_samplers(self, samplers):
+        """
+        Önceki seçimlere bakmayan kriterleri iş parçacığı havuzunda çalıştırır
+        
+        Her kriter kendi seçim tamponuna ve kendi RNG'sine (ana üreteçten türetilir) yazar;
+        paylaşılan seçim durumu değiştirilmez. pandas/NumPy taramaları GIL'i bıraktığı için
+        kriterler çok çekirdekte birlikte ilerler.
+        
+        Returns:
+            dict: Kriter adı -> [(beyanname no, seçim nedeni), ...]
+        """
+        # Kriterlerin ortak kullandığı önbellekleri iş parçacıklarından önce oluştur
+        self._beyannames_at(_NO_ROWS)
+        self._beyanname_factorized()
+        self._column_names_lower()
+        if self._doc_code_columns():
+            self._doc_code_beyannames(_INDEXED_DOC_CODES)
+        
+        def run(sampler, rng):
+            self._local.buffer = []
+            self._local.rng = rng
+            try:
+                sampler()
+                return self._local.buffer
+            finally:
+                self._local.buffer = None
+                self._local.rng = None
+        
+        rngs = self._rng.spawn(len(samplers))
+        with ThreadPoolExecutor(max_workers=min(len(samplers), os.cpu_count() or 1)) as executor:
+            futures = {sampler.__name__: executor.submit(run, sampler, rng) for sampler, rng in zip(samplers, rngs)}
+            return {name: future.result() for name, future in futures.items()}
+    
+    def _current_rng(self):
+        """Paralel kriter içindeysek iş parçacığının RNG'sini, değilse örnekleyicinin RNG'sini döndürür"""
+        return getattr(self._local, 'rng', None) or self._rng
+    
+    def _group_index(self, column):
+        """
+        Sütunun her değeri için satır konumlarını tutan sözlüğü döndürür
+        
+        groupby(...).indices tek geçişte {değer: np.ndarray} üretir; sonuç sütun başına
+        saklanır, böylece her değer için tüm sütunu yeniden karşılaştırmak gerekmez.
+        """
+        index = self._group_index_cache.get(column)
+        if index is None:
+            index = self.df.groupby(column, sort=False, observed=True).indices
+            self._group_index_cache[column] = index
+        return index
+    
+    def _rows_for(self, column, value):
+        """Sütun değeri value olan satırların konumlarını döndürür (yoksa boş dizi)"""
+        return self._group_index(column).get(value, _NO_ROWS)
+    
+    def _beyanname_array(self):
+        """Beyanname_no sütununun NumPy dizisini döndürür; DataFrame başına bir kez oluşturulur"""
+        if self._beyanname_values is None:
+            self._beyanname_values = self.df['Beyanname_no'].to_numpy()
+        return self._beyanname_values
+    
+    def _beyannames_at(self, positions):
+        """Verilen satır konumlarındaki benzersiz beyanname numaralarını görülme sırasıyla döndürür"""
+        return pd.unique(self._beyanname_array().take(positions))
+    
+    def _doc_code_beyannames(self, codes):
+        """
+        Doküman kod sütunlarında verilen kodlardan biri geçen beyannameleri kod başına döndürür
+        
+        Sonuçlar kod -> beyannameler dizininde DataFrame başına saklanır. Dizin ilk çağrıda
+        kriterlerin kullandığı tüm kodlar (_INDEXED_DOC_CODES) için tek taramayla doldurulur;
+        sonraki kriterler ve tekrar çalıştırmalar yalnızca sözlükten okur.
+        
+        Returns:
+            dict: Kod -> benzersiz beyanname numaraları (ilk görülme sırasıyla); hiç geçmeyen kodlar yer almaz
+        """
+        index = self._doc_code_index
+        missing = [code for code in codes if code not in index]
+        if missing:
+            scan_codes = list(dict.fromkeys(missing + ([] if index else list(_INDEXED_DOC_CODES))))
+            found = self._scan_doc_codes(self._doc_code_columns(), scan_codes)
+            empty = np.empty(0, dtype=object)
+            for code in scan_codes:
+                index[code] = found.get(code, empty)
+        return {code: index[code] for code in codes if len(index[code]) > 0}
+    
+    def _scan_doc_codes(self, doc_code_columns, codes):
+        """
+        Doküman kod sütunlarını verilen kodlar için tarar (_doc_code_beyannames dizini için)
+        
+        Kategorik sütunlarda kodlar yalnızca kategoriler üzerinde aranır ve satırlar
+        tamsayı kodlarla eşlenir; diğer sütunlar isin ile taranır. Eşleşen hücrelerin
+        beyannameleri kodlarına göre tek bir groupby ile toplanır.
+        
+        Returns:
+            dict: Kod -> benzersiz beyanname numaraları (ilk görülme sırasıyla); hiç geçmeyen kodlar yer almaz
+        """
+        row_parts, col_parts, code_parts = [], [], []
+        for position, col in enumerate(doc_code_columns):
+            series = self.df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                categories = series.cat.categories
+                # Sona eklenen False, boş hücrelerin -1 kodunu eşleşmez yapar
+                wanted = np.append(categories.isin(codes), False)
+                if not wanted.any():
+                    continue
+                cat_codes = series.cat.codes.to_numpy()
+                rows = np.flatnonzero(wanted[cat_codes])
+                found = categories.to_numpy(dtype=object)[cat_codes[rows]]
+            else:
+                values = series.to_numpy(dtype=object)
+                rows = np.flatnonzero(np.isin(values, codes))
+                found = values[rows]
+            row_parts.append(rows)
+            col_parts.append(np.full(len(rows), position))
+            code_parts.append(found)
+        
+        rows = np.concatenate(row_parts) if row_parts else _NO_ROWS
+        if len(rows) == 0:
+            return {}
+        
+        # Eşleşmeler satır, ardından sütun sırasına dizilir (ilk görülme sırası korunur)
+        order = np.lexsort((np.concatenate(col_parts), rows))
+        found_codes = np.concatenate(code_parts)[order]
+        beyannames = pd.Series(self._beyanname_array().take(rows[order]))
+        return beyannames.groupby(found_codes, sort=False).unique().to_dict()
+    
+    def _pick(self, values, count):
+        """
+        values içinden tekrar etmeden en fazla count adet değer seçer
+        
+        Seçim NumPy Generator ile C tarafında yapılır; diziyi Python listesine
+        çevirmeye gerek kalmaz. Elemanlar Python nesnesi olarak döner.
+        """
+        values = np.asarray(values, dtype=object)
+        if len(values) == 0:
+            return values
+        return self._current_rng().choice(values, size=min(count, len(values)), replace=False)
+    
+    def _pick_one(self, values, draw=None):
+        """
+        values içinden rastgele tek bir değer seçer
+        
+        Döngülerde draw ile önceden toplu çekilmiş [0, 1) aralığındaki sayı verilebilir;
+        böylece her adımda ayrı RNG çağrısı yapılmaz.
+        """
+        values = np.asarray(values, dtype=object)
+        if draw is None:
+            return values[self._current_rng().integers(len(values))]
+        return values[min(int(draw * len(values)), len(values) - 1)]
+    
+    def _is_string_column(self, column):
+        """Sütunun metin içerip içermediğini döndürür; sonuç DataFrame başına saklanır"""
+        key = (column, 'string')
+        if key not in self._dtype_checks:
+            # object sütunlarda is_string_dtype tüm değerleri tarar, bu yüzden tekrar edilmez
+            series = self.df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Eski pandas sürümleri category tipini metin saymaz; kategorilere bakılır
+                series = series.cat.categories
+            self._dtype_checks[key] = pd.api.types.is_string_dtype(series)
+        return self._dtype_checks[key]
+    
+    def _is_numeric_column(self, column):
+        """Sütunun sayısal olup olmadığını döndürür; sonuç DataFrame başına saklanır"""
+        key = (column, 'numeric')
+        if key not in self._dtype_checks:
+            self._dtype_checks[key] = pd.api.types.is_numeric_dtype(self.df[column])
+        return self._dtype_checks[key]
+    
+    def _text_series(self, column):
+        """
+        Metin taramaları için sütunu döndürür
+        
+        Tekrarlı değerleri çok olan metin sütunları bir kez kategorik hale getirilip saklanır;
+        .str taramaları yalnızca benzersiz değerler üzerinde yapılır ve aynı sütunu tarayan
+        her kriter bundan yararlanır. Küçük harfe çevrilmiş kopya tutulmaz: str.lower()
+        Türkçe "İ" harfini "i̇" yaptığından aramalar case=False ile yapılır.
+        """
+        series = self._text_columns.get(column)
+        if series is None:
+            series = self.df[column]
+            if not isinstance(series.dtype, pd.CategoricalDtype) and self._is_string_column(column):
+                codes, uniques = pd.factorize(series)
+                if len(uniques) <= len(series) // 2:
+                    series = pd.Series(pd.Categorical.from_codes(codes, uniques), index=series.index)
+            self._text_columns[column] = series
+        return series
+    
+    def _text_contains(self, column, pattern, regex=True):
+        """Sütunda desen geçen satırların maskesini döndürür (büyük/küçük harf duyarsız, boşlar False)"""
+        return self._text_series(column).str.contains(pattern, case=False, regex=regex, na=False)
+    
+    def _unique_values(self, column):
+        """Sütunun boş olmayan benzersiz değerlerini ilk görülme sırasıyla döndürür (Series kurmadan)"""
+        values = pd.unique(self.df[column].to_numpy())
+        return values[~pd.isna(values)]
+    
+    def _beyannames_where(self, mask):
+        """Boolean maskenin seçtiği satırlardaki benzersiz beyanname numaralarını döndürür"""
+        return self._beyannames_at(np.flatnonzero(mask.to_numpy(dtype=bool, na_value=False)))
+    
+    def _beyannames_where_any(self, masks):
+        """
+        Maskelerden herhangi birinin seçtiği satırlardaki benzersiz beyanname numaralarını döndürür
+        
+        Maskeler önce birleştirilir; benzersizleştirme sütun başına değil bir kez yapılır.
+        """
+        combined = None
+        for mask in masks:
+            combined = mask if combined is None else combined | mask
+        if combined is None:
+            return np.empty(0, dtype=object)
+        return self._beyannames_where(combined)
+    
+    def _column_names_lower(self):
+        """(sütun, küçük harfli sütun adı) ikililerini döndürür; adlar DataFrame başına bir kez küçültülür"""
+        if self._lowered_columns is None:
+            self._lowered_columns = [(col, str(col).lower()) for col in self.df.columns]
+        return self._lowered_columns
+    
+    def _columns_containing(self, keywords):
+        """Küçük harfli adında anahtar kelimelerden herhangi birini içeren sütunları sırasıyla döndürür"""
+        return [col for col, lowered in self._column_names_lower()
+                if any(keyword in lowered for keyword in keywords)]
+    
+    def _discover_columns(self):
+        """Kriterlerin kullandığı sütunları DataFrame ayarlanırken bir kez belirler"""
+        self._doc_code_cols = [col for col in self.df.columns if _is_doc_code_column(col)]
+        self._exemption_column = self._first_available_column(_EXEMPTION_COLUMNS)
+        self._quantity_column = self._first_available_column(_QUANTITY_COLUMNS)
+        self._description_cols = [col for col in _DESCRIPTION_COLUMNS if col in self.df.columns]
+    
+    def _doc_code_columns(self):
+        """Adında hem "dokuman" hem "kod" geçen doküman kod sütunlarını döndürür"""
+        if self._doc_code_cols is None:
+            self._discover_columns()
+        return self._doc_code_cols
+    
+    def _first_available_column(self, candidates):
+        """Adaylardan DataFrame'de bulunan ilk sütunun adını döndürür (yoksa None)"""
+        for col in candidates:
+            if col in self.df.columns:
+                return col
+        return None
+    
+    def _sample_one_per_category(self, column, reason_template):
+        """
+        Sütunun her değeri için, o değerden henüz beyanname seçilmemişse bir tane seçer
+        
+        Değer başına tüm tabloyu maskelemek yerine groupby ile tek geçişte her değerin
+        beyanname numaraları çıkarılır; boş değerler gruplanmaz. Değerler ilk görüldükleri
+        sırayla işlenir, böylece bir değer için yapılan seçim sonrakileri etkiler.
+        
+        Args:
+            column (str): Kategori sütunu
+            reason_template (str): Değerle biçimlendirilen seçim nedeni ("... {} ...")
+        """
+        if len(self.df) >= self.NUMBA_CATEGORY_ROW_THRESHOLD:
+            kernel = _one_per_category_kernel()
+            if kernel is not None:
+                self._sample_one_per_category_compiled(kernel, column, reason_template)
+                return
+        
+        grouped = self.df.groupby(column, sort=False, observed=True)['Beyanname_no'].unique()
+        draws = self._current_rng().random(len(grouped))  # Kategori başına tek RNG çağrısı yerine toplu çekim
+        selected = self.selected_beyannames  # Seçimlerle yerinde güncellenir
+        
+        for position, (value, beyannames) in enumerate(grouped.items()):
+            # Hedefe ulaşıldıysa kalan değerleri atla (yalnızca stop_at_target ile)
+            if position % self.TARGET_CHECK_INTERVAL == 0 and self._target_reached():
+                break
+            
+            # Zaten bu değerden beyanname seçilmişse atla - küme üyeliği, her seçimde dizi kurulmaz
+            if any(b in selected for b in beyannames):
+                continue
+            
+            # Henüz bu değerden beyanname seçilmemişse, bir tane seç
+            if len(beyannames) > 0:
+                selected_beyanname = self._pick_one(beyannames, draws[position])
+                self._add_selection_reason(selected_beyanname, reason_template.format(value))
+    
+    def _sample_one_per_category_compiled(self, kernel, column, reason_template):
+        """
+        _sample_one_per_category'nin çok büyük tablolar için derlenmiş çekirdekli sürümü
+        
+        Kategori ve beyanname değerleri ilk görülme sırasıyla tamsayı kodlara çevrilir,
+        satırlar kategoriye göre kararlı sıralanır ve seçim tek bir native döngüde yapılır.
+        """
+        cat_codes, categories = pd.factorize(self.df[column])
+        beyn_codes, beyn_values = self._beyanname_factorized()
+        
+        valid = (cat_codes >= 0) & (beyn_codes >= 0)
+        codes = cat_codes[valid]
+        order = np.argsort(codes, kind='stable')
+        group_beyns = beyn_codes[valid][order].astype(np.int64)
+        offsets = np.zeros(len(categories) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(categories)), out=offsets[1:])
+        
+        taken = np.isin(beyn_values, self._selected_array())
+        draws = self._current_rng().random(len(categories))
+        picked = kernel(group_beyns, offsets, taken, draws)
+        
+        for c in np.flatnonzero(picked >= 0):
+            self._add_selection_reason(beyn_values[picked[c]], reason_template.format(categories[c]))
+    
+    def _beyanname_factorized(self):
+        """Beyanname_no sütununun (kodlar, benzersiz değerler) çiftini döndürür; DataFrame başına bir kez hesaplanır"""
+        if self._beyanname_codes is None:
+            codes, uniques = pd.factorize(self.df['Beyanname_no'])
+            self._beyanname_codes = (codes, np.asarray(uniques, dtype=object))
+        return self._beyanname_codes
+    
     def _sample_by_rejim_code(self):
         """Tüm rejim kodlarından en az %5 olacak şekilde örnekleme yapar"""
         if 'Rejim' not in self.df.columns:
             return
         
         # Rejim kodlarını say
-        rejim_counts = self.df.groupby('Rejim')['Beyanname_no'].nunique().reset_index()
+        rejim_counts = self.df.groupby('Rejim', observed=True)['Beyanname_no'].nunique().reset_index()
         rejim_counts.columns = ['Rejim', 'Beyanname_Sayisi']
         
         # Her rejim kodu için örnekleme yap
         for _, row in rejim_counts.iterrows():
+            # Hedefe ulaşıldıysa kalan rejim kodlarını atla (yalnızca stop_at_target ile)
+            if self._target_reached():
+                break
+            
             rejim_code = row['Rejim']
             beyanname_count = row['Beyanname_Sayisi']
             
             # Rejim koduna göre %5 örnekleme (minimum 1)
             sample_count = max(1, int(beyanname_count * 0.05))
             
-            # Bu rejim kodlu benzersiz beyannameleri bul
-            beyannames = self.df[self.df['Rejim'] == rejim_code]['Beyanname_no'].unique()
+            # Bu rejim kodlu satırlar ve benzersiz beyannameler
+            rejim_rows = self._rows_for('Rejim', rejim_code)
+            beyannames = self._beyannames_at(rejim_rows)
             
             # Mümkünse farklı firmalardan ve yüksek kıymetli beyannameleri önceliklendir
             if 'Adi_unvani' in self.df.columns and 'Fatura_miktari' in self.df.columns:
-                # Firma ve kıymete göre grupla
-                rejim_df = self.df[self.df['Rejim'] == rejim_code]
-                firm_value_df = rejim_df.groupby(['Beyanname_no', 'Adi_unvani'])['Fatura_miktari'].sum().reset_index()
+                # Firma ve kıymete göre grupla; XML'den gelen kıymetler metin olabileceğinden
+                # toplama ve sıralama sayıya çevrilmiş değerler üzerinde yapılır
+                rejim_df = self.df.take(rejim_rows)
+                if not self._is_numeric_column('Fatura_miktari'):
+                    rejim_df = rejim_df.assign(Fatura_miktari=pd.to_numeric(rejim_df['Fatura_miktari'], errors='coerce'))
+                firm_value_df = rejim_df.groupby(['Beyanname_no', 'Adi_unvani'], observed=True)['Fatura_miktari'].sum().reset_index()
                 
                 # Kıymete göre sırala (yüksekten düşüğe)
                 firm_value_df = firm_value_df.sort_values('Fatura_miktari', ascending=False)
                 
-                # Farklı firmaları önceliklendir
-                selected_firms = set()
-                selected_beyannames_for_rejim = []
-                
-                for _, brow in firm_value_df.iterrows():
-                    beyanname_no = brow['Beyanname_no']
-                    firm = brow['Adi_unvani']
-                    
-                    # Zaten yeterince beyanname seçtiyse çık
-                    if len(selected_beyannames_for_rejim) >= sample_count:
-                        break
-                    
-                    # Bu firma henüz seçilmemişse öncelikle seç
-                    if firm not in selected_firms:
-                        selected_firms.add(firm)
-                        selected_beyannames_for_rejim.append(beyanname_no)
-                        self._add_selection_reason(beyanname_no, f"Rejim Kodu: {rejim_code} - Farklı firma örneklemesi")
+                # Farklı firmaları önceliklendir: her firmanın en yüksek kıymetli beyannamesi
+                top_firm_df = firm_value_df.drop_duplicates('Adi_unvani').head(sample_count)
+                self._add_selection_reasons(top_firm_df['Beyanname_no'], f"Rejim Kodu: {rejim_code} - Farklı firma örneklemesi")
                 
                 # Hala yeterli sayıda değilse kalan kısmı yüksek kıymetlilerden tamamla
-                if len(selected_beyannames_for_rejim) < sample_count:
-                    remaining_beyannames = [b for b in beyannames if b not in selected_beyannames_for_rejim]
-                    remaining_needed = sample_count - len(selected_beyannames_for_rejim)
-                    
-                    if remaining_needed > 0 and remaining_beyannames:
+                remaining_needed = sample_count - len(top_firm_df)
+                if remaining_needed > 0:
+                    remaining_df = rejim_df[~rejim_df['Beyanname_no'].isin(top_firm_df['Beyanname_no'])]
+                    if len(remaining_df) > 0:
                         # Kalan beyannamelerden yüksek kıymetli olanları seç
-                        remaining_df = rejim_df[rejim_df['Beyanname_no'].isin(remaining_beyannames)]
-                        value_df = remaining_df.groupby('Beyanname_no')['Fatura_miktari'].sum().reset_index()
-                        value_df = value_df.sort_values('Fatura_miktari', ascending=False)
-                        
-                        for idx, vrow in value_df.head(remaining_needed).iterrows():
-                            beyanname_no = vrow['Beyanname_no']
-                            self._add_selection_reason(beyanname_no, f"Rejim Kodu: {rejim_code} - Yüksek kıymet örneklemesi")
+                        value_df = remaining_df.groupby('Beyanname_no', observed=True)['Fatura_miktari'].sum().reset_index()
+                        self._add_selection_reasons(value_df.nlargest(remaining_needed, 'Fatura_miktari')['Beyanname_no'],
+                                                    f"Rejim Kodu: {rejim_code} - Yüksek kıymet örneklemesi")
             else:
                 # Firma ve kıymet bilgisi yoksa rastgele seç
                 sample_size = min(sample_count, len(beyannames))
                 if sample_size > 0:
-                    sampled_beyannames = random.sample(list(beyannames), sample_size)
-                    for beyanname_no in sampled_beyannames:
-                        self._add_selection_reason(beyanname_no, f"Rejim Kodu: {rejim_code} - Rastgele örnekleme")
+                    sampled_beyannames = self._pick(beyannames, sample_size)
+                    self._add_selection_reasons(sampled_beyannames, f"Rejim Kodu: {rejim_code} - Rastgele örnekleme")
     
     def _sample_by_sender(self):
         """Tüm göndericilerden en az 1 adet beyanname seçer"""
-        sender_columns = ["Gonderen", "Gonderen_adi", "Gonderen_firma", "Adi_unvani", "Ihracatci"]
-        
-        # Mevcut gönderici sütununu bul
-        sender_column = None
-        for col in sender_columns:
-            if col in self.df.columns:
-                sender_column = col
-                break
-        
-        if not sender_column:
-            return
-        
-        # Gönderici firmaları benzersiz olarak al
-        senders = self.df[sender_column].dropna().unique()
-        
-        for sender in senders:
-            # Bu göndericiye ait beyannameler
-            sender_beyannames = self.df[self.df[sender_column] == sender]['Beyanname_no'].unique()
-            
-            # Zaten seçilmiş bir beyanname var mı kontrol et
-            already_selected = False
-            for beyanname_no in sender_beyannames:
-                if beyanname_no in self.selected_beyannames:
-                    already_selected = True
-                    break
-            
-            # Henüz bu göndericiden beyanname seçilmemişse, bir tane seç
-            if not already_selected and len(sender_beyannames) > 0:
-                selected_beyanname = random.choice(sender_beyannames)
-                self._add_selection_reason(selected_beyanname, f"Gönderici: {sender} - Her göndericiden en az bir beyanname kriteri")
+        sender_column = self._first_available_column(["Gonderen", "Gonderen_adi", "Gonderen_firma", "Adi_unvani", "Ihracatci"])
+        if sender_column:
+            self._sample_one_per_category(sender_column, "Gönderici: {} - Her göndericiden en az bir beyanname kriteri")
     
     def _sample_by_gtip_code(self):
         """Tüm GTIP kodlarından benzersiz olacak şekilde en az bir GTIP kodu seçer"""
-        if 'Gtip' not in self.df.columns:
-            return
-        
-        # Benzersiz GTIP kodları
-        gtip_codes = self.df['Gtip'].dropna().unique()
-        
-        for gtip in gtip_codes:
-            # Bu GTIP koduna sahip beyannameler
-            gtip_beyannames = self.df[self.df['Gtip'] == gtip]['Beyanname_no'].unique()
-            
-            # Zaten bu GTIP'li beyanname seçilmiş mi kontrol et
-            already_selected = False
-            for beyanname_no in gtip_beyannames:
-                if beyanname_no in self.selected_beyannames:
-                    already_selected = True
-                    break
-            
-            # Henüz bu GTIP'den beyanname seçilmemişse, bir tane seç
-            if not already_selected and len(gtip_beyannames) > 0:
-                selected_beyanname = random.choice(gtip_beyannames)
-                self._add_selection_reason(selected_beyanname, f"GTIP: {gtip} - Her GTIP kodundan en az bir beyanname kriteri")
+        if 'Gtip' in self.df.columns:
+            self._sample_one_per_category('Gtip', "GTIP: {} - Her GTIP kodundan en az bir beyanname kriteri")
     
     def _sample_by_country(self):
         """Farklı ülkelerden beyanname seçer"""
-        country_columns = ["Mensei_ulke", "Cikis_ulkesi", "Ihracat_ulkesi"]
-        
-        # Mevcut ülke sütununu bul
-        country_column = None
-        for col in country_columns:
-            if col in self.df.columns:
-                country_column = col
-                break
-        
-        if not country_column:
-            return
-        
-        # Benzersiz ülkeleri al
-        countries = self.df[country_column].dropna().unique()
-        
-        for country in countries:
-            # Bu ülkeye ait beyannameler
-            country_beyannames = self.df[self.df[country_column] == country]['Beyanname_no'].unique()
-            
-            # Zaten bu ülkeden beyanname seçilmiş mi kontrol et
-            already_selected = False
-            for beyanname_no in country_beyannames:
-                if beyanname_no in self.selected_beyannames:
-                    already_selected = True
-                    break
-            
-            # Henüz bu ülkeden beyanname seçilmemişse, bir tane seç
-            if not already_selected and len(country_beyannames) > 0:
-                selected_beyanname = random.choice(country_beyannames)
-                self._add_selection_reason(selected_beyanname, f"Ülke: {country} - Farklı ülkelerden beyanname kriteri")
+        country_column = self._first_available_column(["Mensei_ulke", "Cikis_ulkesi", "Ihracat_ulkesi"])
+        if country_column:
+            self._sample_one_per_category(country_column, "Ülke: {} - Farklı ülkelerden beyanname kriteri")
     
     def _sample_by_highest_weight(self):
         """En yüksek ağırlıktaki 5 adet beyannameyi seçer"""
         if 'Brut_agirlik' not in self.df.columns:
             return
         
-        # Beyanname başına toplam brüt ağırlık hesapla
-        weight_df = self.df.groupby('Beyanname_no')['Brut_agirlik'].sum().reset_index()
-        
-        # Ağırlığa göre sırala ve en yüksek 5 adet beyanname seç
-        weight_df = weight_df.sort_values('Brut_agirlik', ascending=False)
-        
-        for _, row in weight_df.head(5).iterrows():
-            beyanname_no = row['Beyanname_no']
-            weight = row['Brut_agirlik']
+        # Beyanname başına toplam brüt ağırlığı en yüksek 5 beyanname
+        for beyanname_no, weight in self._top_beyannames_by_sum('Brut_agirlik', 5):
             self._add_selection_reason(beyanname_no, f"En yüksek ağırlık: {weight} - İlk 5 beyanname")
     
     def _sample_by_highest_value(self):
@@ -299,49 +1050,42 @@ class BeyannameSampling:
         if 'Fatura_miktari' not in self.df.columns:
             return
         
-        # Beyanname başına toplam kıymet hesapla
-        value_df = self.df.groupby('Beyanname_no')['Fatura_miktari'].sum().reset_index()
-        
-        # Kıymete göre sırala ve en yüksek 5 adet beyanname seç
-        value_df = value_df.sort_values('Fatura_miktari', ascending=False)
-        
-        for _, row in value_df.head(5).iterrows():
-            beyanname_no = row['Beyanname_no']
-            value = row['Fatura_miktari']
+        # Beyanname başına toplam kıymeti en yüksek 5 beyanname
+        for beyanname_no, value in self._top_beyannames_by_sum('Fatura_miktari', 5):
             self._add_selection_reason(beyanname_no, f"En yüksek kıymet: {value} - İlk 5 beyanname")
     
+    def _top_beyannames_by_sum(self, column, count):
+        """
+        Beyanname başına column toplamı en yüksek count beyannameyi (beyanname, toplam) olarak döndürür
+        
+        Toplamlar beyanname kodları üzerinde tek np.bincount geçişiyle hesaplanır, en
+        yüksekler argpartition ile bulunur; tüm grupları sıralamaya gerek kalmaz. Boş
+        değerler groupby().sum() gibi 0 sayılır.
+        """
+        codes, beyannames = self._beyanname_factorized()
+        values = self.df[column]
+        if not self._is_numeric_column(column):
+            values = pd.to_numeric(values, errors='coerce')
+        weights = values.to_numpy(dtype=np.float64, na_value=0.0)
+        
+        valid = codes >= 0
+        totals = np.bincount(codes[valid], weights=weights[valid], minlength=len(beyannames))
+        if pd.api.types.is_integer_dtype(values):
+            totals = totals.astype(np.int64)
+        
+        count = min(count, len(totals))
+        if count == 0:
+            return []
+        top = np.argpartition(totals, -count)[-count:]
+        top = top[np.argsort(totals[top], kind='stable')[::-1]]
+        return list(zip(beyannames[top], totals[top]))
+    
     def _sample_by_exemption_code(self):
         """Farklı muafiyet kodlarından beyanname seçer"""
-        exemption_columns = ["Muafiyet_kodu", "Muafiyet", "Muafiyet1", "Muafiyet2"]
-        
-        # Mevcut muafiyet sütununu bul
-        exemption_column = None
-        for col in exemption_columns:
-            if col in self.df.columns:
-                exemption_column = col
-                break
-        
-        if not exemption_column:
-            return
-        
-        # Benzersiz muafiyet kodlarını al
-        exemption_codes = self.df[exemption_column].dropna().unique()
-        
-        for exemption in exemption_codes:
-            # Bu muafiyet koduna sahip beyannameler
-            exemption_beyannames = self.df[self.df[exemption_column] == exemption]['Beyanname_no'].unique()
-            
-            # Zaten bu muafiyet kodlu beyanname seçilmiş mi kontrol et
-            already_selected = False
-            for beyanname_no in exemption_beyannames:
-                if beyanname_no in self.selected_beyannames:
-                    already_selected = True
-                    break
-            
-            # Henüz bu muafiyet kodundan beyanname seçilmemişse, bir tane seç
-            if not already_selected and len(exemption_beyannames) > 0:
-                selected_beyanname = random.choice(exemption_beyannames)
-                self._add_selection_reason(selected_beyanname, f"Muafiyet Kodu: {exemption} - Farklı muafiyet kodlarından beyanname kriteri")
+        exemption_column = self._exemption_column
+        if exemption_column:
+            self._sample_one_per_category(exemption_column,
+                                          "Muafiyet Kodu: {} - Farklı muafiyet kodlarından beyanname kriteri")
     
     def _sample_by_simplified_procedure(self):
         """Tüm basitleştirilmiş usuldeki beyannamelerden en az bir adet seçer"""
@@ -352,93 +1096,49 @@ class BeyannameSampling:
         column = 'Basitlestirilmis_usul' if 'Basitlestirilmis_usul' in self.df.columns else 'Basitlestirilmis_usul_kodu'
         
         # Basitleştirilmiş usul değerlerini al
-        simplified_codes = self.df[column].dropna().unique()
+        simplified_codes = self._unique_values(column)
+        draws = self._current_rng().random(len(simplified_codes))
         
-        for code in simplified_codes:
+        for code, draw in zip(simplified_codes, draws):
+            # Hedefe ulaşıldıysa kalan usul kodlarını atla (yalnızca stop_at_target ile)
+            if self._target_reached():
+                break
+            
             # Bu usul koduna sahip beyannameler
-            simplified_beyannames = self.df[self.df[column] == code]['Beyanname_no'].unique()
+            simplified_beyannames = self._beyannames_at(self._rows_for(column, code))
             
             # En az bir adet beyanname seç
             if len(simplified_beyannames) > 0:
-                selected_beyanname = random.choice(simplified_beyannames)
+                selected_beyanname = self._pick_one(simplified_beyannames, draw)
                 self._add_selection_reason(selected_beyanname, f"Basitleştirilmiş Usul: {code} - Her usulden en az bir beyanname kriteri")
     
     def _sample_by_origin_code(self):
         """Farklı menşe kodlarından beyanname seçer"""
-        if 'Mensei_ulke' not in self.df.columns:
-            return
-        
-        # Menşe kodlarını al
-        origin_codes = self.df['Mensei_ulke'].dropna().unique()
-        
-        for origin in origin_codes:
-            # Bu menşe koduna sahip beyannameler
-            origin_beyannames = self.df[self.df['Mensei_ulke'] == origin]['Beyanname_no'].unique()
-            
-            # Zaten bu menşe kodlu beyanname seçilmiş mi kontrol et
-            already_selected = False
-            for beyanname_no in origin_beyannames:
-                if beyanname_no in self.selected_beyannames:
-                    already_selected = True
-                    break
-            
-            # Henüz bu menşe kodundan beyanname seçilmemişse, bir tane seç
-            if not already_selected and len(origin_beyannames) > 0:
-                selected_beyanname = random.choice(origin_beyannames)
-                self._add_selection_reason(selected_beyanname, f"Menşe Kodu: {origin} - Farklı menşe kodlarından beyanname kriteri")
+        if 'Mensei_ulke' in self.df.columns:
+            self._sample_one_per_category('Mensei_ulke', "Menşe Kodu: {} - Farklı menşe kodlarından beyanname kriteri")
     
     def _sample_by_transport_type(self):
         """Tüm taşıma türlerinden en az 1 adet beyanname seçer"""
-        transport_columns = ["Tasima_sekli", "Tasima_araci", "Tasima_turu"]
-        
-        # Mevcut taşıma şekli sütununu bul
-        transport_column = None
-        for col in transport_columns:
-            if col in self.df.columns:
-                transport_column = col
-                break
-        
-        if not transport_column:
-            return
-        
-        # Taşıma türlerini al
-        transport_types = self.df[transport_column].dropna().unique()
-        
-        for transport in transport_types:
-            # Bu taşıma türüne sahip beyannameler
-            transport_beyannames = self.df[self.df[transport_column] == transport]['Beyanname_no'].unique()
-            
-            # Zaten bu taşıma türünden beyanname seçilmiş mi kontrol et
-            already_selected = False
-            for beyanname_no in transport_beyannames:
-                if beyanname_no in self.selected_beyannames:
-                    already_selected = True
-                    break
-            
-            # Henüz bu taşıma türünden beyanname seçilmemişse, bir tane seç
-            if not already_selected and len(transport_beyannames) > 0:
-                selected_beyanname = random.choice(transport_beyannames)
-                self._add_selection_reason(selected_beyanname, f"Taşıma Türü: {transport} - Her taşıma türünden en az bir beyanname kriteri")
+        transport_column = self._first_available_column(["Tasima_sekli", "Tasima_araci", "Tasima_turu"])
+        if transport_column:
+            self._sample_one_per_category(transport_column,
+                                          "Taşıma Türü: {} - Her taşıma türünden en az bir beyanname kriteri")
     
     def _sample_by_delivery_type(self):
         """Tüm teslim şekillerinden en az 1 adet beyanname seçer"""
         delivery_columns = ["Teslim_sekli"]
         
         # Mevcut teslim şekli sütununu bul
-        delivery_column = None
-        for col in delivery_columns:
-            if col in self.df.columns:
-                delivery_column = col
-                break
+        delivery_column = self._first_available_column(delivery_columns)
         
         if not delivery_column:
             return
         
         # Teslim şekillerini al
-        delivery_types = self.df[delivery_column].dropna().unique()
+        delivery_types = self._unique_values(delivery_column)
         
         # Sık kullanılan teslim şekillerini belirleme
-        delivery_counts = self.df.groupby(delivery_column)['Beyanname_no'].nunique().reset_index()
+        delivery_counts = self.df.groupby(delivery_column, observed=True)['Beyanname_no'].nunique().reset_index()
         delivery_counts.columns = ['Teslim_Sekli', 'Beyanname_Sayisi']
         delivery_counts = delivery_counts.sort_values('Beyanname_Sayisi', ascending=False)
         
@@ -447,14 +1147,14 @@ class BeyannameSampling:
         
         for delivery in delivery_types:
             # Bu teslim şekline sahip beyannameler
-            delivery_beyannames = self.df[self.df[delivery_column] == delivery]['Beyanname_no'].unique()
+            delivery_beyannames = self._beyannames_at(self._rows_for(delivery_column, delivery))
             
             # Seçilecek beyanname sayısını belirle
             sample_count = 3 if delivery in top_deliveries else 1
             sample_size = min(sample_count, len(delivery_beyannames))
             
             if sample_size > 0:
-                sampled_beyannames = random.sample(list(delivery_beyannames), sample_size)
+                sampled_beyannames = self._pick(delivery_beyannames, sample_size)
                 for beyanname_no in sampled_beyannames:
                     if delivery in top_deliveries:
                         self._add_selection_reason(beyanname_no, f"Teslim Şekli: {delivery} - En çok kullanılan teslim şekillerinden örnek")
@@ -469,9 +1169,9 @@ class BeyannameSampling:
         expense_column = None
         explanation_column = None
         
-        for col in self.df.columns:
-            if any(keyword in col.lower() for keyword in ["yurtdisi_gider", "royalti", "lisans"]):
-                if "aciklama" in col.lower() or "açıklama" in col.lower():
+        for col, lowered in self._column_names_lower():
+            if any(keyword in lowered for keyword in ["yurtdisi_gider", "royalti", "lisans"]):
+                if "aciklama" in lowered or "açıklama" in lowered:
                     explanation_column = col
                 else:
                     expense_column = col
@@ -480,106 +1180,83 @@ class BeyannameSampling:
         if not expense_column and not explanation_column:
             return
         
-        # Yurt dışı gider olan beyannameleri bul
-        expense_beyannames = []
+        # Yurt dışı gider olan satırların maskeleri
+        expense_masks = []
         
         # Gider sütunu varsa ve sayısalsa, sıfırdan büyük değerleri kontrol et
-        if expense_column and pd.api.types.is_numeric_dtype(self.df[expense_column]):
-            expense_beyannames.extend(self.df[self.df[expense_column] > 0]['Beyanname_no'].unique())
+        if expense_column and self._is_numeric_column(expense_column):
+            expense_masks.append(self.df[expense_column] > 0)
         
         # Açıklama sütunu varsa, "royalti", "lisans" içerenleri kontrol et
         if explanation_column:
             keywords = ["royalti", "lisans", "license", "royalty", "know-how", "franchise"]
-            for keyword in keywords:
-                matching_beyannames = self.df[self.df[explanation_column].str.lower().str.contains(keyword, na=False)]['Beyanname_no'].unique()
-                expense_beyannames.extend(matching_beyannames)
+            expense_masks.append(self._text_contains(explanation_column, _keyword_pattern(keywords)))
         
         # Benzersiz beyannameleri al
-        expense_beyannames = list(set(expense_beyannames))
+        expense_beyannames = self._beyannames_where_any(expense_masks)
         
         # En az 5 beyanname seç
         sample_size = min(5, len(expense_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(expense_beyannames, sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "Yurt dışı gider/royalti/lisans ödemesi olan beyanname")
+            sampled_beyannames = self._pick(expense_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "Yurt dışı gider/royalti/lisans ödemesi olan beyanname")
     
     def _sample_by_exceptional_value(self):
         """İstisnai kıymetle beyan olan beyannameleri seçer"""
         # 44 numaralı hanenin bulunduğu sütunları belirleme
-        hane44_columns = []
-        for col in self.df.columns:
-            if any(keyword in col.lower() for keyword in ["belge", "dokuman", "aciklama", "44"]):
-                hane44_columns.append(col)
+        hane44_columns = self._columns_containing(["belge", "dokuman", "aciklama", "44"])
         
         if not hane44_columns:
             return
         
         # İstisnai kıymet ile ilgili anahtar kelimeler
         keywords = ["istisnai kıymet", "istisnai", "kiymet istisnasi", "kıymet istisnası"]
+        pattern = _keyword_pattern(keywords)
         
-        exceptional_beyannames = []
-        
-        # Her bir potansiyel sütunu kontrol et
-        for col in hane44_columns:
-            if pd.api.types.is_string_dtype(self.df[col]):
-                for keyword in keywords:
-                    matching_beyannames = self.df[self.df[col].str.lower().str.contains(keyword, na=False)]['Beyanname_no'].unique()
-                    exceptional_beyannames.extend(matching_beyannames)
-        
-        # Benzersiz beyannameleri al
-        exceptional_beyannames = list(set(exceptional_beyannames))
+        # Her bir potansiyel sütunu kontrol et (her sütun tek desenle bir kez taranır)
+        exceptional_beyannames = self._beyannames_where_any(
+            self._text_contains(col, pattern) for col in hane44_columns if self._is_string_column(col))
         
         # En az 5 beyanname seç
         sample_size = min(5, len(exceptional_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(exceptional_beyannames, sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "İstisnai kıymet ile beyan edilen beyanname")
+            sampled_beyannames = self._pick(exceptional_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "İstisnai kıymet ile beyan edilen beyanname")
     
     def _sample_by_onboard_process(self):
         """Taşıt üstü işlem yapılan beyannameleri seçer (Basitleştirilmiş işlem kodu 3 olanlar)"""
         simplified_columns = ["Basitlestirilmis_usul", "Basitlestirilmis_usul_kodu", "Islem_kodu"]
         
         # Uygun sütunu belirle
-        simplified_column = None
-        for col in simplified_columns:
-            if col in self.df.columns:
-                simplified_column = col
-                break
+        simplified_column = self._first_available_column(simplified_columns)
         
         if not simplified_column:
             return
         
         # Kod 3 olan beyannameleri bul
-        onboard_beyannames = self.df[self.df[simplified_column] == '3']['Beyanname_no'].unique()
+        onboard_beyannames = self._beyannames_where(self.df[simplified_column] == '3')
         
         # En az 5 beyanname seç
         sample_size = min(5, len(onboard_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(list(onboard_beyannames), sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "Taşıt üstü işlem yapılan beyanname (Basitleştirilmiş işlem kodu 3)")
+            sampled_beyannames = self._pick(onboard_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "Taşıt üstü işlem yapılan beyanname (Basitleştirilmiş işlem kodu 3)")
     
     def _sample_by_payment_method(self):
         """Tüm ödeme şekillerinden en az 1 adet beyanname seçer"""
         payment_columns = ["Odeme", "Odeme_sekli", "Odeme_yontemi"]
         
         # Mevcut ödeme şekli sütununu bul
-        payment_column = None
-        for col in payment_columns:
-            if col in self.df.columns:
-                payment_column = col
-                break
+        payment_column = self._first_available_column(payment_columns)
         
         if not payment_column:
             return
         
         # Ödeme şekillerini al
-        payment_methods = self.df[payment_column].dropna().unique()
+        payment_methods = self._unique_values(payment_column)
         
         # Sık kullanılan ödeme şekillerini belirleme
-        payment_counts = self.df.groupby(payment_column)['Beyanname_no'].nunique().reset_index()
+        payment_counts = self.df.groupby(payment_column, observed=True)['Beyanname_no'].nunique().reset_index()
         payment_counts.columns = ['Odeme_Sekli', 'Beyanname_Sayisi']
         payment_counts = payment_counts.sort_values('Beyanname_Sayisi', ascending=False)
         
@@ -590,14 +1267,14 @@ class BeyannameSampling:
         
         for payment in payment_methods:
             # Bu ödeme şekline sahip beyannameler
-            payment_beyannames = self.df[self.df[payment_column] == payment]['Beyanname_no'].unique()
+            payment_beyannames = self._beyannames_at(self._rows_for(payment_column, payment))
             
             # Her ödeme şeklinden en az 1 beyanname seç
             # En yaygın ödeme şeklinden 3 beyanname seç
             sample_size = min(3 if payment == most_common_payment else 1, len(payment_beyannames))
             
             if sample_size > 0:
-                sampled_beyannames = random.sample(list(payment_beyannames), sample_size)
+                sampled_beyannames = self._pick(payment_beyannames, sample_size)
                 for beyanname_no in sampled_beyannames:
                     if payment == most_common_payment:
                         self._add_selection_reason(beyanname_no, f"Ödeme Şekli: {payment} - En yaygın ödeme şekli")
@@ -607,221 +1284,141 @@ class BeyannameSampling:
     def _sample_by_discount(self):
         """İskonto yapılan beyannameleri seçer (yurt dışı gider sütununda "iskonto" yazanlar)"""
         # Yurt dışı gider ve açıklama sütunlarını bul
-        expense_columns = []
-        for col in self.df.columns:
-            if any(keyword in col.lower() for keyword in ["yurtdisi_gider", "gider", "iskonto", "indirim", "discount"]):
-                expense_columns.append(col)
+        expense_columns = self._columns_containing(["yurtdisi_gider", "gider", "iskonto", "indirim", "discount"])
         
         if not expense_columns:
             return
         
-        discount_beyannames = []
-        
         # Her bir potansiyel sütunu kontrol et
-        for col in expense_columns:
-            if pd.api.types.is_string_dtype(self.df[col]):
-                matching_beyannames = self.df[self.df[col].str.lower().str.contains("iskonto|indirim|discount", na=False, regex=True)]['Beyanname_no'].unique()
-                discount_beyannames.extend(matching_beyannames)
-        
-        # Benzersiz beyannameleri al
-        discount_beyannames = list(set(discount_beyannames))
+        discount_beyannames = self._beyannames_where_any(
+            self._text_contains(col, "iskonto|indirim|discount")
+            for col in expense_columns if self._is_string_column(col))
         
         # En az 5 beyanname seç
         sample_size = min(5, len(discount_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(discount_beyannames, sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "İskonto yapılan beyanname")
+            sampled_beyannames = self._pick(discount_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "İskonto yapılan beyanname")
     
     def _sample_by_origin_proof_document(self):
         """Menşe ispat belgesi kullanan beyannameleri seçer (0302, 0807, 0307 gibi belge kodları)"""
         # Doküman kod sütunlarını bul
-        doc_code_columns = []
-        for col in self.df.columns:
-            if "dokuman" in col.lower() and "kod" in col.lower():
-                doc_code_columns.append(col)
+        doc_code_columns = self._doc_code_columns()
         
         if not doc_code_columns:
             return
         
         # Menşe ispat belge kodları
-        origin_proof_codes = ['0302', '0807', '0307']
-        
-        origin_proof_beyannames = []
+        origin_proof_codes = _ORIGIN_PROOF_CODES
         
-        # Her bir doküman kod sütununu kontrol et
-        for col in doc_code_columns:
-            for code in origin_proof_codes:
-                matching_beyannames = self.df[self.df[col] == code]['Beyanname_no'].unique()
-                origin_proof_beyannames.extend(matching_beyannames)
-        
-        # Benzersiz beyannameleri al
-        origin_proof_beyannames = list(set(origin_proof_beyannames))
+        # Kod başına beyannameler (kod dizininden okunur)
+        code_beyannames_map = self._doc_code_beyannames(origin_proof_codes)
+        origin_proof_beyannames = _concat_unique(list(code_beyannames_map.values()))
         
         # En az 1 beyanname seç (mümkünse farklı belge kodları için)
-        if origin_proof_beyannames:
+        if len(origin_proof_beyannames) > 0:
             selected_count = 0
             selected_codes = set()
             
             # Her menşe ispat belge kodu için en az 1 beyanname seç
             for code in origin_proof_codes:
-                code_beyannames = []
-                
-                for col in doc_code_columns:
-                    matching = self.df[self.df[col] == code]['Beyanname_no'].unique()
-                    code_beyannames.extend(matching)
+                code_beyannames = code_beyannames_map.get(code, ())
                 
-                code_beyannames = list(set(code_beyannames))
-                
-                if code_beyannames:
-                    selected_beyanname = random.choice(code_beyannames)
+                if len(code_beyannames) > 0:
+                    selected_beyanname = self._pick_one(code_beyannames)
                     self._add_selection_reason(selected_beyanname, f"Menşe ispat belgesi kullanan beyanname (Belge kodu: {code})")
                     selected_count += 1
                     selected_codes.add(code)
             
             # Eğer hiç seçilmediyse, genel havuzdan seç
-            if selected_count == 0 and origin_proof_beyannames:
-                selected_beyanname = random.choice(origin_proof_beyannames)
+            if selected_count == 0 and len(origin_proof_beyannames) > 0:
+                selected_beyanname = self._pick_one(origin_proof_beyannames)
                 self._add_selection_reason(selected_beyanname, "Menşe ispat belgesi kullanan beyanname")
     
     def _sample_by_atr_and_supplier_declaration(self):
         """A.TR ve Tedarikçi Beyanı olan beyannameleri seçer (0301 ve 0819 kodları)"""
         # Doküman kod sütunlarını bul
-        doc_code_columns = []
-        for col in self.df.columns:
-            if "dokuman" in col.lower() and "kod" in col.lower():
-                doc_code_columns.append(col)
+        doc_code_columns = self._doc_code_columns()
         
         if not doc_code_columns:
             return
         
         # A.TR ve Tedarikçi Beyanı kodları
-        atr_code = '0301'
-        supplier_code = '0819'
+        atr_code = _ATR_CODE
+        supplier_code = _SUPPLIER_CODE
         
-        # Her iki belgeyi de içeren beyannameleri bul
-        atr_supplier_beyannames = []
-        
-        for beyanname_no in self.df['Beyanname_no'].unique():
-            beyanname_df = self.df[self.df['Beyanname_no'] == beyanname_no]
-            
-            has_atr = False
-            has_supplier = False
-            
-            for col in doc_code_columns:
-                if atr_code in beyanname_df[col].values:
-                    has_atr = True
-                if supplier_code in beyanname_df[col].values:
-                    has_supplier = True
-            
-            if has_atr and has_supplier:
-                atr_supplier_beyannames.append(beyanname_no)
+        # Her iki belgeyi de içeren beyannameleri bul: kod başına beyannameler kod dizininden
+        # okunur, ardından iki kümenin kesişimi alınır (satır satır tarama yapılmaz)
+        code_beyannames_map = self._doc_code_beyannames([atr_code, supplier_code])
+        atr_beyannames = code_beyannames_map.get(atr_code, np.empty(0, dtype=object))
+        supplier_beyannames = code_beyannames_map.get(supplier_code, np.empty(0, dtype=object))
+        atr_supplier_beyannames = atr_beyannames[pd.Index(atr_beyannames).isin(supplier_beyannames)]
         
         # En az 5 beyanname seç
         sample_size = min(5, len(atr_supplier_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(atr_supplier_beyannames, sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "A.TR Dolaşım Belgesi ve Tedarikçi Beyanı içeren beyanname")
+            sampled_beyannames = self._pick(atr_supplier_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "A.TR Dolaşım Belgesi ve Tedarikçi Beyanı içeren beyanname")
     
     def _sample_by_set_classification(self):
         """Set halinde sınıflandırılan eşyaları seçer"""
-        # Miktar birimi ve açıklama sütunlarını bul
-        quantity_columns = ["Miktar_birimi", "Olcu_birimi"]
-        description_columns = ["Aciklama", "Ticari_tanimi", "Esya_tanimi"]
-        
-        # Uygun sütunları belirleme
-        quantity_column = None
-        for col in quantity_columns:
-            if col in self.df.columns:
-                quantity_column = col
-                break
-        
-        description_cols = []
-        for col in description_columns:
-            if col in self.df.columns:
-                description_cols.append(col)
-        
-        set_beyannames = []
-        
-        # Miktar birimi "set" olanları kontrol et
-        if quantity_column:
-            set_quantity_beyannames = self.df[self.df[quantity_column].str.lower().str.contains("set", na=False)]['Beyanname_no'].unique()
-            set_beyannames.extend(set_quantity_beyannames)
+        # Miktar birimi ve açıklama sütunları set_dataframe'de belirlendi
+        quantity_column = self._quantity_column
+        description_cols = self._description_cols
         
-        # Açıklamalarda "set" içerenleri kontrol et
-        for col in description_cols:
-            if pd.api.types.is_string_dtype(self.df[col]):
-                set_description_beyannames = self.df[self.df[col].str.lower().str.contains("set", na=False)]['Beyanname_no'].unique()
-                set_beyannames.extend(set_description_beyannames)
+        # Miktar birimi ve açıklama sütunlarındaki "set" eşleşmeleri tek maskede birleştirilir
+        text_columns = [quantity_column] if quantity_column else []
+        text_columns += [col for col in description_cols if self._is_string_column(col)]
         
-        # Benzersiz beyannameleri al
-        set_beyannames = list(set(set_beyannames))
+        # Düz metin araması regex derlemeden çalışır
+        set_beyannames = self._beyannames_where_any(
+            self._text_contains(col, "set", regex=False) for col in text_columns)
         
         # En az 5 beyanname seç
         sample_size = min(5, len(set_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(set_beyannames, sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "Set halinde sınıflandırılan eşya")
+            sampled_beyannames = self._pick(set_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "Set halinde sınıflandırılan eşya")
     
     def _sample_by_supplier_origin_declaration(self):
         """Tedarikçi beyanı/menşe beyanı olan beyannameleri seçer (0876 veya 0842 kodları)"""
         # Doküman kod sütunlarını bul
-        doc_code_columns = []
-        for col in self.df.columns:
-            if "dokuman" in col.lower() and "kod" in col.lower():
-                doc_code_columns.append(col)
+        doc_code_columns = self._doc_code_columns()
         
         if not doc_code_columns:
             return
         
         # Tedarikçi beyanı ve menşe beyanı kodları
-        declaration_codes = ['0876', '0842']
-        
-        declaration_beyannames = []
+        declaration_codes = _DECLARATION_CODES
         
-        # Her bir doküman kod sütununu kontrol et
-        for col in doc_code_columns:
-            for code in declaration_codes:
-                matching_beyannames = self.df[self.df[col] == code]['Beyanname_no'].unique()
-                declaration_beyannames.extend(matching_beyannames)
-        
-        # Benzersiz beyannameleri al
-        declaration_beyannames = list(set(declaration_beyannames))
+        # Herhangi bir doküman kod sütununda bu kodlardan biri geçen benzersiz beyannameler
+        declaration_beyannames = _concat_unique(
+            list(self._doc_code_beyannames(declaration_codes).values()))
         
         # En az 5 beyanname seç
         sample_size = min(5, len(declaration_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(declaration_beyannames, sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "Tedarikçi beyanı/menşe beyanı olan beyanname")
+            sampled_beyannames = self._pick(declaration_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "Tedarikçi beyanı/menşe beyanı olan beyanname")
     
     def _sample_by_special_purpose_exemption(self):
         """Belirli amaç/nihai kullanım için indirimli veya sıfır vergi oranı (muafiyet "nkul", "nkul1", "nkul2" içerenler)"""
-        exemption_columns = ["Muafiyet_kodu", "Muafiyet", "Muafiyet1", "Muafiyet2"]
-        
-        # Uygun sütunu belirle
-        exemption_column = None
-        for col in exemption_columns:
-            if col in self.df.columns:
-                exemption_column = col
-                break
+        # Uygun sütun set_dataframe'de belirlendi
+        exemption_column = self._exemption_column
         
         if not exemption_column:
             return
         
         # "nkul" içeren beyannameleri bul
         nkul_beyannames = []
-        if pd.api.types.is_string_dtype(self.df[exemption_column]):
-            nkul_beyannames = self.df[self.df[exemption_column].str.lower().str.contains("nkul", na=False)]['Beyanname_no'].unique()
+        if self._is_string_column(exemption_column):
+            nkul_beyannames = self._beyannames_where(self._text_contains(exemption_column, "nkul"))
         
         # En az 5 beyanname seç
         sample_size = min(5, len(nkul_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(list(nkul_beyannames), sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "Belirli amaç/nihai kullanım için indirimli/sıfır vergi oranlı beyanname")
+            sampled_beyannames = self._pick(nkul_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "Belirli amaç/nihai kullanım için indirimli/sıfır vergi oranlı beyanname")
     
     def _sample_by_inward_outward_processing(self):
         """Dahilde veya Hariçte İşleme Rejimi beyannameleri (rejim kodu 5100, 5171, 2100)"""
@@ -831,22 +1428,14 @@ class BeyannameSampling:
         # Dahilde/Hariçte İşleme Rejimi kodları
         processing_codes = ['5100', '5171', '2100']
         
-        processing_beyannames = []
-        
-        # Her bir rejim kodunu kontrol et
-        for code in processing_codes:
-            matching_beyannames = self.df[self.df['Rejim'] == code]['Beyanname_no'].unique()
-            processing_beyannames.extend(matching_beyannames)
-        
-        # Benzersiz beyannameleri al
-        processing_beyannames = list(set(processing_beyannames))
+        # Bu rejim kodlarından birini taşıyan benzersiz beyannameler (tek isin geçişi)
+        processing_beyannames = self._beyannames_where(self.df['Rejim'].isin(processing_codes))
         
         # En az 5 beyanname seç
         sample_size = min(5, len(processing_beyannames))
         if sample_size > 0:
-            sampled_beyannames = random.sample(processing_beyannames, sample_size)
-            for beyanname_no in sampled_beyannames:
-                self._add_selection_reason(beyanname_no, "Dahilde/Hariçte İşleme Rejimi beyannamesi")
+            sampled_beyannames = self._pick(processing_beyannames, sample_size)
+            self._add_selection_reasons(sampled_beyannames, "Dahilde/Hariçte İşleme Rejimi beyannamesi")
     
     def _random_sampling_to_target(self, target_sample_count):
         """
@@ -858,12 +1447,18 @@ class BeyannameSampling:
         if self.df is None or self.unique_beyanname_df is None:
             raise ValueError("Veri yüklenmemiş veya benzersiz beyannameler oluşturulmamış")
         
-        # Hedef sayıya ulaşana kadar rastgele ek beyannameler seç
-        while len(self.selected_beyannames) < target_sample_count:
-            remaining_beyannames = self.unique_beyanname_df[~self.unique_beyanname_df['Beyanname_no'].isin(self.selected_beyannames)]['Beyanname_no'].unique()
-            if len(remaining_beyannames) > 0:
-                selected_beyanname = random.choice(remaining_beyannames)
-                self._add_selection_reason(selected_beyanname, "Rastgele örnekleme")
+        # unique_beyanname_df zaten beyanname başına tek satır içerir; yeniden unique gerekmez
+        beyanname_column = self.unique_beyanname_df['Beyanname_no']
+        beyanname_values = beyanname_column.to_numpy()
+        
+        missing_count = target_sample_count - len(self.selected_beyannames)
+        if missing_count <= 0:
+            return
+        
+        # Seçilmemiş beyannameler bir kez bulunur ve eksik sayı kadarı tek seferde tekrarsız çekilir
+        remaining_beyannames = beyanname_values[~beyanname_column.isin(self._selected_array()).to_numpy()]
+        sampled_beyannames = self._pick(remaining_beyannames, missing_count)
+        self._add_selection_reasons(sampled_beyannames, "Rastgele örnekleme")
     
     def _prepare_results_dataframe(self):
         """
@@ -876,25 +1471,28 @@ class BeyannameSampling:
             raise ValueError("Veri yüklenmemiş veya benzersiz beyannameler oluşturulmamış")
         
         # Seçilen beyannamelerin benzersiz DataFrame'ini hazırla
-        selected_unique_df = self.unique_beyanname_df[self.unique_beyanname_df['Beyanname_no'].isin(self.selected_beyannames)]
+        selected_unique_df = self._selected_rows()
         
-        # Seçim nedenlerini DataFrame olarak hazırla
-        reasons_df = pd.DataFrame({
-            'Beyanname_no': list(self.selection_reasons.keys()),
-            'Seçim_Nedenleri': [', '.join(reasons) for reasons in self.selection_reasons.values()]
-        })
+        # Seçim nedenlerini beyanname numarası dizinli Series olarak hazırla (anahtarlar ve nedenler
+        # aynı sırada; map ile birleştirme groupby(...).agg(', '.join) yolundan belirgin biçimde hızlıdır)
+        reasons = pd.Series(list(map(', '.join, self.selection_reasons.values())),
+                            index=pd.Index(self._selected_array(), name='Beyanname_no'),
+                            name='Seçim_Nedenleri')
         
-        # Seçilen beyannameler ve nedenlerini birleştir
-        results_df = pd.merge(selected_unique_df, reasons_df, on='Beyanname_no', how='left')
+        # Seçilen beyannameler ve nedenlerini dizin üzerinden birleştir (merge anahtar tablosu kurulmaz)
+        results_df = self._with_object_columns(selected_unique_df).join(reasons, on='Beyanname_no')
+        results_df = results_df.reset_index(drop=True)
         
         return results_df
     
-    def export_to_excel(self, output_path=None):
+    def export_to_excel(self, output_path=None, progress_callback=None, cancel_event=None):
         """
         Örnekleme sonuçlarını Excel dosyasına aktarır
         
         Args:
             output_path (str, optional): Excel dosyasının kaydedileceği yol. Belirtilmezse, geçerli tarih ile oluşturulur.
+            progress_callback (callable, optional): (yazılan satır, toplam satır) ile çağrılan ilerleme fonksiyonu
+            cancel_event (threading.Event, optional): Ayarlandığında yazma durdurulur ve ExportCancelled fırlatılır
         
         Returns:
             str: Oluşturulan Excel dosyasının yolu
@@ -907,8 +1505,6 @@ class BeyannameSampling:
             current_date = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"Beyanname_Ornekleme_{current_date}.xlsx"
         
-        writer = None
-        
         try:
             # Dosyanın yaratılabilir olduğunu kontrol et
             with open(output_path, 'a') as test_file:
@@ -925,7 +1521,7 @@ class BeyannameSampling:
             
             # Tarih sütununu bul
             date_column = None
-            for col in self.unique_beyanname_df.columns:
+            for col in self.df.columns:
                 if 'tarih' in col.lower() or 'tescil' in col.lower():
                     date_column = col
                     essential_columns.append(col)
@@ -937,25 +1533,29 @@ class BeyannameSampling:
                             'Brut_agirlik', 'Net_agirlik']
             
             for col in useful_columns:
-                if col in self.unique_beyanname_df.columns and col not in essential_columns:
+                if col in self.df.columns and col not in essential_columns:
                     essential_columns.append(col)
             
             # Optimize edilmiş veri seti oluştur
-            needed_columns = [col for col in essential_columns if col in self.unique_beyanname_df.columns]
+            needed_columns = [col for col in essential_columns if col in self.df.columns]
             if not needed_columns:
                 needed_columns = ['Beyanname_no']  # En azından beyanname numarası kesin olmalı
             
             try:
-                # Veri kopyasını al ve filtrele
-                selected_df_copy = self.unique_beyanname_df[needed_columns].copy()
-                selected_unique_df = selected_df_copy[selected_df_copy['Beyanname_no'].isin(self.selected_beyannames)]
+                # Sadece seçilen satırları konumlarına göre al (tüm tablo kopyalanmaz)
+                selected_unique_df = self._with_object_columns(self._selected_rows(needed_columns))
                 
                 # Veriyi temizle
                 selected_unique_df = selected_unique_df.fillna('')  # NaN değerleri temizle
                 
-                # Optimize etmek için kategorik sütunları dönüştür
+                # Optimize etmek için tekrarlı değerleri çok olan sütunları kategorik yap; değerleri
+                # çoğunlukla benzersiz sütunlarda (isim, açıklama) kategori yalnızca maliyet ekler
+                row_count = max(len(selected_unique_df), 1)
                 for col in selected_unique_df.columns:
-                    if selected_unique_df[col].dtype == object:
+                    series = selected_unique_df[col]
+                    # pandas 3 metin sütunlarını object yerine str tipinde okur; ikisi de dönüştürülür
+                    if ((pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series))
+                            and series.nunique() / row_count < 0.5):
                         try:
                             selected_unique_df[col] = selected_unique_df[col].astype('category')
                         except:
@@ -963,85 +1563,63 @@ class BeyannameSampling:
             except Exception as e:
                 print(f"Veri hazırlama hatası: {str(e)}")
                 # Fallback: En azından beyanname numaralarını içeren DF oluştur
-                selected_unique_df = pd.DataFrame({'Beyanname_no': list(self.selected_beyannames)})
+                selected_unique_df = pd.DataFrame({'Beyanname_no': self._selected_array()})
             
-            # Seçilen beyannameleri ve nedenlerini DataFrame olarak hazırla
-            summary_data = []
-            for beyanname_no in self.selected_beyannames:
-                # Beyanname numarasına sahip kayıt var mı kontrol et
-                matching_rows = selected_unique_df[selected_unique_df['Beyanname_no'] == beyanname_no]
-                if matching_rows.empty:
-                    continue
-                
-                # Sadece gerekli bilgileri al
-                summary_row = {
-                    'Beyanname_no': beyanname_no,
-                    'Seçim_Nedenleri': ', '.join(self.selection_reasons.get(beyanname_no, []))
+            # Seçilen beyannameleri ve nedenlerini DataFrame olarak hazırla; satırlar beyanname
+            # numarası dizinine göre tek seferde eşlenir (beyanname başına tablo taraması yapılmaz)
+            summary_data = {}
+            try:
+                indexed_df = selected_unique_df.drop_duplicates('Beyanname_no').set_index('Beyanname_no')
+                summary_beyannames = self._selected_array()
+                summary_beyannames = summary_beyannames[pd.Index(summary_beyannames).isin(indexed_df.index)]
+                summary_data = {
+                    'Beyanname_no': summary_beyannames,
+                    'Seçim_Nedenleri': [', '.join(self.selection_reasons.get(beyanname_no, ()))
+                                        for beyanname_no in summary_beyannames]
                 }
                 
                 # Tarih bilgisi varsa ekle
-                if date_column and date_column in matching_rows.columns:
-                    summary_row['Tarih'] = matching_rows.iloc[0][date_column]
-                
-                summary_data.append(summary_row)
-            
-            # Excel Writer oluştur ve chunk boyutunu arttır
-            from openpyxl.utils.exceptions import IllegalCharacterError
-            
-            # Excel engine options
-            engine_kwargs = {
-                'options': {'strings_to_urls': False}  # Güvenlik için URL dönüşümünü devre dışı bırak
-            }
+                if date_column and date_column in indexed_df.columns:
+                    summary_data['Tarih'] = indexed_df[date_column].reindex(summary_beyannames).tolist()
+            except Exception as e:
+                print(f"Özet verisi hazırlama hatası: {str(e)}")
             
-            # Excel Writer'ı oluştur
-            writer = pd.ExcelWriter(output_path, engine='openpyxl', engine_kwargs=engine_kwargs)
+            # Sayfaları (sayfa adı, DataFrame) listesi olarak hazırla
+            sheets = []
             
-            # Özet bilgileri Excel'e yaz
+            # Özet bilgileri
             try:
                 summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Örnekleme Özeti', index=False)
             except Exception as e:
-                print(f"Özet sayfası yazma hatası: {str(e)}")
+                print(f"Özet sayfası hazırlama hatası: {str(e)}")
                 # Hata durumunda basitleştirilmiş veri oluştur
-                pd.DataFrame({'Beyanname_no': list(self.selected_beyannames)}).to_excel(
-                    writer, sheet_name='Örnekleme Özeti', index=False)
+                summary_df = pd.DataFrame({'Beyanname_no': self._selected_array()})
+            sheets.append(('Örnekleme Özeti', summary_df))
             
-            # Tam beyanname detaylarını Excel'e yaz
+            # Tam beyanname detayları
             try:
                 available_columns = [col for col in needed_columns if col in selected_unique_df.columns]
                 if available_columns:
-                    # İllegal karakterleri temizleme
+                    # İllegal karakterleri temizleme (yalnızca metin sütunları - object veya pandas 3
+                    # str tipi; tarih gibi değerler metne çevrilmez)
                     for col in available_columns:
-                        if selected_unique_df[col].dtype == object:
-                            selected_unique_df[col] = selected_unique_df[col].astype(str).apply(
-                                lambda x: ''.join([c for c in x if ord(c) < 65535]))
+                        if pd.api.types.is_string_dtype(selected_unique_df[col]):
+                            selected_unique_df[col] = selected_unique_df[col].astype(str).str.replace(
+                                _XLSX_UNSUPPORTED_CHARS, '', regex=True)
                     
-                    # Büyük veri için batching uygula (bellek optimizasyonu)
-                    if len(selected_unique_df) > 5000:
-                        # Veriyi parçalara ayırarak yaz
-                        chunk_size = 5000
-                        for i in range(0, len(selected_unique_df), chunk_size):
-                            chunk = selected_unique_df.iloc[i:i+chunk_size]
-                            if i == 0:
-                                # İlk chunk için yeni sayfa oluştur
-                                chunk[available_columns].to_excel(writer, sheet_name='Beyanname Detayları', index=False)
-                            else:
-                                # Diğer chunk'lar için ayrı sayfalar oluştur
-                                chunk[available_columns].to_excel(writer, sheet_name=f'Beyanname Detayları_{i//chunk_size+1}', index=False)
-                    else:
-                        # Normal boyuttaki veri için standart yazma
-                        selected_unique_df[available_columns].to_excel(writer, sheet_name='Beyanname Detayları', index=False)
+                    # Tüm satırlar tek sayfaya yazılır; _write_excel_sheets satırları akış halinde
+                    # yazdığından büyük verilerde sayfayı parçalara bölmeye gerek yoktur
+                    sheets.append(('Beyanname Detayları', selected_unique_df[available_columns]))
                 else:
                     # Sütun bulunamazsa en azından beyanname numaralarını yaz
-                    pd.DataFrame({'Beyanname_no': list(self.selected_beyannames)}).to_excel(
-                        writer, sheet_name='Beyanname Detayları', index=False)
+                    sheets.append(('Beyanname Detayları', pd.DataFrame({'Beyanname_no': self._selected_array()})))
             except Exception as e:
-                print(f"Detay sayfası yazma hatası: {str(e)}")
+                print(f"Detay sayfası hazırlama hatası: {str(e)}")
                 # Hata durumunda basitleştirilmiş veri oluştur
-                pd.DataFrame({'Beyanname_no': list(self.selected_beyannames)}).to_excel(
-                    writer, sheet_name='Beyanname Detayları', index=False)
+                sheets = [sheet for sheet in sheets if not sheet[0].startswith('Beyanname Detayları')]
+                sheets.append(('Beyanname Detayları', pd.DataFrame({'Beyanname_no': self._selected_array()})))
             
-            # İstatistik bilgilerini Excel'e yaz
+            # İstatistik bilgileri
             try:
                 stats_df = pd.DataFrame({
                     'İstatistik': ['Toplam Beyanname Sayısı', 'Seçilen Beyanname Sayısı', 'Hedef Örnekleme Sayısı', 'Seçim Oranı (%)'],
@@ -1052,18 +1630,15 @@ class BeyannameSampling:
                         round(len(self.selected_beyannames) / max(self.sampling_stats.get('total_beyannames', 1), 1) * 100, 2)
                     ]
                 })
-                
-                stats_df.to_excel(writer, sheet_name='İstatistikler', index=False)
             except Exception as e:
-                print(f"İstatistik sayfası yazma hatası: {str(e)}")
+                print(f"İstatistik sayfası hazırlama hatası: {str(e)}")
                 # Basit istatistik sayfası oluştur
-                pd.DataFrame({'İstatistik': ['Seçilen Beyanname Sayısı'], 
-                             'Değer': [len(self.selected_beyannames)]}).to_excel(
-                                 writer, sheet_name='İstatistikler', index=False)
+                stats_df = pd.DataFrame({'İstatistik': ['Seçilen Beyanname Sayısı'], 
+                                         'Değer': [len(self.selected_beyannames)]})
+            sheets.append(('İstatistikler', stats_df))
             
-            # Excel'i kaydet
-            writer.close()
-            writer = None
+            # Excel'e yaz
+            self._write_excel_sheets(output_path, sheets, progress_callback, cancel_event=cancel_event)
             
             # Belleği temizle
             import gc
@@ -1072,51 +1647,250 @@ class BeyannameSampling:
             gc.collect()
             
             return output_path
+        
+        except ExportCancelled:
+            raise
             
         except Exception as e:
             import traceback
             print(f"Excel aktarma hatası: {str(e)}")
             print(traceback.format_exc())
             
-            # Writer nesnesi açık kaldıysa kapat
-            if writer is not None:
-                try:
-                    writer.close()
-                except:
-                    pass
-            
             raise ValueError(f"Excel oluşturulurken hata: {str(e)}")
         
         finally:
-            # Writer açık kalmış olabilir, temizlik yap
-            if writer is not None:
-                try:
-                    writer.close()
-                except:
-                    pass
-            
             # Belleği temizle
             import gc
             gc.collect()
     
-    def format_excel_report(self, output_path):
+    @staticmethod
+    def _write_only_header(worksheet, columns):
         """
-        Excel raporunu biçimlendirir
+        Write-only sayfa için başlık satırını WriteOnlyCell olarak oluşturur
+        
+        Tüm hücreler aynı Font/Alignment nesnelerini paylaşır; böylece openpyxl stil
+        tablosunda tek bir kayıt oluşur ve biçimlendirme adımı atlansa bile başlıklar okunur kalır.
+        """
+        cells = []
+        for col in columns:
+            cell = WriteOnlyCell(worksheet, value=str(col))
+            cell.font = _HEADER_FONT
+            cell.alignment = _HEADER_ALIGNMENT
+            cells.append(cell)
+        return cells
+    
+    @staticmethod
+    def _iter_sheet_rows(sheet_df, chunk_size=5000):
+        """
+        DataFrame satırlarını Python listeleri olarak üretir
+        
+        Satır başına Series/tuple kutulama yapmak yerine her parça tek bir NumPy
+        dönüşümüyle nesne dizisine, ardından tolist() ile listelere çevrilir.
+        Boş (NaN/None) değerler None olarak döner.
+        """
+        for start in range(0, len(sheet_df), chunk_size):
+            block = sheet_df.iloc[start:start + chunk_size].to_numpy(dtype=object, copy=True)
+            block[pd.isna(block)] = None
+            yield from block.tolist()
+    
+    def _write_excel_sheets(self, output_path, sheets, progress_callback=None, progress_step=2000, cancel_event=None):
+        """
+        Sayfaları Excel dosyasına satır satır akış halinde yazar
+        
+        Küçük çıktılarda kuruluysa en hızlı toplu yazıcı olan PyExcelerate kullanılır
+        (biçimlendirme format_excel_report ile sonradan yapılır). Aksi halde xlsxwriter
+        constant_memory modunda (rapor biçimi yazarken uygulanır), o da yoksa openpyxl'in
+        write-only modunda çalışılır; bu iki yolda satırlar diske akıtıldığı için
+        bellek kullanımı satır sayısından bağımsızdır ve her sayfa tek parça yazılır.
         
         Args:
             output_path (str): Excel dosyasının yolu
+            sheets (list): (sayfa adı, DataFrame) ikililerinden oluşan liste
+            progress_callback (callable, optional): (yazılan satır, toplam satır) ile çağrılır
+            progress_step (int): İlerleme bildirimleri arasındaki satır sayısı
+            cancel_event (threading.Event, optional): Her CANCEL_CHECK_ROWS satırda bir kontrol edilen iptal bayrağı
         """
-        # Zaman aşımı önlemi
-        import signal
+        total_rows = sum(len(sheet_df) for _, sheet_df in sheets)
+        written_rows = 0
+        self._formatted_report_path = None
+        
+        if total_rows > self.DIRECT_XLSX_ROW_THRESHOLD:
+            # Çok büyük çıktılarda hiçbir kütüphane katmanı kullanmadan yaz
+            self._fast_xlsx_dump(output_path, sheets, progress_callback, cancel_event=cancel_event)
+            return
         
-        # Timeout handler
-        def timeout_handler(signum, frame):
-            raise TimeoutError("Excel biçimlendirme işlemi zaman aşımına uğradı")
+        if pyexcelerate is not None and total_rows <= self.PYEXCELERATE_ROW_LIMIT:
+            # Her sayfayı tek seferde liste olarak oluşturup toplu yaz
+            workbook = pyexcelerate.Workbook()
+            for sheet_name, sheet_df in sheets:
+                data = [[str(col) for col in sheet_df.columns]]
+                # NumPy -> liste dönüşümünü parça parça yap, arada ilerleme bildir
+                for start in range(0, len(sheet_df), progress_step):
+                    chunk = sheet_df.iloc[start:start + progress_step].astype(object)
+                    data.extend(chunk.where(chunk.notna(), None).to_numpy().tolist())
+                    written_rows += len(chunk)
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ExportCancelled()
+                    if progress_callback:
+                        progress_callback(written_rows, total_rows)
+                workbook.new_sheet(sheet_name, data=data)
+            workbook.save(output_path)
+            if progress_callback:
+                progress_callback(total_rows, total_rows)
+            return
         
-        # 30 saniye timeout ayarla
-        old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(30)  # 30 saniye
+        if xlsxwriter is None:
+            # xlsxwriter yoksa openpyxl write-only modu ile yaz
+            workbook = Workbook(write_only=True)
+            for sheet_name, sheet_df in sheets:
+                worksheet = workbook.create_sheet(sheet_name)
+                worksheet.append(self._write_only_header(worksheet, sheet_df.columns))
+                for values in self._iter_sheet_rows(sheet_df):
+                    worksheet.append(values)
+                    written_rows += 1
+                    if written_rows % self.CANCEL_CHECK_ROWS == 0 and cancel_event is not None and cancel_event.is_set():
+                        raise ExportCancelled()
+                    if progress_callback and written_rows % progress_step == 0:
+                        progress_callback(written_rows, total_rows)
+            workbook.save(output_path)
+            if progress_callback:
+                progress_callback(total_rows, total_rows)
+            return
         
+        workbook = xlsxwriter.Workbook(output_path, {
+            'constant_memory': True,
+            'strings_to_urls': False,  # Güvenlik için URL dönüşümünü devre dışı bırak
+            'nan_inf_to_errors': True
+        })
+        try:
+            for sheet_name, sheet_df in sheets:
+                worksheet = workbook.add_worksheet(sheet_name)
+                headers = [str(col) for col in sheet_df.columns]
+                
+                # Rapor biçimi yazarken uygulanır; dosyanın openpyxl ile yeniden açılıp
+                # hücre hücre biçimlendirilmesine gerek kalmaz
+                formats = _xlsxwriter_report_formats(workbook, sheet_name, len(headers))
+                styled_columns = 0
+                styled_rows = 0
+                if formats is not None:
+                    for col, width in formats['widths'].items():
+                        if col < len(headers):
+                            worksheet.set_column(col, col, width)
+                    worksheet.write_row(0, 0, headers, formats['header'])
+                    styled_columns = len(formats['body'])
+                    styled_rows = formats['max_row'] or len(sheet_df) + 1
+                else:
+                    worksheet.write_row(0, 0, headers)
+                
+                # constant_memory modunda satırlar sırayla yazılmalıdır
+                for row_idx, values in enumerate(self._iter_sheet_rows(sheet_df), start=1):
+                    if row_idx < styled_rows:
+                        # Excel satır numarası row_idx + 1; çift satırlar alternatif renkte
+                        row_formats = formats['alternate'] if row_idx % 2 else formats['body']
+                        for col in range(styled_columns):
+                            worksheet.write(row_idx, col, values[col], row_formats[col])
+                        if len(values) > styled_columns:
+                            worksheet.write_row(row_idx, styled_columns, values[styled_columns:])
+                    else:
+                        worksheet.write_row(row_idx, 0, values)
+                    written_rows += 1
+                    if written_rows % self.CANCEL_CHECK_ROWS == 0 and cancel_event is not None and cancel_event.is_set():
+                        raise ExportCancelled()
+                    if progress_callback and written_rows % progress_step == 0:
+                        progress_callback(written_rows, total_rows)
+        finally:
+            workbook.close()
+        self._formatted_report_path = output_path
+        if progress_callback:
+            progress_callback(total_rows, total_rows)
+    
+    def _fast_xlsx_dump(self, output_path, sheets, progress_callback=None, cancel_event=None):
+        """
+        Sayfa XML'lerini metin olarak doğrudan .xlsx (ZIP) arşivine akıtır
+        
+        Hücre nesnesi veya XML ağacı oluşturulmaz. Metinler satır içi (inlineStr)
+        yazıldığından paylaşılan metin tablosuna gerek kalmaz; sayısal sütunlar
+        <v> değeri olarak yazılır. Hız pratikte ZIP sıkıştırmasıyla sınırlıdır.
+        
+        Args:
+            output_path (str): Excel dosyasının yolu
+            sheets (list): (sayfa adı, DataFrame) ikililerinden oluşan liste
+            progress_callback (callable, optional): (yazılan satır, toplam satır) ile her blokta çağrılır
+            cancel_event (threading.Event, optional): Her blokta kontrol edilen iptal bayrağı
+        """
+        total_rows = sum(len(sheet_df) for _, sheet_df in sheets)
+        written_rows = 0
+        
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for sheet_idx, (sheet_name, sheet_df) in enumerate(sheets, start=1):
+                letters = [get_column_letter(i) for i in range(1, len(sheet_df.columns) + 1)]
+                numeric_flags = [pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                                 for dtype in sheet_df.dtypes]
+                
+                with zf.open(f'xl/worksheets/sheet{sheet_idx}.xml', 'w', force_zip64=True) as f:
+                    f.write(_XLSX_SHEET_HEADER.encode('utf-8'))
+                    header_cells = ''.join(_xlsx_text_cell(f'{letter}1', col)
+                                           for letter, col in zip(letters, sheet_df.columns))
+                    f.write(f'<row r="1">{header_cells}</row>'.encode('utf-8'))
+                    
+                    for block_rows, block_xml in self._iter_xlsx_row_blocks(sheet_df, letters, numeric_flags):
+                        f.write(block_xml)
+                        written_rows += block_rows
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise ExportCancelled()
+                        if progress_callback:
+                            progress_callback(written_rows, total_rows)
+                    
+                    f.write(_XLSX_SHEET_FOOTER.encode('utf-8'))
+            
+            # Sabit paket parçaları
+            write_xlsx_package_parts(zf, [sheet_name for sheet_name, _ in sheets])
+        
+        if progress_callback:
+            progress_callback(total_rows, total_rows)
+    
+    def _iter_xlsx_row_blocks(self, sheet_df, letters, numeric_flags):
+        """
+        Sayfa satırlarını (satır sayısı, <row> XML baytları) blokları halinde üretir
+        
+        PARALLEL_XLSX_ROW_THRESHOLD üzerindeki sayfalar çekirdek sayısı kadar ardışık
+        satır aralığına bölünür ve GIL'e takılmamak için süreç havuzunda işlenir; satır
+        numaraları önceden ayrıldığından bloklar sırayla tek sayfaya eklenebilir.
+        Diğer sayfalar CANCEL_CHECK_ROWS satırlık bloklar halinde bu thread'de üretilir.
+        """
+        row_count = len(sheet_df)
+        workers = os.cpu_count() or 1
+        
+        if row_count > self.PARALLEL_XLSX_ROW_THRESHOLD and workers > 1:
+            chunk_size = -(-row_count // workers)  # Yukarı yuvarlanmış bölme
+            starts = list(range(0, row_count, chunk_size))
+            chunks = [sheet_df.iloc[start:start + chunk_size] for start in starts]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map sonuçları gönderim sırasıyla döndürür
+                blocks = executor.map(_render_xlsx_rows, chunks, repeat(letters), repeat(numeric_flags),
+                                      [start + 2 for start in starts])
+                for chunk, block_xml in zip(chunks, blocks):
+                    yield len(chunk), block_xml
+            return
+        
+        block_size = self.CANCEL_CHECK_ROWS
+        for start in range(0, row_count, block_size):
+            chunk = sheet_df.iloc[start:start + block_size]
+            yield len(chunk), _render_xlsx_rows(chunk, letters, numeric_flags, start + 2)
+    
+    def format_excel_report(self, output_path):
+        """
+        Excel raporunu biçimlendirir
+        
+        Args:
+            output_path (str): Excel dosyasının yolu
+        """
+        # xlsxwriter yolu biçimi yazarken uyguladıysa dosyayı yeniden açmaya gerek yok
+        if output_path is not None and output_path == self._formatted_report_path:
+            return
+        
+        # İş en fazla 1000 satır/20 sütunla sınırlı ve hücre başına tek stil ataması yapıldığından
+        # zaman aşımı sinyali gerekmez (SIGALRM Windows'ta ve ana iş parçacığı dışında çalışmaz)
         wb = None
         
         try:
@@ -1124,24 +1898,13 @@ class BeyannameSampling:
             from openpyxl import load_workbook
             wb = load_workbook(output_path)
             
+            _add_report_styles(wb)
+            
             # Özet sayfasını biçimlendir
             if 'Örnekleme Özeti' in wb.sheetnames:
                 ws = wb['Örnekleme Özeti']
                 
                 if ws.max_row > 0:  # Sayfada veri olduğunu kontrol et
-                    # Başlıkları biçimlendir
-                    header_font = Font(bold=True, color="FFFFFF")
-                    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                    header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                    
-                    # Tüm hücreler için temel stiller
-                    default_font = Font(name='Calibri', size=11)
-                    
-                    for cell in ws[1]:
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = header_alignment
-                    
                     # Sütun genişliklerini ayarla
                     ws.column_dimensions['A'].width = 20  # Beyanname No
                     if 'B' in ws.column_dimensions:
@@ -1149,29 +1912,9 @@ class BeyannameSampling:
                     if 'C' in ws.column_dimensions:
                         ws.column_dimensions['C'].width = 60  # Seçim Nedenleri
                     
-                    # Tüm hücreler için kenarlık ayarla
-                    thin_border = Border(left=Side(style='thin'), 
-                                        right=Side(style='thin'), 
-                                        top=Side(style='thin'), 
-                                        bottom=Side(style='thin'))
-                    
-                    # Satır sayısını kontrol et ve sınırla
-                    max_rows_to_format = min(ws.max_row, 1000)  # En fazla 1000 satır biçimlendir
-                    
-                    for row in ws.iter_rows(min_row=1, max_row=max_rows_to_format, min_col=1, max_col=min(3, ws.max_column)):
-                        for cell in row:
-                            cell.border = thin_border
-                            if row[0].row > 1:  # Başlık satırı değilse
-                                cell.font = default_font
-                    
-                    # Alternatif satır renklendirme
-                    alternate_fill = PatternFill(start_color="E9EDF4", end_color="E9EDF4", fill_type="solid")
-                    for row_idx in range(2, max_rows_to_format + 1):
-                        if row_idx % 2 == 0:  # Çift satırlar
-                            for col_idx in range(1, min(4, ws.max_column + 1)):
-                                if col_idx <= ws.max_column:  # Sütun sınırlarını kontrol et
-                                    cell = ws.cell(row=row_idx, column=col_idx)
-                                    cell.fill = alternate_fill
+                    # Başlık, kenarlık ve alternatif satır renklendirme (en fazla 1000 satır)
+                    _style_rows(ws, min(ws.max_row, 1000), min(3, ws.max_column),
+                                'ozet_baslik', 'ozet_satir', 'ozet_satir_alt')
             
             # Detay sayfasını biçimlendir
             for sheet_name in wb.sheetnames:
@@ -1179,74 +1922,28 @@ class BeyannameSampling:
                     ws = wb[sheet_name]
                     
                     if ws.max_row > 0:  # Sayfada veri olduğunu kontrol et
-                        # Başlıkları biçimlendir
-                        header_font = Font(bold=True, color="FFFFFF")
-                        header_fill = PatternFill(start_color="5B9BD5", end_color="5B9BD5", fill_type="solid")
-                        header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                        
-                        for cell in ws[1]:
-                            cell.font = header_font
-                            cell.fill = header_fill
-                            cell.alignment = header_alignment
-                        
                         # Sütun genişliklerini otomatik ayarla (ilk 10 sütun için)
                         for col_idx in range(1, min(11, ws.max_column + 1)):
-                            col_letter = ws.cell(row=1, column=col_idx).column_letter
-                            ws.column_dimensions[col_letter].width = 15
-                        
-                        # Tüm hücreler için kenarlık ayarla
-                        thin_border = Border(left=Side(style='thin'), 
-                                            right=Side(style='thin'), 
-                                            top=Side(style='thin'), 
-                                            bottom=Side(style='thin'))
-                        
-                        # Satır sayısını kontrol et ve sınırla
-                        max_rows_to_format = min(ws.max_row, 1000)  # En fazla 1000 satır biçimlendir
-                        max_cols_to_format = min(ws.max_column, 20)  # En fazla 20 sütun biçimlendir
+                            ws.column_dimensions[get_column_letter(col_idx)].width = 15
                         
-                        for row in ws.iter_rows(min_row=1, max_row=max_rows_to_format, min_col=1, max_col=max_cols_to_format):
-                            for cell in row:
-                                cell.border = thin_border
-                        
-                        # Alternatif satır renklendirme
-                        alternate_fill = PatternFill(start_color="DEEBF7", end_color="DEEBF7", fill_type="solid")
-                        for row_idx in range(2, max_rows_to_format + 1):
-                            if row_idx % 2 == 0:  # Çift satırlar
-                                for col_idx in range(1, max_cols_to_format + 1):
-                                    cell = ws.cell(row=row_idx, column=col_idx)
-                                    cell.fill = alternate_fill
+                        # Başlık, kenarlık ve alternatif satır renklendirme (en fazla 1000 satır, 20 sütun)
+                        _style_rows(ws, min(ws.max_row, 1000), min(ws.max_column, 20),
+                                    'detay_baslik', 'detay_satir', 'detay_satir_alt')
             
             # İstatistik sayfasını biçimlendir
             if 'İstatistikler' in wb.sheetnames:
                 ws = wb['İstatistikler']
                 
                 if ws.max_row > 0:  # Sayfada veri olduğunu kontrol et
-                    # Başlıkları biçimlendir
-                    header_font = Font(bold=True, color="FFFFFF")
-                    header_fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-                    header_alignment = Alignment(horizontal='center', vertical='center')
-                    
-                    for cell in ws[1]:
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = header_alignment
-                    
                     # Sütun genişliklerini ayarla
                     ws.column_dimensions['A'].width = 25  # İstatistik
                     if 'B' in ws.column_dimensions:
                         ws.column_dimensions['B'].width = 15  # Değer
                     
-                    # Tüm hücreler için kenarlık ve hizalama ayarla
-                    thin_border = Border(left=Side(style='thin'), 
-                                        right=Side(style='thin'), 
-                                        top=Side(style='thin'), 
-                                        bottom=Side(style='thin'))
-                    
-                    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=min(2, ws.max_column)):
-                        for cell in row:
-                            cell.border = thin_border
-                            if cell.column == 2:  # Değer sütunu
-                                cell.alignment = Alignment(horizontal='center')
+                    _style_rows(ws, ws.max_row, min(2, ws.max_column), 'istatistik_baslik', 'istatistik_satir')
+                    # Değer sütunu ortalanır
+                    for (cell,) in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=2, max_col=2):
+                        cell.style = 'istatistik_deger'
             
             # Dosyayı kaydet
             wb.save(output_path)
@@ -1256,10 +1953,6 @@ class BeyannameSampling:
             import gc
             gc.collect()
             
-        except TimeoutError as e:
-            print(f"Excel biçimlendirme zaman aşımı: {str(e)}")
-            # Zaman aşımı durumunda biçimlendirmeyi atla ama Excel dosyası hala kullanılabilir
-            
         except Exception as e:
             import traceback
             print(f"Excel biçimlendirme hatası: {str(e)}")
@@ -1267,10 +1960,6 @@ class BeyannameSampling:
             # Hata olsa bile rapor oluşturuldu, sadece biçimlendirme yapılamadı
             
         finally:
-            # Timeout'u sıfırla
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, old_handler)
-            
             # Workbook nesnesi açık kaldıysa kapat
             if wb is not None:
                 try:
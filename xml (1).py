@@ -1,8 +1,103 @@
 import csv
 import os
+import heapq
 import re
 import html
-import glob
+import mmap
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from sys import intern
+
+# İsteğe bağlı kütüphaneler modül yüklenirken bir kez içe aktarılır. xlsxwriter
+# yoksa Excel çıktısı atlanır, TXT çıktısı yine oluşturulur; pandas yalnızca
+# oluşturulan Excel dosyasının içeriğini, lxml ise analyze_xml için gerekir.
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    import xlsxwriter
+    from xlsxwriter.exceptions import FileCreateError
+except ImportError:
+    xlsxwriter = None
+
+# Düzenli ifadeler modül yüklenirken bir kez derlenir. Dosya mmap ile bayt olarak
+# tarandığı için desenler de bayttır; yalnızca eşleşen değerler metne çevrilir.
+_TAG_RE = re.compile(rb'<([^/\s>]+)>([^<]+)</\1>')
+_BEYANNAME_RE = re.compile(rb'<BeyannameBilgi[^>]*>(.*?)</BeyannameBilgi>', re.DOTALL)
+_KALEM_RE = re.compile(rb'<kalem>(.*?)</kalem>', re.DOTALL)
+_DOKUMANLAR_RE = re.compile(rb'<Dokumanlar>(.*?)</Dokumanlar>', re.DOTALL)
+_DOKUMAN_RE = re.compile(rb'<Dokuman>(.*?)</Dokuman>', re.DOTALL)
+_SORULAR_RE = re.compile(rb'<Sorular_cevaplar>(.*?)</Sorular_cevaplar>', re.DOTALL)
+_SORU_CEVAP_RE = re.compile(rb'<Soru_Cevap>(.*?)</Soru_Cevap>', re.DOTALL)
+_VERGILER_RE = re.compile(rb'<Vergiler>(.*?)</Vergiler>', re.DOTALL)
+_VERGI_RE = re.compile(rb'<Vergi>(.*?)</Vergi>', re.DOTALL)
+
+# Bu uzunluğa kadar olan etiket değerleri intern edilir
+INTERN_MAX_LENGTH = 8
+
+# TXT çıktısının dosya tamponu (bayt)
+TXT_BUFFER_SIZE = 1 << 20
+
+def _read_sections(xml_file):
+    """
+    XML dosyasının tamamını belleğe okumadan mmap ile açar ve BeyannameBilgi,
+    kalem ve liste bloklarını bayt olarak ayırır.
+    
+    return: (beyanname_xml, kalem_matches, dokumanlar_xml, sorular_xml, vergiler_xml)
+            Bulunamayan bloklar None, kalem_matches liste olarak döner.
+    """
+    with open(xml_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, [], None, None, None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            sections = []
+            for pattern in (_BEYANNAME_RE, _DOKUMANLAR_RE, _SORULAR_RE, _VERGILER_RE):
+                match = pattern.search(content)
+                sections.append(match.group(1) if match else None)
+            kalem_matches = _KALEM_RE.findall(content)
+    
+    beyanname_xml, dokumanlar_xml, sorular_xml, vergiler_xml = sections
+    return beyanname_xml, kalem_matches, dokumanlar_xml, sorular_xml, vergiler_xml
+
+def _decode(raw):
+    """
+    Bayt olarak eşleşen etiket adı veya değerini UTF-8 metne çevirir.
+    Satır sonları, dosyanın metin kipinde okunduğu haliyle \\n'e dönüştürülür.
+    """
+    text = raw.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def _decoded_tags(xml_part):
+    """
+    Bayt halindeki XML parçasındaki basit etiketleri (etiket, değer) metin çiftleri olarak
+    sırayla üretir. Eşleşmeler liste halinde biriktirilmez. Her kalemde tekrarlanan
+    etiket adları ve kısa kod değerleri intern edilerek tek nesneyi paylaşır.
+    """
+    for match in _TAG_RE.finditer(xml_part):
+        value = _decode(match.group(2))
+        if len(value) <= INTERN_MAX_LENGTH:
+            value = intern(value)
+        yield intern(_decode(match.group(1))), value
+
+def _column_sort_key(col):
+    """
+    Dokuman_/SoruCevap_/Vergi_ sütunlarını sıra numarasına göre sıralayan anahtar.
+    Dokuman_10_Kod, Dokuman_2_Kod'dan sonra gelir; numarasız adlar (ör. Vergi_matrahi)
+    grubun sonunda alfabetik sıralanır.
+    """
+    parts = col.split("_", 2)
+    if len(parts) == 3 and parts[1].isdecimal():
+        return (0, int(parts[1]), parts[2])
+    return (1, 0, col)
 
 def extract_beyanname_fixed(xml_file, output_dir=None):
     """
@@ -20,100 +115,69 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
     xml_filename = os.path.basename(xml_file)
     xml_name_without_ext = os.path.splitext(xml_filename)[0]
     
-    # XML dosyasını oku
-    with open(xml_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # XML dosyasını bölümlerine ayır
+    beyanname_xml, kalem_matches, dokumanlar_xml, sorular_xml, vergiler_xml = _read_sections(xml_file)
 
     # Beyanname bilgilerini çıkar
-    beyanname_bilgi_pattern = r'<BeyannameBilgi[^>]*>(.*?)</BeyannameBilgi>'
-    beyanname_match = re.search(beyanname_bilgi_pattern, content, re.DOTALL)
-    
     beyanname_data = {}
-    if beyanname_match:
-        beyanname_xml = beyanname_match.group(1)
+    if beyanname_xml is not None:
         # Tüm etiketleri bul
-        tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-        tag_matches = re.findall(tag_pattern, beyanname_xml)
+        tag_matches = _decoded_tags(beyanname_xml)
         
         # Beyanname bilgilerini ayıklama
         for tag, value in tag_matches:
             if tag != 'kalem' and tag != 'firma' and tag != 'Ozetbeyan':
-                # Metni temizle - Excel'de sorun çıkarabilecek karakterleri düzelt
-                value = value.strip().replace('"', '""')
+                # Metni temizle - tırnak kaçışını csv yazıcısı kendisi yapar
+                value = value.strip()
                 beyanname_data[tag] = value
     
-    # Kalem bilgilerini çıkar
-    kalem_pattern = r'<kalem>(.*?)</kalem>'
-    kalem_matches = re.findall(kalem_pattern, content, re.DOTALL)
-    
     # Dokumanlar bilgilerini çıkar - yeni format için doğrudan dokuman listesi olarak saklayalım
     dokuman_list = []
-    dokuman_pattern = r'<Dokumanlar>(.*?)</Dokumanlar>'
-    dokumanlar_match = re.search(dokuman_pattern, content, re.DOTALL)
-    
-    if dokumanlar_match:
-        dokumanlar_xml = dokumanlar_match.group(1)
+    if dokumanlar_xml is not None:
         # Her bir Dokuman etiketini bul
-        dokuman_pattern = r'<Dokuman>(.*?)</Dokuman>'
-        dokuman_matches = re.findall(dokuman_pattern, dokumanlar_xml, re.DOTALL)
-        
-        for dokuman_xml in dokuman_matches:
+        for dokuman_match in _DOKUMAN_RE.finditer(dokumanlar_xml):
+            dokuman_xml = dokuman_match.group(1)
             # Dokuman içindeki tüm etiketleri bul
-            tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-            tag_matches = re.findall(tag_pattern, dokuman_xml)
+            tag_matches = _decoded_tags(dokuman_xml)
             
             dokuman = {}
             # Temel değerleri çıkart
             for tag, value in tag_matches:
-                value = value.strip().replace('"', '""')
+                value = value.strip()
                 dokuman[tag] = value
             
             dokuman_list.append(dokuman)
     
     # Soru_Cevap bilgilerini çıkar - yeni format için doğrudan soru-cevap listesi olarak saklayalım
     soru_cevap_list = []
-    soru_cevap_pattern = r'<Sorular_cevaplar>(.*?)</Sorular_cevaplar>'
-    sorular_match = re.search(soru_cevap_pattern, content, re.DOTALL)
-    
-    if sorular_match:
-        sorular_xml = sorular_match.group(1)
+    if sorular_xml is not None:
         # Her bir Soru_Cevap etiketini bul
-        soru_cevap_pattern = r'<Soru_Cevap>(.*?)</Soru_Cevap>'
-        soru_cevap_matches = re.findall(soru_cevap_pattern, sorular_xml, re.DOTALL)
-        
-        for soru_cevap_xml in soru_cevap_matches:
+        for soru_cevap_match in _SORU_CEVAP_RE.finditer(sorular_xml):
+            soru_cevap_xml = soru_cevap_match.group(1)
             # Soru_Cevap içindeki tüm etiketleri bul
-            tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-            tag_matches = re.findall(tag_pattern, soru_cevap_xml)
+            tag_matches = _decoded_tags(soru_cevap_xml)
             
             soru_cevap = {}
             # Değerleri çıkart
             for tag, value in tag_matches:
-                value = value.strip().replace('"', '""')
+                value = value.strip()
                 soru_cevap[tag] = value
             
             soru_cevap_list.append(soru_cevap)
     
     # Vergiler bilgilerini çıkar - yeni format için doğrudan vergi listesi olarak saklayalım
     vergi_list = []
-    vergi_pattern = r'<Vergiler>(.*?)</Vergiler>'
-    vergiler_match = re.search(vergi_pattern, content, re.DOTALL)
-    
-    if vergiler_match:
-        vergiler_xml = vergiler_match.group(1)
+    if vergiler_xml is not None:
         # Her bir Vergi etiketini bul
-        vergi_pattern = r'<Vergi>(.*?)</Vergi>'
-        vergi_matches = re.findall(vergi_pattern, vergiler_xml, re.DOTALL)
-        
-        for vergi_xml in vergi_matches:
+        for vergi_match in _VERGI_RE.finditer(vergiler_xml):
+            vergi_xml = vergi_match.group(1)
             # Vergi içindeki tüm etiketleri bul
-            tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-            tag_matches = re.findall(tag_pattern, vergi_xml)
+            tag_matches = _decoded_tags(vergi_xml)
             
             vergi = {}
             # Değerleri çıkart
             for tag, value in tag_matches:
-                value = value.strip().replace('"', '""')
+                value = value.strip()
                 vergi[tag] = value
             
             vergi_list.append(vergi)
@@ -124,13 +188,12 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
         kalem = {"Kalem_No": str(i)}
         
         # Kalem içindeki tüm etiketleri bul
-        tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-        tag_matches = re.findall(tag_pattern, kalem_xml)
+        tag_matches = _decoded_tags(kalem_xml)
         
         # Kalem bilgilerini ayıklama
         for tag, value in tag_matches:
-            # Metni temizle - Excel'de sorun çıkarabilecek karakterleri düzelt
-            value = value.strip().replace('"', '""')
+            # Metni temizle - tırnak kaçışını csv yazıcısı kendisi yapar
+            value = value.strip()
             kalem[tag] = value
         
         # Beyanname verisinden üst bilgileri her kaleme ekle
@@ -141,21 +204,7 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
         
         kalem_data_list.append(kalem)
     
-    # Tablo formatındaki Excel için veri hazırlama
-    # Maksimum doküman, soru-cevap ve vergi sayılarını belirle
-    max_dokuman = len(dokuman_list)
-    max_soru_cevap = len(soru_cevap_list)
-    max_vergi = len(vergi_list)
-    
-    # Excel için sütun başlıklarını hazırla
-    columns = []
-    
-    # Kalem alanları (örneğin: Kalem_No, GTIP, vb)
-    if kalem_data_list:
-        for key in kalem_data_list[0].keys():
-            columns.append(key)
-    
-    # Dokuman alan başlıklarını ekle (her dokuman için setleri)
+    # Dokuman alan başlıkları (her dokuman için setleri)
     dokuman_columns = ["Kod", "Dogrulama", "Belge_tarihi", "Referans"]
     
     # Soru cevap alan başlıklarını ekle
@@ -164,140 +213,105 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
     # Vergi alan başlıklarını ekle
     vergi_columns = ["Kod", "Miktar", "Oran", "Odeme_sekli", "Vergi_matrahi"]
     
-    # Pandas DataFrame için veri listesi
+    # Doküman, soru-cevap ve vergileri Kalem_no'ya göre tek geçişte grupla; kalem döngüsünde
+    # her kalem için tüm listeler taranmaz. Soru-cevaplar liste sırasını korumak için indeksle
+    # tutulur, "0" kalem numaralı (tüm kalemlere ait) olanlar her kalemle sırasına göre birleştirilir.
+    dokuman_by_kalem = defaultdict(list)
+    for dok in dokuman_list:
+        dokuman_by_kalem[dok.get("Kalem_no")].append(dok)
+    
+    soru_cevap_by_kalem = defaultdict(list)
+    for idx, sc in enumerate(soru_cevap_list):
+        soru_cevap_by_kalem[sc.get("Kalem_no")].append(idx)
+    shared_soru_cevap = soru_cevap_by_kalem.get("0", [])
+    
+    vergi_by_kalem = defaultdict(list)
+    for vergi in vergi_list:
+        vergi_by_kalem[vergi.get("Kalem_no")].append(vergi)
+    
+    # Sütun adları oluşturuldukları anda gruplarına eklenir - sonradan satırlar taranmaz
+    kalem_col_set = set()
+    dokuman_col_set = set()
+    soru_cevap_col_set = set()
+    vergi_col_set = set()
+    
+    # Yazıcılar için satır listesi - kalem sözlüğü kopyalanmadan satır olarak genişletilir
     data_rows = []
     
     # Her kalemi işle
     for kalem in kalem_data_list:
         kalem_no = kalem["Kalem_No"]
-        
-        # Bu kalem için satır hazırla
-        row = dict(kalem)  # Kalem verilerini kopyala
+        kalem_col_set.update(kalem)
+        row = kalem
         
         # Bu kaleme ait dokümanları bul ve ekle
-        my_dokumans = [d for d in dokuman_list if d.get("Kalem_no") == kalem_no]
+        my_dokumans = dokuman_by_kalem.get(kalem_no, ())
         for i, dok in enumerate(my_dokumans):
             for col in dokuman_columns:
                 if col in dok:
-                    row[f"Dokuman_{i+1}_{col}"] = dok[col]
+                    name = f"Dokuman_{i+1}_{col}"
+                    row[name] = dok[col]
+                    dokuman_col_set.add(name)
         
         # Bu kaleme ait soru-cevapları bul ve ekle
-        my_soru_cevaps = [sc for sc in soru_cevap_list if sc.get("Kalem_no") == kalem_no or sc.get("Kalem_no") == "0"]
+        my_soru_cevap_idx = soru_cevap_by_kalem.get(kalem_no, ())
+        if kalem_no != "0" and shared_soru_cevap:
+            my_soru_cevap_idx = heapq.merge(my_soru_cevap_idx, shared_soru_cevap)
+        my_soru_cevaps = [soru_cevap_list[idx] for idx in my_soru_cevap_idx]
         for i, sc in enumerate(my_soru_cevaps):
             for col in soru_cevap_columns:
                 if col in sc:
-                    row[f"SoruCevap_{i+1}_{col}"] = sc[col]
+                    name = f"SoruCevap_{i+1}_{col}"
+                    row[name] = sc[col]
+                    soru_cevap_col_set.add(name)
         
         # Bu kaleme ait vergileri bul ve ekle  
-        my_vergis = [v for v in vergi_list if v.get("Kalem_no") == kalem_no]
+        my_vergis = vergi_by_kalem.get(kalem_no, ())
         for i, vergi in enumerate(my_vergis):
             for col in vergi_columns:
                 if col in vergi:
-                    row[f"Vergi_{i+1}_{col}"] = vergi[col]
+                    name = f"Vergi_{i+1}_{col}"
+                    row[name] = vergi[col]
+                    vergi_col_set.add(name)
         
         data_rows.append(row)
     
-    # Pandas DataFrame oluştur
-    try:
-        import pandas as pd
-        
-        # Tüm sütunları belirle
-        all_columns = set()
-        for row in data_rows:
-            all_columns.update(row.keys())
-        
-        # Önemli etiketleri belirle - bunlar sütun başında gelecek
-        important_columns = [
-            "Kalem_No", "Gtip", "Ticari_tanimi", "Mensei_ulke", 
-            "Brut_agirlik", "Net_agirlik", "Miktar", "Rejim",
-            "Kap_adedi", "Fatura_miktari", "Fatura_miktarinin_dovizi"
-        ]
-        
-        # Sütun sıralaması
-        ordered_columns = []
-        
-        # Önce önemli sütunları ekle
-        for col in important_columns:
-            if col in all_columns:
-                ordered_columns.append(col)
-                all_columns.remove(col)
-        
-        # Dokuman sütunlarını ekle - sıralı olarak
-        dokuman_cols = sorted([c for c in all_columns if c.startswith("Dokuman_")])
-        ordered_columns.extend(dokuman_cols)
-        for col in dokuman_cols:
-            all_columns.remove(col)
-        
-        # SoruCevap sütunlarını ekle - sıralı olarak
-        soru_cevap_cols = sorted([c for c in all_columns if c.startswith("SoruCevap_")])
-        ordered_columns.extend(soru_cevap_cols)
-        for col in soru_cevap_cols:
-            all_columns.remove(col)
-        
-        # Vergi sütunlarını ekle - sıralı olarak
-        vergi_cols = sorted([c for c in all_columns if c.startswith("Vergi_")])
-        ordered_columns.extend(vergi_cols)
-        for col in vergi_cols:
-            all_columns.remove(col)
-        
-        # Kalan sütunları ekle
-        ordered_columns.extend(sorted(all_columns))
-        
-        # DataFrame oluştur - her satırda eksik sütunlar olabilir, bunları None olarak doldur
-        df = pd.DataFrame(data_rows)
-        
-        # Sütun sıralamasını ayarla
-        available_cols = [col for col in ordered_columns if col in df.columns]
-        df = df[available_cols]
-        
-        # Formatlı excel dosyası oluştur
-        excel_output_file = os.path.join(output_dir, f"{xml_name_without_ext}.xlsx")
-        
-        # Dosya zaten açıksa veya izin sorunu varsa daha açıklayıcı hata mesajı ver
-        try:
-            df.to_excel(excel_output_file, index=False)
-        except PermissionError:
-            print(f"Uyarı: '{excel_output_file}' dosyası başka bir program tarafından kullanılıyor veya yazma izni yok.")
-            print("Excel dosyası oluşturulamadı, ancak TXT dosyası başarıyla oluşturuldu.")
-            excel_output_file = None
-        except Exception as e:
-            print(f"Uyarı: Excel dosyası oluşturulurken hata: {str(e)}")
-            excel_output_file = None
-    except ImportError:
-        print("Uyarı: pandas kütüphanesi yüklü değil, Excel dosyası oluşturulamadı.")
-        excel_output_file = None
-    
-    # Ayrıca TAB karakteri ile ayrılmış dosya olarak kaydet (Alternatif görüntüleme için)
+    # Önemli etiketleri belirle - bunlar sütun başında gelecek
+    important_columns = [
+        "Kalem_No", "Gtip", "Ticari_tanimi", "Mensei_ulke", 
+        "Brut_agirlik", "Net_agirlik", "Miktar", "Rejim",
+        "Kap_adedi", "Fatura_miktari", "Fatura_miktarinin_dovizi"
+    ]
+    
+    # Sütun sıralaması: önemli sütunlar, sıralı Dokuman / SoruCevap / Vergi sütunları, kalan kalem sütunları.
+    # Aynı önekle başlayan kalem etiketleri (ör. Vergi_matrahi) ilgili grupta sıralanır.
+    important_present = [col for col in important_columns if col in kalem_col_set]
+    other_cols = []
+    for col in kalem_col_set.difference(important_present):
+        if col.startswith("Dokuman_"):
+            dokuman_col_set.add(col)
+        elif col.startswith("SoruCevap_"):
+            soru_cevap_col_set.add(col)
+        elif col.startswith("Vergi_"):
+            vergi_col_set.add(col)
+        else:
+            other_cols.append(col)
+    ordered_columns = (important_present
+                       + sorted(dokuman_col_set, key=_column_sort_key)
+                       + sorted(soru_cevap_col_set, key=_column_sort_key)
+                       + sorted(vergi_col_set, key=_column_sort_key)
+                       + sorted(other_cols))
+    
+    excel_output_file = os.path.join(output_dir, f"{xml_name_without_ext}.xlsx")
     txt_output_file = os.path.join(output_dir, f"{xml_name_without_ext}.txt")
-    try:
-        with open(txt_output_file, 'w', newline='', encoding='utf-8-sig') as f:  # utf-8-sig BOM ekler, Excel için faydalı
-            if 'df' in locals() and 'ordered_columns' in locals():
-                writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
-                writer.writerow(available_cols)  # Başlık satırı
-                
-                # Her satır için değerleri yaz
-                for _, row in df.iterrows():
-                    values = []
-                    for col in available_cols:
-                        val = row.get(col, '')
-                        values.append(str(val) if pd.notna(val) else '')
-                    writer.writerow(values)
-            else:
-                # pandas yoksa veya DataFrame oluşturulmadıysa, basit text çıktısı yap
-                writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
-                # Kalem başlıklarını yaz
-                if data_rows:
-                    all_keys = set()
-                    for row in data_rows:
-                        all_keys.update(row.keys())
-                    writer.writerow(sorted(all_keys))
-                    
-                    # Her kalem için verileri yaz
-                    for row in data_rows:
-                        writer.writerow([row.get(k, '') for k in sorted(all_keys)])
-    except Exception as e:
-        print(f"Uyarı: TXT dosyası oluşturulurken hata: {str(e)}")
-        txt_output_file = None
+    
+    # Excel ve TXT dosyaları birbirinden bağımsız olduğu için iki thread'de birlikte
+    # yazılır; biri sıkıştırma/serileştirme yaparken diğerinin disk yazması ilerler
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        excel_future = executor.submit(_save_excel, ordered_columns, data_rows, excel_output_file)
+        txt_future = executor.submit(_save_txt, ordered_columns, data_rows, txt_output_file)
+        excel_output_file = excel_future.result()
+        txt_output_file = txt_future.result()
     
     return {
         "xml_file": xml_file,
@@ -306,15 +320,124 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
         "dokuman_count": len(dokuman_list),
         "soru_cevap_count": len(soru_cevap_list),
         "vergi_count": len(vergi_list),
-        "kalem_count": len(kalem_data_list)
+        "kalem_count": len(kalem_data_list),
+        "columns": ordered_columns
     }
 
+def _save_excel(columns, data_rows, excel_output_file):
+    """
+    Formatlı Excel dosyasını oluşturur; satırlar DataFrame'e çevrilmeden doğrudan yazılır.
+    Hata durumunda uyarı yazar.
+    
+    return: Oluşturulan dosyanın yolu veya None
+    """
+    if xlsxwriter is None:
+        print("Uyarı: xlsxwriter kütüphanesi yüklü değil, Excel dosyası oluşturulamadı.")
+        return None
+    
+    # Dosya zaten açıksa veya izin sorunu varsa daha açıklayıcı hata mesajı ver
+    try:
+        _write_excel(columns, data_rows, excel_output_file)
+    except PermissionError:
+        print(f"Uyarı: '{excel_output_file}' dosyası başka bir program tarafından kullanılıyor veya yazma izni yok.")
+        print("Excel dosyası oluşturulamadı, ancak TXT dosyası başarıyla oluşturuldu.")
+        return None
+    except Exception as e:
+        print(f"Uyarı: Excel dosyası oluşturulurken hata: {str(e)}")
+        return None
+    return excel_output_file
+
+def _save_txt(columns, data_rows, txt_output_file):
+    """
+    TAB karakteri ile ayrılmış dosya olarak kaydeder (Alternatif görüntüleme için).
+    Satırlar pandas'a uğramadan doğrudan data_rows'tan yazılır. Hata durumunda uyarı yazar.
+    
+    return: Oluşturulan dosyanın yolu veya None
+    """
+    try:
+        # utf-8-sig BOM ekler, Excel için faydalı; 1 MB tampon geniş satırlarda yazma çağrılarını azaltır
+        with open(txt_output_file, 'w', newline='', encoding='utf-8-sig', buffering=TXT_BUFFER_SIZE) as f:
+            writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(columns)  # Başlık satırı
+            writer.writerows([row.get(col, '') for col in columns] for row in data_rows)
+    except Exception as e:
+        print(f"Uyarı: TXT dosyası oluşturulurken hata: {str(e)}")
+        return None
+    return txt_output_file
+
+def _write_excel(columns, data_rows, excel_output_file):
+    """
+    Kalem satırlarını xlsxwriter ile satır satır, sabit bellekle Excel'e yazar.
+    Hücre değerleri zaten metin olduğundan araya pandas DataFrame'i konmaz;
+    pandas to_excel hücreleri sütun sütun yazdığı için constant_memory kipinde
+    de kullanılamazdı. Başlık biçimi pandas'ın varsayılan başlık stiliyle
+    aynıdır, eksik hücreler boş bırakılır.
+    
+    columns: Sıralı sütun adları
+    data_rows: Her kalem için {sütun: değer} sözlükleri
+    """
+    workbook = xlsxwriter.Workbook(excel_output_file, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+    })
+    try:
+        worksheet = workbook.add_worksheet()
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        worksheet.write_row(0, 0, columns, header_format)
+        
+        for row_idx, row in enumerate(data_rows, 1):
+            worksheet.write_row(row_idx, 0, [row.get(col) for col in columns])
+    finally:
+        try:
+            workbook.close()
+        except FileCreateError as e:
+            # Asıl işletim sistemi hatasını (ör. dosya Excel'de açık) çağırana ilet
+            if e.args and isinstance(e.args[0], OSError):
+                raise e.args[0] from e
+            raise
+
+def _print_column_groups(columns):
+    """
+    SoruCevap, Dokuman ve Vergi sütunlarının listesini ekrana yazar.
+    
+    columns: Sütun adları
+    """
+    # SoruCevap sütunlarının listesini göster
+    soru_cols = [col for col in columns if 'SoruCevap' in col]
+    if soru_cols:
+        print("\nSoruCevap sütunları:")
+        for col in soru_cols:
+            print(f"  - {col}")
+    else:
+        print("\nSoruCevap sütunu bulunamadı!")
+    
+    # Dokuman sütunlarının listesini göster
+    dokuman_cols = [col for col in columns if 'Dokuman' in col]
+    if dokuman_cols:
+        print("\nDokuman sütunları:")
+        for col in dokuman_cols:
+            print(f"  - {col}")
+    else:
+        print("\nDokuman sütunu bulunamadı!")
+    
+    # Vergi sütunlarının listesini göster
+    vergi_cols = [col for col in columns if 'Vergi' in col]
+    if vergi_cols:
+        print("\nVergi sütunları:")
+        for col in vergi_cols:
+            print(f"  - {col}")
+    else:
+        print("\nVergi sütunu bulunamadı!")
+
 def show_excel_content(excel_file, rows=3):
     """
     Excel dosyasının içeriğini gösterir
     """
+    if pd is None:
+        print("pandas kütüphanesi yüklü değil, Excel dosyası içeriği görüntülenemiyor.")
+        return
+    
     try:
-        import pandas as pd
         print(f"\nExcel dosyası içeriği: {os.path.basename(excel_file)}")
         print("-" * 80)
         df = pd.read_excel(excel_file)
@@ -333,46 +456,53 @@ def show_excel_content(excel_file, rows=3):
         
         print("-" * 80)
         
-        # SoruCevap sütunlarının listesini göster
-        soru_cols = [col for col in df.columns if 'SoruCevap' in col]
-        if soru_cols:
-            print("\nSoruCevap sütunları:")
-            for col in soru_cols:
-                print(f"  - {col}")
-        else:
-            print("\nSoruCevap sütunu bulunamadı!")
-            
-        # Dokuman sütunlarının listesini göster
-        dokuman_cols = [col for col in df.columns if 'Dokuman' in col]
-        if dokuman_cols:
-            print("\nDokuman sütunları:")
-            for col in dokuman_cols:
-                print(f"  - {col}")
-        else:
-            print("\nDokuman sütunu bulunamadı!")
-            
-        # Vergi sütunlarının listesini göster
-        vergi_cols = [col for col in df.columns if 'Vergi' in col]
-        if vergi_cols:
-            print("\nVergi sütunları:")
-            for col in vergi_cols:
-                print(f"  - {col}")
-        else:
-            print("\nVergi sütunu bulunamadı!")
-            
-    except ImportError:
-        print("pandas kütüphanesi yüklü değil, Excel dosyası içeriği görüntülenemiyor.")
+        # Sütun gruplarını göster
+        _print_column_groups(df.columns)
+        
     except Exception as e:
         print(f"Excel içeriği görüntülenirken hata: {str(e)}")
 
-def process_all_xml_files(xml_dir):
+def _list_xml_files(xml_dir):
+    """
+    Klasördeki XML dosyalarının yollarını döndürür. os.scandir dosya türünü dizin
+    okumasından aldığı için glob'daki gibi her girdi için ayrıca stat çağrılmaz.
+    glob ile uyumlu olarak gizli (nokta ile başlayan) dosyalar atlanır, uzantı
+    karşılaştırması işletim sisteminin büyük/küçük harf kuralına göre yapılır.
+    
+    xml_dir: XML dosyalarının bulunduğu klasör
+    """
+    try:
+        with os.scandir(xml_dir) as entries:
+            return [entry.path for entry in entries
+                    if not entry.name.startswith('.')
+                    and os.path.normcase(entry.name).endswith('.xml')
+                    and entry.is_file()]
+    except OSError:
+        return []
+
+def _process_one(xml_file):
+    """
+    Tek bir XML dosyasını işçi süreçte işler. Hata süreç havuzunu durdurmasın
+    diye yakalanır ve mesaj olarak döndürülür.
+    
+    return: (xml_file, sonuç sözlüğü veya None, hata mesajı veya None)
+    """
+    try:
+        return xml_file, extract_beyanname_fixed(xml_file), None
+    except Exception as e:
+        return xml_file, None, str(e)
+
+def process_all_xml_files(xml_dir, show_content=False):
     """
     Belirtilen klasördeki tüm XML dosyalarını işler ve Excel formatına dönüştürür.
+    Dosyalar birbirinden bağımsız olduğu için ayrı süreçlerde paralel işlenir.
     
     xml_dir: XML dosyalarının bulunduğu klasör
+    show_content: True ise oluşturulan Excel dosyaları yeniden okunup ilk satırları da
+                  ekrana yazılır; False ise yalnızca sütun grupları yazılır
     """
     # Klasördeki tüm XML dosyalarını bul
-    xml_files = glob.glob(os.path.join(xml_dir, "*.xml"))
+    xml_files = _list_xml_files(xml_dir)
     
     if not xml_files:
         print(f"Hata: {xml_dir} klasöründe XML dosyası bulunamadı.")
@@ -381,19 +511,28 @@ def process_all_xml_files(xml_dir):
     # Sonuçları tutacak liste
     results = []
     
-    # Her XML dosyasını işle
-    for xml_file in xml_files:
-        try:
-            result = extract_beyanname_fixed(xml_file)
-            results.append(result)
-            print(f"İşlendi: {os.path.basename(xml_file)} -> {os.path.basename(result['txt_file'])}")
-            if result['excel_file']:
-                print(f"        Excel: {os.path.basename(result['excel_file'])}")
-                
-                # İşlem sonrasında Excel dosyasının içeriğini göster
-                show_excel_content(result['excel_file'])
-        except Exception as e:
-            print(f"Hata ({os.path.basename(xml_file)}): {str(e)}")
+    # Her XML dosyasını ayrı süreçte işle - sonuçlar dosya sırasıyla gelir
+    max_workers = os.cpu_count() or 1
+    chunksize = max(1, len(xml_files) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for xml_file, result, error in executor.map(_process_one, xml_files, chunksize=chunksize):
+            if error is not None:
+                print(f"Hata ({os.path.basename(xml_file)}): {error}")
+                continue
+            try:
+                results.append(result)
+                print(f"İşlendi: {os.path.basename(xml_file)} -> {os.path.basename(result['txt_file'])}")
+                if result['excel_file']:
+                    print(f"        Excel: {os.path.basename(result['excel_file'])}")
+                    
+                    # Excel dosyasını yeniden okumak yalnızca istenirse yapılır; sütun
+                    # grupları işçiden dönen sütun listesinden yazdırılır
+                    if show_content:
+                        show_excel_content(result['excel_file'])
+                    else:
+                        _print_column_groups(result['columns'])
+            except Exception as e:
+                print(f"Hata ({os.path.basename(xml_file)}): {str(e)}")
     
     # Özet bilgileri göster
     print("\nİşlem tamamlandı!")
@@ -410,22 +549,40 @@ def process_all_xml_files(xml_dir):
     print("4. Veri Sihirbazında 'Sınırlandırılmış' seçin ve 'Ayırıcı' olarak 'Tab' işaretleyin")
 
 def analyze_xml(xml_file):
-    with open(xml_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Tüm etiketleri bul (navlun içeren)
-    all_tags = re.findall(r'<([^/\s>]+)>([^<]*navlun[^<]*)</\1>', content, re.IGNORECASE)
+    """
+    XML dosyasındaki navlun geçen etiketleri ve basit etiket istatistiklerini
+    tek akış geçişinde toplar. Basit etiket: alt elemanı ve özniteliği olmayan,
+    metni boş olmayan etiket.
+    """
+    if etree is None:
+        print("lxml kütüphanesi yüklü değil, XML dosyası analiz edilemiyor.")
+        return set()
+    
+    navlun_tags = []
+    unique_tags = set()
+    simple_tag_count = 0
+    
+    for _, elem in etree.iterparse(xml_file, events=('end',), huge_tree=True, recover=True):
+        text = elem.text
+        if len(elem) == 0 and text and not elem.attrib:
+            simple_tag_count += 1
+            unique_tags.add(elem.tag)
+            if 'navlun' in text.lower():
+                navlun_tags.append((elem.tag, text))
+        
+        # İşlenen alt ağacı bırak - bellek yalnızca açık elemanlar kadar kalır
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
     
     print(f"Dosya: {os.path.basename(xml_file)}")
     print(f"Navlun içeren etiketler:")
-    for tag, value in all_tags:
+    for tag, value in navlun_tags:
         print(f"  <{tag}>{value}</{tag}>")
     
-    # Genel etiket istatistikleri
-    all_simple_tags = re.findall(r'<([^/\s>]+)>([^<]+)</\1>', content)
-    unique_tags = set(tag for tag, _ in all_simple_tags)
-    
-    print(f"\nToplam basit etiket sayısı: {len(all_simple_tags)}")
+    print(f"\nToplam basit etiket sayısı: {simple_tag_count}")
     print(f"Benzersiz etiket sayısı: {len(unique_tags)}")
     
     return unique_tags
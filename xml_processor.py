@@ -1,9 +1,69 @@
-import csv
 import os
-import re
-import html
-import glob
+import heapq
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from sys import intern
+import numpy as np
 import pandas as pd
+from lxml import etree
+
+# Bu uzunluğa kadar olan etiket değerleri intern edilir
+INTERN_MAX_LENGTH = 8
+
+# BeyannameBilgi değerlerine alınmayan etiketler
+_BEYANNAME_SKIP_TAGS = ('kalem', 'firma', 'Ozetbeyan')
+
+# Liste bloklarının etiketleri ve her bloktaki kayıt etiketi
+_SECTION_RECORD_TAGS = {"Dokumanlar": "Dokuman", "Sorular_cevaplar": "Soru_Cevap", "Vergiler": "Vergi"}
+
+def _column_sort_key(col):
+    """
+    Dokuman_/SoruCevap_/Vergi_ sütunlarını sıra numarasına göre sıralayan anahtar.
+    Dokuman_10_Kod, Dokuman_2_Kod'dan sonra gelir; numarasız adlar (ör. Vergi_matrahi)
+    grubun sonunda alfabetik sıralanır.
+    """
+    parts = col.split("_", 2)
+    if len(parts) == 3 and parts[1].isdecimal():
+        return (0, int(parts[1]), parts[2])
+    return (1, 0, col)
+
+# Önemli etiketler - bunlar sütun başında gelir
+IMPORTANT_COLUMNS = (
+    "Kalem_No", "Gtip", "Ticari_tanimi", "Mensei_ulke", 
+    "Brut_agirlik", "Net_agirlik", "Miktar", "Rejim",
+    "Kap_adedi", "Fatura_miktari", "Fatura_miktarinin_dovizi"
+)
+
+@lru_cache(maxsize=32)
+def _column_order(kalem_cols, dokuman_cols, soru_cevap_cols, vergi_cols):
+    """
+    DataFrame sütun sırasını hesaplar: önemli sütunlar, sıralı Dokuman / SoruCevap / Vergi
+    sütunları, kalan kalem sütunları. Aynı önekle başlayan kalem etiketleri (ör. Vergi_matrahi)
+    ilgili grupta sıralanır. Aynı gümrük sisteminden gelen dosyalar aynı şemayı taşıdığından
+    sonuç sütun kümelerine (frozenset) göre önbelleklenir.
+    
+    return: Sıralı sütun adları (tuple)
+    """
+    important_present = [col for col in IMPORTANT_COLUMNS if col in kalem_cols]
+    dokuman_cols = set(dokuman_cols)
+    soru_cevap_cols = set(soru_cevap_cols)
+    vergi_cols = set(vergi_cols)
+    other_cols = []
+    for col in kalem_cols.difference(important_present):
+        if col.startswith("Dokuman_"):
+            dokuman_cols.add(col)
+        elif col.startswith("SoruCevap_"):
+            soru_cevap_cols.add(col)
+        elif col.startswith("Vergi_"):
+            vergi_cols.add(col)
+        else:
+            other_cols.append(col)
+    return tuple(important_present
+                 + sorted(dokuman_cols, key=_column_sort_key)
+                 + sorted(soru_cevap_cols, key=_column_sort_key)
+                 + sorted(vergi_cols, key=_column_sort_key)
+                 + sorted(other_cols))
 
 def extract_beyanname_fixed(xml_file, output_dir=None):
     """
@@ -21,126 +81,82 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
     xml_filename = os.path.basename(xml_file)
     xml_name_without_ext = os.path.splitext(xml_filename)[0]
     
-    # XML dosyasını oku
-    with open(xml_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Beyanname bilgilerini çıkar
-    beyanname_bilgi_pattern = r'<BeyannameBilgi[^>]*>(.*?)</BeyannameBilgi>'
-    beyanname_match = re.search(beyanname_bilgi_pattern, content, re.DOTALL)
-    
+    # XML dosyasını tek geçişte akış halinde ayrıştır. Alt elemanı olmayan her
+    # etiketin metni, açık olan BeyannameBilgi / kalem / liste kaydına yazılır.
     beyanname_data = {}
-    if beyanname_match:
-        beyanname_xml = beyanname_match.group(1)
-        # Tüm etiketleri bul
-        tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-        tag_matches = re.findall(tag_pattern, beyanname_xml)
-        
-        # Beyanname bilgilerini ayıklama
-        for tag, value in tag_matches:
-            if tag != 'kalem' and tag != 'firma' and tag != 'Ozetbeyan':
-                # Metni temizle - Excel'de sorun çıkarabilecek karakterleri düzelt
-                value = value.strip().replace('"', '""')
-                beyanname_data[tag] = value
-    
-    # Kalem bilgilerini çıkar
-    kalem_pattern = r'<kalem>(.*?)</kalem>'
-    kalem_matches = re.findall(kalem_pattern, content, re.DOTALL)
-    
-    # Dokumanlar bilgilerini çıkar - yeni format için doğrudan dokuman listesi olarak saklayalım
+    kalem_data_list = []
     dokuman_list = []
-    dokuman_pattern = r'<Dokumanlar>(.*?)</Dokumanlar>'
-    dokumanlar_match = re.search(dokuman_pattern, content, re.DOTALL)
-    
-    if dokumanlar_match:
-        dokumanlar_xml = dokumanlar_match.group(1)
-        # Her bir Dokuman etiketini bul
-        dokuman_pattern = r'<Dokuman>(.*?)</Dokuman>'
-        dokuman_matches = re.findall(dokuman_pattern, dokumanlar_xml, re.DOTALL)
-        
-        for dokuman_xml in dokuman_matches:
-            # Dokuman içindeki tüm etiketleri bul
-            tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-            tag_matches = re.findall(tag_pattern, dokuman_xml)
-            
-            dokuman = {}
-            # Temel değerleri çıkart
-            for tag, value in tag_matches:
-                value = value.strip().replace('"', '""')
-                dokuman[tag] = value
-            
-            dokuman_list.append(dokuman)
-    
-    # Soru_Cevap bilgilerini çıkar - yeni format için doğrudan soru-cevap listesi olarak saklayalım
     soru_cevap_list = []
-    soru_cevap_pattern = r'<Sorular_cevaplar>(.*?)</Sorular_cevaplar>'
-    sorular_match = re.search(soru_cevap_pattern, content, re.DOTALL)
-    
-    if sorular_match:
-        sorular_xml = sorular_match.group(1)
-        # Her bir Soru_Cevap etiketini bul
-        soru_cevap_pattern = r'<Soru_Cevap>(.*?)</Soru_Cevap>'
-        soru_cevap_matches = re.findall(soru_cevap_pattern, sorular_xml, re.DOTALL)
-        
-        for soru_cevap_xml in soru_cevap_matches:
-            # Soru_Cevap içindeki tüm etiketleri bul
-            tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-            tag_matches = re.findall(tag_pattern, soru_cevap_xml)
-            
-            soru_cevap = {}
-            # Değerleri çıkart
-            for tag, value in tag_matches:
-                value = value.strip().replace('"', '""')
-                soru_cevap[tag] = value
-            
-            soru_cevap_list.append(soru_cevap)
-    
-    # Vergiler bilgilerini çıkar - yeni format için doğrudan vergi listesi olarak saklayalım
     vergi_list = []
-    vergi_pattern = r'<Vergiler>(.*?)</Vergiler>'
-    vergiler_match = re.search(vergi_pattern, content, re.DOTALL)
-    
-    if vergiler_match:
-        vergiler_xml = vergiler_match.group(1)
-        # Her bir Vergi etiketini bul
-        vergi_pattern = r'<Vergi>(.*?)</Vergi>'
-        vergi_matches = re.findall(vergi_pattern, vergiler_xml, re.DOTALL)
-        
-        for vergi_xml in vergi_matches:
-            # Vergi içindeki tüm etiketleri bul
-            tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-            tag_matches = re.findall(tag_pattern, vergi_xml)
-            
-            vergi = {}
-            # Değerleri çıkart
-            for tag, value in tag_matches:
-                value = value.strip().replace('"', '""')
-                vergi[tag] = value
-            
-            vergi_list.append(vergi)
-    
-    # Kalem bilgilerini hazırla
-    kalem_data_list = []
-    for i, kalem_xml in enumerate(kalem_matches, 1):
-        kalem = {"Kalem_No": str(i)}
+    section_lists = {"Dokumanlar": dokuman_list, "Sorular_cevaplar": soru_cevap_list, "Vergiler": vergi_list}
+    
+    in_beyanname = False
+    beyanname_seen = False
+    kalem = None
+    section = None
+    seen_sections = set()
+    record = None
+    
+    for event, elem in etree.iterparse(xml_file, events=('start', 'end'), huge_tree=True, recover=True):
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'BeyannameBilgi':
+                if not beyanname_seen:
+                    in_beyanname = beyanname_seen = True
+            elif elem.attrib:
+                pass
+            elif tag == 'kalem':
+                if kalem is None:
+                    kalem = {"Kalem_No": str(len(kalem_data_list) + 1)}
+            elif tag in _SECTION_RECORD_TAGS:
+                # Yalnızca ilk Dokumanlar / Sorular_cevaplar / Vergiler bloğu okunur
+                if section is None and tag not in seen_sections:
+                    section = tag
+                    seen_sections.add(tag)
+            elif section is not None and record is None and tag == _SECTION_RECORD_TAGS[section]:
+                record = {}
+            continue
         
-        # Kalem içindeki tüm etiketleri bul
-        tag_pattern = r'<([^/\s>]+)>([^<]+)</\1>'
-        tag_matches = re.findall(tag_pattern, kalem_xml)
+        if len(elem) == 0 and elem.text and not elem.attrib:
+            # Etiket adları ve kısa kod değerleri (ülke, döviz, rejim...) tüm kalemlerde
+            # tekrarlandığı için tek bir string nesnesini paylaşacak şekilde intern edilir
+            tag = intern(tag)
+            # Metni temizle - tırnak kaçışı gerekmez, Excel/csv yazıcıları kendisi yapar
+            value = elem.text.strip()
+            if len(value) <= INTERN_MAX_LENGTH:
+                value = intern(value)
+            if in_beyanname and tag not in _BEYANNAME_SKIP_TAGS:
+                beyanname_data[tag] = value
+            if kalem is not None:
+                kalem[tag] = value
+            if record is not None:
+                record[tag] = value
         
-        # Kalem bilgilerini ayıklama
-        for tag, value in tag_matches:
-            # Metni temizle - Excel'de sorun çıkarabilecek karakterleri düzelt
-            value = value.strip().replace('"', '""')
-            kalem[tag] = value
+        if tag == 'BeyannameBilgi':
+            in_beyanname = False
+        elif tag == 'kalem':
+            if kalem is not None:
+                kalem_data_list.append(kalem)
+                kalem = None
+        elif tag == section:
+            section = None
+        elif record is not None and section is not None and tag == _SECTION_RECORD_TAGS[section]:
+            section_lists[section].append(record)
+            record = None
         
-        # Beyanname verisinden üst bilgileri her kaleme ekle
+        # İşlenen alt ağacı bırak - bellek yalnızca açık elemanlar kadar kalır
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    
+    # Beyanname verisinden üst bilgileri her kaleme ekle
+    for kalem in kalem_data_list:
         for tag, value in beyanname_data.items():
             # Kalem içinde aynı isimde etiket yoksa ekle
             if tag not in kalem:
                 kalem[tag] = value
-        
-        kalem_data_list.append(kalem)
     
     # Tablo formatındaki Excel için veri hazırlama
     # Maksimum doküman, soru-cevap ve vergi sayılarını belirle
@@ -165,87 +181,77 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
     # Vergi alan başlıklarını ekle
     vergi_columns = ["Kod", "Miktar", "Oran", "Odeme_sekli", "Vergi_matrahi"]
     
-    # Pandas DataFrame için veri listesi
-    data_rows = []
+    # Alt kayıtları tek geçişte Kalem_no'ya göre grupla. Soru-cevaplarda
+    # Kalem_no "0" tüm kalemlere ait; belge sırası korunmak için indeks tutulur.
+    dokuman_by_kalem = defaultdict(list)
+    for dok in dokuman_list:
+        dokuman_by_kalem[dok.get("Kalem_no")].append(dok)
+    
+    soru_cevap_by_kalem = defaultdict(list)
+    for idx, sc in enumerate(soru_cevap_list):
+        soru_cevap_by_kalem[sc.get("Kalem_no")].append(idx)
+    shared_soru_cevap = soru_cevap_by_kalem.get("0", [])
+    
+    vergi_by_kalem = defaultdict(list)
+    for vergi in vergi_list:
+        vergi_by_kalem[vergi.get("Kalem_no")].append(vergi)
+    
+    # Sütun adları oluşturuldukları anda gruplarına eklenir - sonradan satırlar taranmaz
+    kalem_col_set = set()
+    dokuman_col_set = set()
+    soru_cevap_col_set = set()
+    vergi_col_set = set()
+    
+    # Pandas DataFrame için sütun verileri - satır sözlüğü kurulmadan değerler doğrudan
+    # sütun listelerine yazılır; bir sütun ilk görüldüğünde tüm satırlar için NaN ile açılır
+    row_count = len(kalem_data_list)
+    col_data = defaultdict(lambda: [np.nan] * row_count)
     
     # Her kalemi işle
-    for kalem in kalem_data_list:
+    for row_idx, kalem in enumerate(kalem_data_list):
         kalem_no = kalem["Kalem_No"]
         
-        # Bu kalem için satır hazırla
-        row = dict(kalem)  # Kalem verilerini kopyala
+        # Kalem verilerini yaz
+        for col, value in kalem.items():
+            col_data[col][row_idx] = value
+        kalem_col_set.update(kalem)
         
         # Bu kaleme ait dokümanları bul ve ekle
-        my_dokumans = [d for d in dokuman_list if d.get("Kalem_no") == kalem_no]
+        my_dokumans = dokuman_by_kalem.get(kalem_no, ())
         for i, dok in enumerate(my_dokumans):
             for col in dokuman_columns:
                 if col in dok:
-                    row[f"Dokuman_{i+1}_{col}"] = dok[col]
+                    name = f"Dokuman_{i+1}_{col}"
+                    col_data[name][row_idx] = dok[col]
+                    dokuman_col_set.add(name)
         
         # Bu kaleme ait soru-cevapları bul ve ekle
-        my_soru_cevaps = [sc for sc in soru_cevap_list if sc.get("Kalem_no") == kalem_no or sc.get("Kalem_no") == "0"]
+        my_soru_cevap_idx = soru_cevap_by_kalem.get(kalem_no, ())
+        if kalem_no != "0" and shared_soru_cevap:
+            my_soru_cevap_idx = heapq.merge(my_soru_cevap_idx, shared_soru_cevap)
+        my_soru_cevaps = [soru_cevap_list[idx] for idx in my_soru_cevap_idx]
         for i, sc in enumerate(my_soru_cevaps):
             for col in soru_cevap_columns:
                 if col in sc:
-                    row[f"SoruCevap_{i+1}_{col}"] = sc[col]
+                    name = f"SoruCevap_{i+1}_{col}"
+                    col_data[name][row_idx] = sc[col]
+                    soru_cevap_col_set.add(name)
         
         # Bu kaleme ait vergileri bul ve ekle  
-        my_vergis = [v for v in vergi_list if v.get("Kalem_no") == kalem_no]
+        my_vergis = vergi_by_kalem.get(kalem_no, ())
         for i, vergi in enumerate(my_vergis):
             for col in vergi_columns:
                 if col in vergi:
-                    row[f"Vergi_{i+1}_{col}"] = vergi[col]
-        
-        data_rows.append(row)
-    
-    # Tüm sütunları belirle
-    all_columns = set()
-    for row in data_rows:
-        all_columns.update(row.keys())
-    
-    # Önemli etiketleri belirle - bunlar sütun başında gelecek
-    important_columns = [
-        "Kalem_No", "Gtip", "Ticari_tanimi", "Mensei_ulke", 
-        "Brut_agirlik", "Net_agirlik", "Miktar", "Rejim",
-        "Kap_adedi", "Fatura_miktari", "Fatura_miktarinin_dovizi"
-    ]
-    
-    # Sütun sıralaması
-    ordered_columns = []
-    
-    # Önce önemli sütunları ekle
-    for col in important_columns:
-        if col in all_columns:
-            ordered_columns.append(col)
-            all_columns.remove(col)
-    
-    # Dokuman sütunlarını ekle - sıralı olarak
-    dokuman_cols = sorted([c for c in all_columns if c.startswith("Dokuman_")])
-    ordered_columns.extend(dokuman_cols)
-    for col in dokuman_cols:
-        all_columns.remove(col)
-    
-    # SoruCevap sütunlarını ekle - sıralı olarak
-    soru_cevap_cols = sorted([c for c in all_columns if c.startswith("SoruCevap_")])
-    ordered_columns.extend(soru_cevap_cols)
-    for col in soru_cevap_cols:
-        all_columns.remove(col)
-    
-    # Vergi sütunlarını ekle - sıralı olarak
-    vergi_cols = sorted([c for c in all_columns if c.startswith("Vergi_")])
-    ordered_columns.extend(vergi_cols)
-    for col in vergi_cols:
-        all_columns.remove(col)
-    
-    # Kalan sütunları ekle
-    ordered_columns.extend(sorted(all_columns))
-    
-    # DataFrame oluştur
-    df = pd.DataFrame(data_rows)
-    
-    # Sütun sıralamasını ayarla
-    available_cols = [col for col in ordered_columns if col in df.columns]
-    df = df[available_cols]
+                    name = f"Vergi_{i+1}_{col}"
+                    col_data[name][row_idx] = vergi[col]
+                    vergi_col_set.add(name)
+    
+    # Aynı şemadaki dosyalar için sıralama önbellekten gelir
+    ordered_columns = list(_column_order(frozenset(kalem_col_set), frozenset(dokuman_col_set),
+                                         frozenset(soru_cevap_col_set), frozenset(vergi_col_set)))
+    
+    # DataFrame'i hazır sütun listelerinden oluştur - eksik hücreler NaN kalır
+    df = pd.DataFrame({col: col_data[col] for col in ordered_columns}, columns=ordered_columns, copy=False)
     
     # XML dosyası işleme sonucunu döndür, ancak Excel ve TXT dosyalarını oluşturma
     # Dosya oluşturma kodları kaldırıldı - gereksiz dosya oluşumu önlendi
@@ -260,6 +266,26 @@ def extract_beyanname_fixed(xml_file, output_dir=None):
         "dataframe": df  # Dataframe'i döndür
     }
 
+def _list_xml_files(xml_dir):
+    """
+    Klasördeki XML dosyalarını (yol, dosya adı) çiftleri olarak döndürür. os.scandir dosya türünü dizin
+    okumasından aldığı için glob'daki gibi her girdi için ayrıca stat çağrılmaz.
+    glob ile uyumlu olarak gizli (nokta ile başlayan) dosyalar atlanır, uzantı
+    karşılaştırması işletim sisteminin büyük/küçük harf kuralına göre yapılır.
+    
+    Dosya adı dizin girdisinden alınır; çağıranlar os.path.basename ile yeniden hesaplamaz.
+    
+    xml_dir: XML dosyalarının bulunduğu klasör
+    """
+    try:
+        with os.scandir(xml_dir) as entries:
+            return [(entry.path, entry.name) for entry in entries
+                    if not entry.name.startswith('.')
+                    and os.path.normcase(entry.name).endswith('.xml')
+                    and entry.is_file()]
+    except OSError:
+        return []
+
 def process_all_xml_files(xml_dir):
     """
     Belirtilen klasördeki tüm XML dosyalarını işler ve Excel formatına dönüştürür.
@@ -267,7 +293,7 @@ def process_all_xml_files(xml_dir):
     xml_dir: XML dosyalarının bulunduğu klasör
     """
     # Klasördeki tüm XML dosyalarını bul
-    xml_files = glob.glob(os.path.join(xml_dir, "*.xml"))
+    xml_files = _list_xml_files(xml_dir)
     
     if not xml_files:
         print(f"Hata: {xml_dir} klasöründe XML dosyası bulunamadı.")
@@ -277,15 +303,15 @@ def process_all_xml_files(xml_dir):
     results = []
     
     # Her XML dosyasını işle
-    for xml_file in xml_files:
+    for xml_file, file_name in xml_files:
         try:
             result = extract_beyanname_fixed(xml_file)
             results.append(result)
-            print(f"İşlendi: {os.path.basename(xml_file)} -> {os.path.basename(result['txt_file'])}")
+            print(f"İşlendi: {file_name} -> {os.path.basename(result['txt_file'])}")
             if result['excel_file']:
                 print(f"        Excel: {os.path.basename(result['excel_file'])}")
         except Exception as e:
-            print(f"Hata ({os.path.basename(xml_file)}): {str(e)}")
+            print(f"Hata ({file_name}): {str(e)}")
     
     return results
 
@@ -331,17 +357,22 @@ def create_pivot_table(df, index, values, aggfunc='sum', columns=None, margins=F
         print(f"Pivot tablo oluşturulurken hata: {str(e)}")
         return None
 
+# Bu sayıdan az dosya sırayla işlenir - süreç başlatma maliyeti paralellik kazancını aşar
+PARALLEL_XML_FILE_THRESHOLD = 4
+
 def process_multiple_xml_files(xml_dir, max_files=None, progress_callback=None):
     """
     Birden fazla XML dosyasını daha verimli şekilde işler.
-    Başlık bilgilerini tekrar tekrar işlemez.
+    Başlık bilgilerini tekrar tekrar işlemez. PARALLEL_XML_FILE_THRESHOLD ve
+    üzerindeki dosya sayısında dosyalar süreç havuzunda paralel işlenir;
+    sonuçların sırası dosya sırasıdır.
     
     xml_dir: XML dosyalarının bulunduğu klasör
     max_files: İşlenecek maksimum dosya sayısı (None: tümü)
     progress_callback: İlerleme durumunu bildirmek için callback fonksiyonu
     """
     # Klasördeki tüm XML dosyalarını bul
-    xml_files = glob.glob(os.path.join(xml_dir, "*.xml"))
+    xml_files = _list_xml_files(xml_dir)
     
     if not xml_files:
         return [], "Klasörde XML dosyası bulunamadı."
@@ -350,31 +381,51 @@ def process_multiple_xml_files(xml_dir, max_files=None, progress_callback=None):
     if max_files is not None and max_files > 0:
         xml_files = xml_files[:max_files]
     
-    # Sonuçları tutacak liste
-    all_dataframes = {}
-    error_messages = []
-    
-    # Her XML dosyasını işle
+    # Her dosyanın sonucu (sözlük veya istisna) dosya sırasıyla tutulur
     total_files = len(xml_files)
-    for i, xml_file in enumerate(xml_files):
-        try:
+    outcomes = [None] * total_files
+    workers = min(os.cpu_count() or 1, total_files)
+    
+    if total_files >= PARALLEL_XML_FILE_THRESHOLD and workers > 1:
+        # Dosyalar birbirinden bağımsız; ayrıştırma GIL'e takılmasın diye süreç havuzunda
+        # işlenir, ilerleme her dosya tamamlandığında bildirilir
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(extract_beyanname_fixed, xml_file): i
+                       for i, (xml_file, _) in enumerate(xml_files)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    outcomes[i] = future.result()
+                except Exception as e:
+                    outcomes[i] = e
+                
+                if progress_callback:
+                    msg = f"{done}/{total_files} dosya işlendi: {xml_files[i][1]}"
+                    progress_callback(done / total_files, msg)
+    else:
+        for i, (xml_file, file_name) in enumerate(xml_files):
             # İlerleme durumunu bildir
             if progress_callback:
                 progress = (i+1) / total_files
-                msg = f"{i+1}/{total_files} dosya işleniyor: {os.path.basename(xml_file)}"
+                msg = f"{i+1}/{total_files} dosya işleniyor: {file_name}"
                 progress_callback(progress, msg)
             
             # XML dosyasını işle
-            result = extract_beyanname_fixed(xml_file)
-            
-            if 'dataframe' in result and result['dataframe'] is not None:
-                file_name = os.path.basename(xml_file)
-                all_dataframes[file_name] = result['dataframe']
-            else:
-                error_messages.append(f"Hata: {os.path.basename(xml_file)} için DataFrame oluşturulamadı.")
-                
-        except Exception as e:
-            error_messages.append(f"Hata ({os.path.basename(xml_file)}): {str(e)}")
+            try:
+                outcomes[i] = extract_beyanname_fixed(xml_file)
+            except Exception as e:
+                outcomes[i] = e
+    
+    # Sonuçları dosya sırasıyla topla
+    all_dataframes = {}
+    error_messages = []
+    for (_, file_name), result in zip(xml_files, outcomes):
+        if isinstance(result, Exception):
+            error_messages.append(f"Hata ({file_name}): {str(result)}")
+        elif 'dataframe' in result and result['dataframe'] is not None:
+            all_dataframes[file_name] = result['dataframe']
+        else:
+            error_messages.append(f"Hata: {file_name} için DataFrame oluşturulamadı.")
     
     # Son ilerleme durumunu bildir
     if progress_callback:
@@ -383,6 +434,55 @@ def process_multiple_xml_files(xml_dir, max_files=None, progress_callback=None):
     # Sonuçları döndür
     return all_dataframes, error_messages
 
+# Az sayıda farklı değer alan ve yalnızca karşılaştırma/filtrelemede kullanılan sütunlar
+CATEGORICAL_COLUMNS = ("Alici_satici_iliskisi",)
+
+def optimize_categorical_columns(df, columns=CATEGORICAL_COLUMNS):
+    """
+    Tekrarlayan string değerler içeren sütunları bir kez category tipine dönüştürür.
+    Böylece sonraki filtre ve karşılaştırmalar string yerine tamsayı kodlar üzerinde çalışır.
+    
+    df: Pandas DataFrame (yerinde değiştirilir)
+    columns: Dönüştürülecek sütun adları
+    
+    return: Aynı DataFrame
+    """
+    if df is None:
+        return df
+    
+    for col in columns:
+        # pandas 3 metin sütunlarını object yerine str tipinde döndürür; ikisi de dönüştürülür
+        if col in df.columns and (pd.api.types.is_object_dtype(df[col])
+                                  or pd.api.types.is_string_dtype(df[col])):
+            df[col] = df[col].astype('category')
+    
+    return df
+
+def shrink_dataframe(df, max_unique_ratio=0.5):
+    """
+    Sonuç tablolarının bellek kullanımını azaltan sığ bir kopya döndürür.
+    Tekrarlayan değerli metin sütunları category tipine, int64 sütunlar en dar
+    tamsayı tipine çevrilir. Tutar sütunlarında hassasiyet kaybı olmaması için
+    ondalıklı sütunlara dokunulmaz.
+    
+    df: Pandas DataFrame (değiştirilmez)
+    max_unique_ratio: Farklı değer oranı bunun altındaysa metin sütunu category'ye çevrilir
+    
+    return: Dönüştürülmüş DataFrame
+    """
+    if df is None or df.empty:
+        return df
+    
+    shrunk = df.copy(deep=False)
+    row_count = len(df)
+    for col in df.select_dtypes(include='object').columns:
+        if df[col].nunique(dropna=True) <= row_count * max_unique_ratio:
+            shrunk[col] = df[col].astype('category')
+    for col in df.select_dtypes(include='int64').columns:
+        shrunk[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    return shrunk
+
 def merge_dataframes(dataframes_dict):
     """
     Birden çok DataFrame'i tek bir DataFrame'de birleştirir.
@@ -396,20 +496,17 @@ def merge_dataframes(dataframes_dict):
     if not dataframes_dict:
         return None
     
-    # Boş bir liste oluştur
-    df_list = []
+    file_names = list(dataframes_dict)
+    df_list = list(dataframes_dict.values())
     
-    # Sözlükteki tüm DataFrame'leri listeye ekle
-    for filename, df in dataframes_dict.items():
-        # Hangi dosyadan geldiğini belirtmek için kaynak sütunu ekle
-        df = df.copy()  # Orjinal DataFrame'i değiştirmemek için
-        df['Kaynak_Dosya'] = filename
-        df_list.append(df)
+    # Tüm DataFrame'leri tek concat ile birleştir - orijinaller kopyalanmaz ve değiştirilmez,
+    # ignore_index=True ile indeksler sıfırdan başlayacak şekilde yeniden numaralandırılır
+    merged_df = pd.concat(df_list, ignore_index=True)
     
-    # Tüm DataFrame'leri birleştir
-    if len(df_list) == 1:
-        return df_list[0]
-    else:
-        # ignore_index=True ile indeksleri sıfırdan başlayacak şekilde yeniden numaralandır
-        merged_df = pd.concat(df_list, ignore_index=True)
-        return merged_df 
\ No newline at end of file
+    # Hangi dosyadan geldiğini belirten kaynak sütunu, dosya başına satır sayısından
+    # category kodlarıyla bir kerede oluşturulur - dosya adı tek string olarak tutulur.
+    # Sütun, önceki düzenle aynı şekilde ilk dosyanın sütunlarından hemen sonra yer alır.
+    codes = np.repeat(np.arange(len(df_list)), [len(df) for df in df_list])
+    merged_df.insert(len(df_list[0].columns), 'Kaynak_Dosya',
+                     pd.Categorical.from_codes(codes, categories=file_names))
+    return merged_df 
\ No newline at end of file